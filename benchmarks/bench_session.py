@@ -0,0 +1,167 @@
+"""Time the main operations of the GUI for a synthetic session, see :mod:`session_generator`.
+
+The GUI runs on the `offscreen` platform of Qt, so no display is needed. Usage::
+
+    python benchmarks/bench_session.py --sensors 2 --duration-s 3600 --labels-per-minute 30 --output results.json
+
+Each operation is repeated `--repeat` times and the median and minimum are reported. The results, together with the
+parameters of the session and the versions of the GUI and Python, are written as JSON, such that results of different
+versions can be compared.
+"""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable=wrong-import-position
+import argparse
+import json
+import pickle
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+import pandas as pd
+from PySide2.QtWidgets import QApplication
+
+from mad_gui.models.local import PlotData
+from mad_gui.plugins.example import EnergyCalculator, StationaryMomentsDetector
+from mad_gui.plugins.example_labels import ActivityLabel, MyEvent
+from mad_gui.plugins.pipeline import run_pipeline
+from mad_gui.windows import MainWindow
+from session_generator import generate_session
+from typing import Callable, Dict, List
+
+PAN_ZOOM_FRAMES = 50
+
+
+class Timings:
+    """Collect the durations of repeated operations."""
+
+    def __init__(self):
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+
+    def measure(self, name: str, operation: Callable, *args, **kwargs):
+        start = time.perf_counter()
+        result = operation(*args, **kwargs)
+        QApplication.processEvents()
+        self.durations[name].append(time.perf_counter() - start)
+        return result
+
+    def summary(self) -> Dict[str, Dict]:
+        return {
+            name: {"median_s": statistics.median(durations), "min_s": min(durations), "runs": len(durations)}
+            for name, durations in self.durations.items()
+        }
+
+
+def run_session(gui: MainWindow, session: Dict[str, Dict], timings: Timings):
+    plot_data = timings.measure("load", lambda: {name: PlotData.from_dict(sensor) for name, sensor in session.items()})
+    # setting the plot data creates the plots via MainWindow._plot_data
+    timings.measure("plot_data", setattr, gui.global_data, "plot_data", plot_data)
+
+    plots = list(gui.sensor_plots.values())
+    for label_class in (ActivityLabel, MyEvent):
+        setter = plots[0].set_labels if label_class is ActivityLabel else plots[0].set_events
+        timings.measure(
+            f"set_labels_{label_class.name}", setter, label_class, session["Sensor 0"]["annotations"][label_class.name]
+        )
+
+    for mode in ("add", "edit", "remove", "investigate"):
+        timings.measure(f"mode_{mode}", setattr, gui.plot_state, "mode", mode)
+    timings.measure("sync_annotations", lambda: [plot._sync_annotations() for plot in plots])  # noqa
+
+    main_plot = plots[0]
+    duration_s = len(plot_data["Sensor 0"].data) / plot_data["Sensor 0"].sampling_rate_hz
+    window_s = duration_s / 20
+
+    def pan_and_zoom():
+        for frame in range(PAN_ZOOM_FRAMES):
+            # zoom into a window that moves through the recording, like a user scrolling through it
+            x_min = (duration_s - window_s) * frame / PAN_ZOOM_FRAMES
+            main_plot.setXRange(x_min, x_min + window_s * (1 + frame % 2), padding=0)
+            QApplication.processEvents()
+
+    timings.measure(f"pan_zoom_{PAN_ZOOM_FRAMES}_frames", pan_and_zoom)
+
+    with tempfile.TemporaryDirectory() as directory:
+        file = Path(directory) / "session.mad_gui"
+
+        def save():
+            with open(file, "wb") as opened_file:
+                pickle.dump(
+                    {k: v.to_dict() for k, v in plot_data.items()}, opened_file, protocol=pickle.HIGHEST_PROTOCOL
+                )
+
+        timings.measure("save", save)
+        timings.measure("load_saved", lambda: {k: PlotData.from_dict(v) for k, v in pd.read_pickle(file).items()})
+
+    if len(plot_data["Sensor 0"].data.columns) >= 3:
+        timings.measure("algorithm_StationaryMomentsDetector", StationaryMomentsDetector().process_data, plot_data)
+        timings.measure("algorithm_EnergyCalculator", run_pipeline, [EnergyCalculator], plot_data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sensors", type=int, default=2)
+    parser.add_argument("--channels", type=int, default=6)
+    parser.add_argument("--duration-s", type=float, default=600)
+    parser.add_argument("--sampling-rate-hz", type=float, default=100)
+    parser.add_argument("--labels-per-minute", type=float, default=6)
+    parser.add_argument("--events-per-minute", type=float, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    args = parser.parse_args()
+
+    parameters = {
+        "n_sensors": args.sensors,
+        "n_channels": args.channels,
+        "duration_s": args.duration_s,
+        "sampling_rate_hz": args.sampling_rate_hz,
+        "labels_per_minute": args.labels_per_minute,
+        "events_per_minute": args.events_per_minute,
+        "seed": args.seed,
+    }
+    session = generate_session(**parameters)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    gui = MainWindow(parent=app, plugins=[], labels=[ActivityLabel], events=[MyEvent])
+    gui.show()
+    timings = Timings()
+    for _ in range(args.repeat):
+        run_session(gui, session, timings)
+    gui.close()
+
+    summary = timings.summary()
+    print(f"{'operation':<40} {'median [s]':>12} {'min [s]':>12}")
+    for name, result in summary.items():
+        print(f"{name:<40} {result['median_s']:>12.4f} {result['min_s']:>12.4f}")
+
+    if args.output:
+        try:
+            mad_gui_version = version("mad_gui")
+        except PackageNotFoundError:
+            mad_gui_version = "unknown"
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "mad_gui_version": mad_gui_version,
+                    "python_version": platform.python_version(),
+                    "platform": platform.platform(),
+                    "created": datetime.now().isoformat(timespec="seconds"),
+                    "parameters": parameters,
+                    "results": summary,
+                },
+                file,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Measure how long it takes until the main window of the GUI is shown, and which imports take the most time.
+
+Each run starts a new Python process, which imports the GUI, creates the main window and shows it, using the
+`offscreen` platform of Qt, such that no display is needed. Usage::
+
+    python benchmarks/bench_startup.py --save startup_before.json
+    doit compile_ui
+    python benchmarks/bench_startup.py --compare startup_before.json
+
+The first command measures the startup without precompiled .ui files and binary resources, the last one with them and
+reports the speedup. The goal is to start at least twice as fast with them.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from typing import Dict, List
+
+CHILD = """
+import json, time
+start = time.perf_counter()
+from PySide2.QtWidgets import QApplication
+from mad_gui.start_gui import DEFAULT_EVENTS, DEFAULT_LABELS, DEFAULT_PLUGINS
+from mad_gui.windows import MainWindow
+imported = time.perf_counter()
+app = QApplication([])
+form = MainWindow(parent=app, plugins=DEFAULT_PLUGINS, labels=DEFAULT_LABELS, events=DEFAULT_EVENTS)
+form.show()
+app.processEvents()
+shown = time.perf_counter()
+print(json.dumps({"import_s": imported - start, "window_s": shown - imported}))
+"""
+
+IMPORT_TIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def run_once() -> Dict:
+    """Start the GUI in a new process and return its timings."""
+    env = {**os.environ, "QT_QPA_PLATFORM": "offscreen"}
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD], env=env, capture_output=True, text=True, check=True
+    )
+    total_s = time.perf_counter() - start
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    return {**timings, "total_s": total_s, "imports_s": _self_time_by_package(result.stderr)}
+
+
+def _self_time_by_package(import_time_output: str) -> Dict[str, float]:
+    """Sum the time spent within the modules of each top level package, e.g. `pandas` or `mad_gui`."""
+    self_times: Dict[str, float] = defaultdict(float)
+    for line in import_time_output.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match:
+            package = match.group(4).split(".")[0]
+            self_times[package] += int(match.group(1)) / 1e6
+    return dict(self_times)
+
+
+def summarize(runs: List[Dict]) -> Dict:
+    packages = {package for run in runs for package in run["imports_s"]}
+    return {
+        "runs": len(runs),
+        "total_s": statistics.median(run["total_s"] for run in runs),
+        "import_s": statistics.median(run["import_s"] for run in runs),
+        "window_s": statistics.median(run["window_s"] for run in runs),
+        "imports_s": {
+            package: statistics.median(run["imports_s"].get(package, 0) for run in runs) for package in packages
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs, the median is reported.")
+    parser.add_argument("--top", type=int, default=10, help="Number of packages to list in the import breakdown.")
+    parser.add_argument("--save", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="JSON file of a previous run, e.g. before compiling the .ui files.")
+    args = parser.parse_args()
+
+    # the first run fills the file system cache, it is not counted
+    run_once()
+    result = summarize([run_once() for _ in range(args.repeat)])
+
+    print(f"time to first window: {result['total_s']:.2f} s (median of {result['runs']} runs)")
+    print(f"  importing the GUI:  {result['import_s']:.2f} s")
+    print(f"  creating window:    {result['window_s']:.2f} s")
+    print("import time by package:")
+    for package, seconds in sorted(result["imports_s"].items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {package:<20} {seconds:.3f} s")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        speedup = baseline["total_s"] / result["total_s"]
+        print(f"speedup compared to {args.compare}: {speedup:.2f}x (goal: 2x)")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Compare the vectorized StationaryMomentsDetector with the loop-based implementation it replaced.
+
+Usage::
+
+    python -m benchmarks.bench_stationary_moments --sizes 1e5 1e6 1e7 --reference-max 1e5
+
+It is run as module from the root of the repository, since the reference is shared with the tests.
+
+The loop-based implementation takes minutes for long recordings, so by default it is only run up to 1e5 samples.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from mad_gui.plugins.example import StationaryMomentsDetector
+from tests.stationary_moments_reference import reference_binary_to_df, reference_standing_windows
+
+
+def synthetic_acc(n_samples: int, seed: int = 0) -> pd.DataFrame:
+    """Accelerometer-like noise with alternating resting and moving phases of ~5 s at 102.4 Hz."""
+    rng = np.random.default_rng(seed)
+    amplitude = np.repeat(rng.choice([0.01, 2.0], size=n_samples // 512 + 1), 512)[:n_samples]
+    noise = rng.normal(size=(n_samples, 3)) * amplitude[:, np.newaxis]
+    return pd.DataFrame(noise, columns=["acc_x", "acc_y", "acc_z"])
+
+
+def _time(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", type=float, default=[1e5, 1e6, 1e7])
+    parser.add_argument("--reference-max", type=float, default=1e5, help="Largest size to run the reference on.")
+    parser.add_argument("--window-length", type=int, default=102)
+    args = parser.parse_args()
+
+    print(f"{'samples':>10} {'vectorized [s]':>15} {'reference [s]':>15} {'speedup':>10}")
+    for size in args.sizes:
+        data = synthetic_acc(int(size))
+        detector = StationaryMomentsDetector()
+        vectorized = _time(detector.get_annotations, data)
+        if size <= args.reference_max:
+
+            def reference(acc):
+                reference_binary_to_df(reference_standing_windows(acc, args.window_length))
+
+            reference_s = _time(reference, data[["acc_x", "acc_y", "acc_z"]])
+            print(f"{int(size):>10} {vectorized:>15.3f} {reference_s:>15.3f} {reference_s / vectorized:>9.0f}x")
+        else:
+            print(f"{int(size):>10} {vectorized:>15.3f} {'-':>15} {'-':>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Create synthetic sessions of any size, to benchmark the GUI without real recordings.
+
+A session looks like the result of an importer's `load_sensor_data`, with annotations for the example labels
+`Activity` and `Peak` (see :mod:`mad_gui.plugins.example_labels`)::
+
+    >>> session = generate_session(n_sensors=2, duration_s=3600, labels_per_minute=30)
+    >>> list(session)
+    ['Sensor 0', 'Sensor 1']
+    >>> plot_data = {name: PlotData.from_dict(sensor) for name, sensor in session.items()}
+"""
+import numpy as np
+import pandas as pd
+
+from typing import Dict, List
+
+CHANNEL_NAMES = ["acc_x", "acc_y", "acc_z", "gyr_x", "gyr_y", "gyr_z"]
+ACTIVITY_DESCRIPTIONS = ["Jump", ("Walk", "Slow"), ("Walk", "Normal"), ("Walk", "Fast")]
+PEAK_DESCRIPTIONS = ["Positive peak", "Negative peak"]
+
+
+def channel_names(n_channels: int) -> List[str]:
+    """The first six channels are named like those of an IMU, such that the example algorithms can be applied."""
+    return [CHANNEL_NAMES[i] if i < len(CHANNEL_NAMES) else f"channel_{i}" for i in range(n_channels)]
+
+
+def generate_session(
+    n_sensors: int = 1,
+    n_channels: int = 6,
+    duration_s: float = 600,
+    sampling_rate_hz: float = 100,
+    labels_per_minute: float = 6,
+    events_per_minute: float = 6,
+    seed: int = 0,
+) -> Dict[str, Dict]:
+    """Create sensor data with alternating resting and moving phases and random annotations.
+
+    Parameters
+    ----------
+    n_sensors
+        Number of plots, named `Sensor 0`, `Sensor 1`, ...
+    n_channels
+        Number of channels of each sensor, see :func:`channel_names`.
+    duration_s, sampling_rate_hz
+        Length of the recordings.
+    labels_per_minute, events_per_minute
+        Density of the `Activity` labels and `Peak` events. Labels do not overlap.
+    seed
+        Seed of the random number generator, such that the same parameters always create the same session.
+
+    Returns
+    -------
+    session
+        A dictionary with one entry per sensor, as returned by :meth:`~mad_gui.plugins.BaseImporter.load_sensor_data`
+        plus the key `annotations`.
+    """
+    rng = np.random.default_rng(seed)
+    n_samples = int(duration_s * sampling_rate_hz)
+    n_labels = int(labels_per_minute * duration_s / 60)
+    n_events = int(events_per_minute * duration_s / 60)
+
+    session = {}
+    for i_sensor in range(n_sensors):
+        # phases of ~5 s that either rest or move, which StationaryMomentsDetector can find
+        phase_length = max(int(5 * sampling_rate_hz), 1)
+        amplitude = np.repeat(rng.choice([0.01, 2.0], size=n_samples // phase_length + 1), phase_length)[:n_samples]
+        values = rng.normal(size=(n_samples, n_channels)).astype(np.float64) * amplitude[:, np.newaxis]
+        sensor_data = pd.DataFrame(values, columns=channel_names(n_channels))
+
+        session[f"Sensor {i_sensor}"] = {
+            "sensor_data": sensor_data,
+            "sampling_rate_hz": sampling_rate_hz,
+            "annotations": {
+                "Activity": _random_regions(rng, n_labels, n_samples),
+                "Peak": _random_events(rng, n_events, n_samples),
+            },
+        }
+    return session
+
+
+def _random_regions(rng: np.random.Generator, n_labels: int, n_samples: int) -> pd.DataFrame:
+    # sorted borders, where each pair of consecutive borders is one label, such that the labels do not overlap
+    n_labels = min(n_labels, n_samples // 2)
+    borders = np.sort(rng.choice(n_samples, size=2 * n_labels, replace=False))
+    descriptions = [ACTIVITY_DESCRIPTIONS[i] for i in rng.integers(len(ACTIVITY_DESCRIPTIONS), size=n_labels)]
+    return pd.DataFrame({"start": borders[0::2], "end": borders[1::2], "description": descriptions})
+
+
+def _random_events(rng: np.random.Generator, n_events: int, n_samples: int) -> pd.DataFrame:
+    positions = np.sort(rng.choice(n_samples, size=min(n_events, n_samples), replace=False))
+    descriptions = [PEAK_DESCRIPTIONS[i] for i in rng.integers(len(PEAK_DESCRIPTIONS), size=len(positions))]
+    return pd.DataFrame({"pos": positions, "description": descriptions})
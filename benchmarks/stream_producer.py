@@ -0,0 +1,106 @@
+"""Serve a synthetic sensor stream on a local TCP port, to try and test the streaming mode without a recording device.
+
+The stream consists of raw little endian float64 values, as read by :class:`mad_gui.models.streaming.RawStream`.
+Usage::
+
+    python benchmarks/stream_producer.py --port 5555 --channels 6 --sampling-rate-hz 100
+
+Then, an importer can return `RawStream.from_socket("localhost", 5555, channel_names(6), 100)` as `sensor_data`.
+"""
+import argparse
+import socket
+import threading
+import time
+
+import numpy as np
+
+from typing import Optional
+
+try:
+    from benchmarks.session_generator import channel_names
+except ModuleNotFoundError:
+    # executed as script from within the benchmarks folder
+    from session_generator import channel_names
+
+
+class StreamProducer:
+    """Send sine waves with noise in real time to the first client that connects.
+
+    Parameters
+    ----------
+    port
+        The port to listen on, `0` picks a free one (see :attr:`port`).
+    n_channels
+        The number of channels of the stream.
+    sampling_rate_hz
+        The sampling rate of the stream.
+    block_samples
+        The number of samples that are sent at once.
+    speed
+        Send the samples faster than real time by this factor.
+    """
+
+    def __init__(
+        self,
+        port: int = 0,
+        n_channels: int = 6,
+        sampling_rate_hz: float = 100,
+        block_samples: int = 10,
+        speed: float = 1.0,
+    ):
+        self.channels = channel_names(n_channels)
+        self.sampling_rate_hz = sampling_rate_hz
+        self.block_samples = block_samples
+        self.speed = speed
+        self.sent_samples = 0
+        self._server = socket.create_server(("localhost", port))
+        self.port = self._server.getsockname()[1]
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "StreamProducer":
+        self._thread = threading.Thread(target=self.serve, name="stream_producer", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve(self, max_samples: Optional[int] = None):
+        """Wait for a client and send samples to it until it disconnects, :meth:`stop` is called, or after
+        `max_samples`."""
+        connection, _ = self._server.accept()
+        rng = np.random.default_rng(0)
+        frequencies = 0.2 + np.arange(len(self.channels)) * 0.3
+        start = time.perf_counter()
+        with connection:
+            while not self._stopped.is_set() and (max_samples is None or self.sent_samples < max_samples):
+                t = (self.sent_samples + np.arange(self.block_samples)) / self.sampling_rate_hz
+                block = np.sin(2 * np.pi * np.outer(t, frequencies)) + rng.normal(0, 0.05, (len(t), len(frequencies)))
+                try:
+                    connection.sendall(block.astype("<f8").tobytes())
+                except OSError:
+                    return
+                self.sent_samples += self.block_samples
+                # send in real time instead of as fast as possible
+                delay = self.sent_samples / self.sampling_rate_hz / self.speed - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(1)
+        self._server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=5555)
+    parser.add_argument("--channels", type=int, default=6)
+    parser.add_argument("--sampling-rate-hz", type=float, default=100)
+    args = parser.parse_args()
+    producer = StreamProducer(args.port, args.channels, args.sampling_rate_hz)
+    print(f"Serving {producer.channels} at {args.sampling_rate_hz} Hz on localhost:{producer.port}")
+    producer.serve()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
 import os
 import platform
 import shutil
+import subprocess
+import sys
 import warnings
+from datetime import datetime
 from pathlib import Path
 
 DOIT_CONFIG = {
@@ -39,6 +42,51 @@ def task_test():
     }
 
 
+def task_benchmark():
+    """Time the main operations of the GUI for a large synthetic session and write the results to benchmark_results."""
+    results_dir = HERE / "benchmark_results"
+
+    def run_benchmark():
+        os.makedirs(results_dir, exist_ok=True)
+        output_file = results_dir / f"session_{datetime.now():%Y%m%d_%H%M%S}.json"
+        session = ["--sensors", "3", "--duration-s", "3600", "--labels-per-minute", "30"]
+        subprocess.run(
+            [sys.executable, str(HERE / "benchmarks/bench_session.py"), *session, "--output", str(output_file)],
+            check=True,
+        )
+
+    return {"actions": [run_benchmark], "verbosity": 2}
+
+
+def task_compile_ui():
+    """Generate the Python classes of the .ui files and the binary resource file, which makes starting the GUI faster."""
+    ui_dir = HERE / "mad_gui/qt_designer"
+    build_dir = ui_dir / "build"
+
+    def compile_ui():
+        os.makedirs(build_dir, exist_ok=True)
+        (build_dir / "__init__.py").touch()
+        for ui_file in ui_dir.glob("*.ui"):
+            subprocess.run(["pyside2-uic", "-o", str(build_dir / f"{ui_file.stem}.py"), str(ui_file)], check=True)
+        rcc_file = ui_dir / "window_buttons.rcc"
+        subprocess.run(
+            ["pyside2-rcc", "--binary", "-o", str(rcc_file), str(ui_dir / "window_buttons.qrc")], check=True, cwd=ui_dir
+        )
+        if not rcc_file.read_bytes().startswith(b"qres"):
+            # the GUI would ignore it and fall back to window_buttons_rc.py
+            os.remove(rcc_file)
+            warnings.warn(
+                "pyside2-rcc did not create a binary resource file, try `rcc --binary` of your Qt installation."
+            )
+
+    return {
+        "actions": [compile_ui],
+        "file_dep": [*ui_dir.glob("*.ui"), ui_dir / "window_buttons.qrc"],
+        "targets": [*(build_dir / f"{ui_file.stem}.py" for ui_file in ui_dir.glob("*.ui"))],
+        "verbosity": 2,
+    }
+
+
 def task_prepare_build():
     """Build a standalone windows executable."""
 
@@ -0,0 +1,5 @@
+"""Allows to run `python -m mad_gui` and `python -m mad_gui batch ...`."""
+from mad_gui.start_gui import main
+
+if __name__ == "__main__":
+    main()
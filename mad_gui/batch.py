@@ -0,0 +1,286 @@
+"""Run importers, algorithms and exporters on many recordings without opening the GUI.
+
+This executes the same chain as a user would do in the GUI using `Load data`, `Use algorithm` and `Export data`, but
+for all files in a directory tree. Every file is processed in a separate worker process. After each file, one line is
+appended to a manifest in the output directory, which keeps the timing of each step. If the batch is started again
+with the same output directory, files that were already processed successfully are skipped.
+
+Plugins may create Qt widgets, so each process creates a `QApplication`, which does not need a display. Messages of
+plugins (see :class:`~mad_gui.components.dialogs.UserInformation`) are stored in the manifest instead of being shown,
+and their questions are answered with `No`.
+
+Examples
+--------
+From the command line::
+
+    python -m mad_gui batch ./recordings ./results --importer "Example Importer" --pattern "*.csv" \\
+        --algorithm "Find Resting Phases (MaD GUI example)" --exporter "Export annotations to csv (MaD GUI example)"
+"""
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from mad_gui.components.dialogs.user_information import UserInformation
+from mad_gui.models.global_data import GlobalData
+from mad_gui.models.local import AnnotationData, PlotData
+from mad_gui.plugins.base import BaseAlgorithm, BaseExporter, BaseImporter, BasePlugin
+from mad_gui.plugins.discovery import is_plugin_of_kind, resolve_plugin
+from mad_gui.state_keeper import StateKeeper
+from typing import Dict, List, Optional, Sequence, Type, Union
+
+MANIFEST_NAME = "batch_manifest.jsonl"
+
+_application = None
+
+
+def process_file(
+    file: Union[str, Path],
+    output_dir: Union[str, Path],
+    importer: Type[BaseImporter],
+    algorithms: Sequence[Type[BaseAlgorithm]] = (),
+    exporter: Optional[Type[BaseExporter]] = None,
+    label_names: Sequence[str] = (),
+) -> Dict:
+    """Load a single file, apply the algorithms and export the result.
+
+    Parameters
+    ----------
+    file
+        The file that is passed to the importer's `load_sensor_data`.
+    output_dir
+        The directory that is passed to the exporter's :meth:`~mad_gui.plugins.BaseExporter.export_to_directory`.
+    importer
+        The importer to load the file with.
+    algorithms
+        Algorithms that are applied one after another to the loaded data.
+    exporter
+        The exporter that is used to store the results.
+    label_names
+        The names of the labels the algorithms may create, such that empty annotations exist for each of them,
+        like when the data is plotted in the GUI.
+
+    Returns
+    -------
+    record
+        A dictionary with the file, the status (`ok` or `failed`), an error message if something failed, the messages
+        the plugins wanted to show to the user, and the time in seconds each step took.
+    """
+    record = {"file": str(file), "status": "ok", "timings_s": {}, "messages": []}
+    timings = record["timings_s"]
+    start = time.perf_counter()
+    _ensure_application()
+    UserInformation.headless_messages = record["messages"]
+    try:
+        step_start = time.perf_counter()
+        data = importer().load_sensor_data(str(file))
+        plot_data = {name: PlotData.from_dict(sensor_data) for name, sensor_data in data.items()}
+        for plot in plot_data.values():
+            for label_name in label_names:
+                plot.annotations.setdefault(label_name, AnnotationData())
+        timings["load"] = time.perf_counter() - step_start
+
+        StateKeeper.executed_algorithms = []
+        for algorithm in algorithms:
+            step_start = time.perf_counter()
+            algorithm().process_data(plot_data)
+            StateKeeper.executed_algorithms.append(algorithm)
+            timings[algorithm.name()] = time.perf_counter() - step_start
+
+        if exporter is not None:
+            step_start = time.perf_counter()
+            global_data = GlobalData()
+            global_data.data_file = str(file)
+            global_data.plot_data = plot_data
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            exporter().export_to_directory(global_data, output_dir)
+            timings["export"] = time.perf_counter() - step_start
+    except Exception:  # noqa
+        # broad exception on purpose, a single broken recording should not stop the whole batch
+        record["status"] = "failed"
+        record["error"] = traceback.format_exc()
+    finally:
+        UserInformation.headless_messages = None
+    timings["total"] = time.perf_counter() - start
+    return record
+
+
+def _ensure_application():
+    """Create a `QApplication` without a window system, unless there already is one, e.g. because the GUI is open."""
+    global _application  # pylint: disable=global-statement
+    from PySide2.QtWidgets import QApplication  # pylint: disable=import-outside-toplevel
+
+    if QApplication.instance() is None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        _application = QApplication([])
+
+
+def read_completed_files(manifest: Union[str, Path]) -> set:
+    """Return all files that were processed successfully according to the manifest."""
+    manifest = Path(manifest)
+    if not manifest.exists():
+        return set()
+    completed = set()
+    with open(manifest, "r", encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # the last line might be incomplete if a previous run was killed
+                continue
+            if record.get("status") == "ok":
+                completed.add(record["file"])
+    return completed
+
+
+def run_batch(
+    input_dir: Union[str, Path],
+    output_dir: Union[str, Path],
+    importer: Type[BaseImporter],
+    algorithms: Sequence[Type[BaseAlgorithm]] = (),
+    exporter: Optional[Type[BaseExporter]] = None,
+    labels: Sequence[type] = (),
+    pattern: str = "*",
+    workers: Optional[int] = None,
+    resume: bool = True,
+) -> List[Dict]:
+    """Process all files in `input_dir` (recursively) that match `pattern`.
+
+    Parameters
+    ----------
+    input_dir
+        The directory to search for recordings.
+    output_dir
+        The results of each file are exported to `output_dir/<path relative to input_dir>/<file name>/`. The manifest
+        is stored in `output_dir` as well. If `output_dir` is inside of `input_dir`, it is not searched for recordings.
+    importer, algorithms, exporter
+        The plugins to use, see :func:`process_file`.
+    labels
+        Label and event classes, which are usually passed to :func:`~mad_gui.start_gui`.
+    pattern
+        Glob pattern for the files to process, e.g. `*.csv`.
+    workers
+        Number of worker processes. Uses the number of CPUs if `None`. If `0`, all files are processed in this process,
+        which can be helpful for debugging a plugin.
+    resume
+        Skip files that were processed successfully according to the manifest.
+
+    Returns
+    -------
+    records
+        The records of all files that were processed in this run, see :func:`process_file`.
+    """
+    input_dir = Path(input_dir).absolute()
+    output_dir = Path(output_dir).absolute()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = output_dir / MANIFEST_NAME
+
+    completed = read_completed_files(manifest) if resume else set()
+    files = sorted(
+        file
+        for file in input_dir.rglob(pattern)
+        if file.is_file() and output_dir not in file.parents and str(file) not in completed
+    )
+    label_names = [label.name for label in labels]
+
+    def file_output_dir(file: Path) -> Path:
+        return output_dir / file.relative_to(input_dir).parent / file.name
+
+    records = []
+    with open(manifest, "a", encoding="utf-8") as manifest_file:
+
+        def write_record(record: Dict):
+            records.append(record)
+            manifest_file.write(json.dumps(record) + "\n")
+            manifest_file.flush()
+            duration = record["timings_s"]["total"]
+            print(f"[{len(records)}/{len(files)}] {record['status']}: {record['file']} ({duration:.2f} s)")
+
+        if workers == 0:
+            for file in files:
+                write_record(process_file(file, file_output_dir(file), importer, algorithms, exporter, label_names))
+            return records
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(process_file, file, file_output_dir(file), importer, algorithms, exporter, label_names)
+                for file in files
+            ]
+            for future in as_completed(futures):
+                write_record(future.result())
+    return records
+
+
+def load_object(spec: str):
+    """Import an object given as `package.module:Name`."""
+    module_name, _, object_name = spec.partition(":")
+    if not object_name:
+        raise ValueError(f"Expected `package.module:Name`, but got {spec}.")
+    return getattr(importlib.import_module(module_name), object_name)
+
+
+def find_plugin(name: str, plugins: Sequence[Type[BasePlugin]], base_class: Type[BasePlugin]) -> Type[BasePlugin]:
+    """Find a plugin either by the name shown in the GUI's dropdown or by `package.module:Class`."""
+    if ":" in name:
+        plugin = load_object(name)
+    else:
+        matching = [plugin for plugin in plugins if is_plugin_of_kind(plugin, base_class) and plugin.name() == name]
+        if not matching:
+            known = [plugin.name() for plugin in plugins if is_plugin_of_kind(plugin, base_class)]
+            raise ValueError(f"There is no {base_class.__name__} with the name `{name}`. Known are: {known}")
+        plugin = resolve_plugin(matching[0])
+    if not issubclass(plugin, base_class):
+        raise ValueError(f"{plugin.__name__} does not inherit from {base_class.__name__}.")
+    return plugin
+
+
+def add_batch_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("input_dir", help="Directory with the recordings to process (searched recursively).")
+    parser.add_argument("output_dir", help="Directory for the exported results and the manifest.")
+    parser.add_argument("--importer", required=True, help="Name of the importer or `package.module:Class`.")
+    parser.add_argument(
+        "--algorithm",
+        action="append",
+        default=[],
+        help="Name of an algorithm or `package.module:Class`. Can be passed multiple times, order is kept.",
+    )
+    parser.add_argument("--exporter", help="Name of the exporter or `package.module:Class`.")
+    parser.add_argument(
+        "--label", action="append", default=[], help="Additional label class as `package.module:Class`."
+    )
+    parser.add_argument("--pattern", default="*", help="Glob pattern of files to process, e.g. `*.csv`.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of processes, 0 to run in this process.")
+    parser.add_argument("--no-resume", action="store_true", help="Process all files, even if already completed.")
+
+
+def run_batch_from_args(
+    args: argparse.Namespace, plugins: Sequence[Type[BasePlugin]] = (), labels: Sequence[type] = ()
+) -> List[Dict]:
+    plugins = list(plugins)
+    records = run_batch(
+        input_dir=args.input_dir,
+        output_dir=args.output_dir,
+        importer=find_plugin(args.importer, plugins, BaseImporter),
+        algorithms=[find_plugin(name, plugins, BaseAlgorithm) for name in args.algorithm],
+        exporter=find_plugin(args.exporter, plugins, BaseExporter) if args.exporter else None,
+        labels=[*labels, *(load_object(spec) for spec in args.label)],
+        pattern=args.pattern,
+        workers=args.workers,
+        resume=not args.no_resume,
+    )
+    failed = [record for record in records if record["status"] != "ok"]
+    print(f"Processed {len(records)} files, {len(failed)} failed. See {Path(args.output_dir) / MANIFEST_NAME}.")
+    return records
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Entry point of `mad-gui-batch`, which is the same as `python -m mad_gui batch`."""
+    # imported here, because mad_gui.start_gui imports this module
+    from mad_gui.start_gui import main as start_gui_main  # pylint: disable=import-outside-toplevel
+
+    start_gui_main(["batch", *(sys.argv[1:] if argv is None else argv)])
@@ -1,9 +1,9 @@
-from functools import reduce
+import time
 
 from PySide2.QtCore import QEvent, Qt
 from PySide2.QtWidgets import QButtonGroup, QDialog, QDialogButtonBox, QGroupBox, QHBoxLayout, QRadioButton, QVBoxLayout
 
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 
 def depth(d):
@@ -20,13 +20,58 @@ def depth(d):
     raise ValueError(f"Unknown type {type(d)}")
 
 
+def choice_tree(label_options: Union[List[str], Dict[str, Any], None]) -> Dict[Tuple[str, ...], List[str]]:
+    """Map the choices of the previous levels to the choices of the next level.
+
+    For example, `{"Jump": None, "Walk": ["Slow", "Fast"]}` results in `{(): ["Jump", "Walk"], ("Walk",): ["Slow",
+    "Fast"]}`. A selection that is not a key of the result is a final choice.
+    """
+    tree = {}
+
+    def add(path: Tuple[str, ...], options):
+        if options is None:
+            return
+        tree[path] = list(options.keys()) if isinstance(options, dict) else list(options)
+        if isinstance(options, dict):
+            for choice, sub_options in options.items():
+                add(path + (choice,), sub_options)
+
+    add((), label_options)
+    return tree
+
+
+def type_ahead_match(choices: List[str], typed: str, current: Optional[str] = None) -> Optional[str]:
+    """The first choice that starts with `typed` (ignoring the case), or `None` if no choice does.
+
+    If a single character is typed repeatedly, the matching choices are cycled through, starting after `current`.
+    """
+    typed = typed.lower()
+    if len(typed) > 1 and len(set(typed)) == 1:
+        typed = typed[0]
+    matches = [choice for choice in choices if choice.lower().startswith(typed)]
+    if not matches:
+        return None
+    if len(typed) == 1 and current in matches:
+        return matches[(matches.index(current) + 1) % len(matches)]
+    return matches[0]
+
+
 class NestedLabelSelectDialog(QDialog):
-    """A Window with Radio Buttons or Checkboxes"""
+    """A Window with Radio Buttons or Checkboxes
+
+    Use :meth:`for_descriptions` to get a dialog for the descriptions of a label class. It is created only once and
+    reused afterwards, such that the radio buttons do not have to be created each time a label is added or edited.
+    Besides clicking, a choice can be selected by pressing its number, or by typing the beginning of its name. Left
+    and right move between the levels and `Enter` or `Space` confirms the selection.
+    """
 
     _max_depth: int
     _label_options: Union[List[str], Dict[str, Any]]
 
     latest_selection_: Tuple[str, ...] = ()
+    _pool: Dict[int, Tuple[Any, "NestedLabelSelectDialog"]] = {}
+
+    TYPE_AHEAD_TIMEOUT_S = 1.0
 
     def __init__(self, parent=None, initial_selection: Tuple[str, ...] = None):
         super().__init__()
@@ -35,6 +80,8 @@ class NestedLabelSelectDialog(QDialog):
         self.setPalette(self.parent.palette())
         self.initial_selection = initial_selection or NestedLabelSelectDialog.latest_selection_
         self.main_layout = QVBoxLayout()
+        self.label_layout = QHBoxLayout()
+        self.main_layout.addLayout(self.label_layout)
         self.level_widgets: List[QVBoxLayout] = []
         self.level_button_group: List[QButtonGroup] = []
         self.buttons = QDialogButtonBox(parent=self)
@@ -42,119 +89,144 @@ class NestedLabelSelectDialog(QDialog):
         self.buttons.addButton("Cancel", QDialogButtonBox.RejectRole)
         self.buttons.accepted.connect(self.accept)
         self.buttons.rejected.connect(self.reject)
+        self.main_layout.addWidget(self.buttons)
         self.current_selection_ = NestedLabelSelectDialog.latest_selection_
         self.setWindowTitle("Set description")
 
+        self._max_depth = 0
+        self._label_options = None
+        self._tree: Dict[Tuple[str, ...], List[str]] = {}
+        # the radio buttons for the choices following a selection, which are hidden instead of deleted if the
+        # selection changes
+        self._level_buttons: Dict[Tuple[str, ...], List[QRadioButton]] = {}
+        self._shown_paths: List[Optional[Tuple[str, ...]]] = []
+        self._typed = ""
+        self._typed_at = 0.0
+
         self.setLayout(self.main_layout)
 
+    @classmethod
+    def for_descriptions(cls, descriptions: Union[List[str], Dict[str, Any]], parent) -> "NestedLabelSelectDialog":
+        """Return the dialog for the descriptions of a label class, which is created at the first call.
+
+        The descriptions are a class attribute of the label class, such that they identify it.
+        """
+        descriptions_and_dialog = cls._pool.get(id(descriptions), None)
+        if descriptions_and_dialog is not None and descriptions_and_dialog[0] is descriptions:
+            return descriptions_and_dialog[1]
+        dialog = cls(parent=parent)
+        # keeping a reference to the descriptions makes sure their id is not reused by other descriptions
+        cls._pool[id(descriptions)] = (descriptions, dialog)
+        return dialog
+
     def _setup_layout(self):
         # Create emtpy layouts based max depth
-        label_layout = QHBoxLayout()
-        self.main_layout.addLayout(label_layout)
+        for group_box in self.findChildren(QGroupBox):
+            self.label_layout.removeWidget(group_box)
+            group_box.deleteLater()
+        self.level_widgets, self.level_button_group = [], []
         for i in range(self._max_depth):
             group_box = QGroupBox(parent=self, title=f"Level {i}")
             group_box.setPalette(self.palette())
             inner_layout = QVBoxLayout()
             inner_layout.addStretch()
             group_box.setLayout(inner_layout)
-            label_layout.addWidget(group_box)
+            self.label_layout.addWidget(group_box)
             self.level_widgets.append(inner_layout)
             button_group = QButtonGroup(parent=group_box)
             button_group.setObjectName(str(i))
             button_group.buttonToggled.connect(self._on_label_select)
             self.level_button_group.append(button_group)
+        self._level_buttons = {}
+        self._shown_paths = [None] * self._max_depth
 
-        self.main_layout.addWidget(self.buttons)
-        self._setup_level(self._get_level_keys(self._label_options), level=0)
-
-        self.level_button_group[0].checkedButton().setFocus()
-
-    def _on_label_select(self, value):
-        if not value:
-            return None
+    def _on_label_select(self, _button, checked: bool):
+        if not checked:
+            return
         level = int(self.sender().objectName())
-        choices = self._get_choices(level + 1)
-        if choices is not None:
-            return self._setup_level(choices, level + 1)
-        # We have a final choice.
-        # We do nothing, but we need to cleanup all further levels"
-        for i in range(level + 1, self._max_depth):
-            self._clean_level(i)
-
-        self.current_selection_ = tuple(b.checkedButton().objectName() for b in self.level_button_group[: level + 1])
-        return None
-
-    def _get_choices(self, level):
-        if level == 0:
-            choices = self._label_options
-        else:
-            choices = reduce(
-                lambda x, y: x[y.checkedButton().objectName()],
-                self.level_button_group[: level - 1],
-                self._label_options,
-            )
-            if isinstance(choices, dict):
-                choices = choices[self.level_button_group[level - 1].checkedButton().objectName()]
-                if choices is None:
-                    # We have a final choice
-                    return None
-            else:
-                # We have a final choice
-                return None
-        return self._get_level_keys(choices)
-
-    @staticmethod
-    def _get_level_keys(level_choice: Union[List[str], Dict[str, Any]]):
-        if isinstance(level_choice, dict):
-            return list(level_choice.keys())
-        return level_choice
-
-    def _clean_level(self, level):
-        group = self.level_button_group[level]
-        for b in group.buttons():
-            b.deleteLater()
-
-    def _setup_level(self, choices: List[str], level: int):
-        widget = self.level_widgets[level]
-        group = self.level_button_group[level]
-
-        self._clean_level(level)
+        self._update_levels(level + 1)
 
-        pre_selected = None
+    def _update_levels(self, level: int):
+        """Show the choices of `level` and the following levels, which depend on the selection of the previous ones."""
+        path = tuple(group.checkedButton().objectName() for group in self.level_button_group[:level])
+        choices = self._tree.get(path, None)
+        if level >= self._max_depth or not choices:
+            # We have a final choice, so we hide all further levels
+            for i in range(level, self._max_depth):
+                self._show_level(i, None)
+            self.current_selection_ = path
+            return
+        self._show_level(level, path)
 
         initial_choice_for_level = None
         if self.initial_selection and len(self.initial_selection) > level:
             initial_choice_for_level = self.initial_selection[level]
+        # per default we select the first button
+        pre_selected = self._level_buttons[path][0]
+        if initial_choice_for_level in choices:
+            pre_selected = self._level_buttons[path][choices.index(initial_choice_for_level)]
+        # the following levels are updated below, even if the button was checked already
+        group = self.level_button_group[level]
+        group.blockSignals(True)
+        pre_selected.setChecked(True)
+        group.blockSignals(False)
+        self._update_levels(level + 1)
 
+    def _show_level(self, level: int, path: Optional[Tuple[str, ...]]):
+        if self._shown_paths[level] == path:
+            return
+        for button in self._level_buttons.get(self._shown_paths[level], []):
+            button.hide()
+        self._shown_paths[level] = path
+        if path is None:
+            return
+        if path not in self._level_buttons:
+            self._level_buttons[path] = self._create_buttons(level, self._tree[path])
+        for button in self._level_buttons[path]:
+            button.show()
+
+    def _create_buttons(self, level: int, choices: List[str]) -> List[QRadioButton]:
+        widget = self.level_widgets[level]
+        group = self.level_button_group[level]
+        buttons = []
         for i, choice in enumerate(choices):
             button = QRadioButton(str(i + 1) + ": " + choice, parent=self)
             # This is required so that we can capture the space key
             button.installEventFilter(self)
             button.setObjectName(choice)
-            if i == 0:
-                # per default we select the first button
-                pre_selected = button
-            if initial_choice_for_level == choice:
-                pre_selected = button
             # We insert instead of add to keep the stretch at the bottom
             widget.insertWidget(widget.count() - 1, button)
             group.addButton(button)
+            buttons.append(button)
+        return buttons
 
-        # Enable first checkbox:
-        pre_selected.setChecked(True)
-
-    def get_label(self, label_options: Union[List[str], Dict[str, Any]]):
-        self._max_depth = depth(label_options)
-        self._label_options = label_options
-        self._setup_layout()
-        if self.exec_():
+    def get_label(
+        self, label_options: Union[List[str], Dict[str, Any]], initial_selection: Optional[Tuple[str, ...]] = None
+    ):
+        if label_options is not self._label_options:
+            self._max_depth = depth(label_options)
+            self._label_options = label_options
+            self._tree = choice_tree(label_options)
+            self._setup_layout()
+        # reset the state of the previous use
+        if initial_selection is not None:
+            self.initial_selection = initial_selection
+        elif self.initial_selection is None:
+            self.initial_selection = NestedLabelSelectDialog.latest_selection_
+        self._typed = ""
+        self._update_levels(0)
+        self._focus_level(0)
+        accepted = self.exec_()
+        # the next use starts from the latest selection, unless an initial selection is given
+        self.initial_selection = None
+        if accepted:
             NestedLabelSelectDialog.latest_selection_ = self.current_selection_
             return self.current_selection_
         return None
 
     def keyPressEvent(self, event):  # noqa
         # Camelcase method overwrites qt method
-        if event.key() in (Qt.Key_Return, Qt.Key_Space):
+        if event.key() in (Qt.Key_Return, Qt.Key_Enter, Qt.Key_Space):
             event.accept()
             self.accept()
             return
@@ -162,23 +234,58 @@ class NestedLabelSelectDialog(QDialog):
             event.accept()
             self.reject()
             return
-        current_focus = self.focusWidget().parentWidget()
-        try:
-            level = self.level_widgets.index(current_focus.layout())
-        except ValueError:
+        level = self._focused_level()
+        if level is None:
             # This happens if a widget is focused that is not part of the label selection
             return
-        choices = self._get_choices(level)
+        if event.key() in (Qt.Key_Left, Qt.Key_Right):
+            self._focus_level(level + (1 if event.key() == Qt.Key_Right else -1))
+            event.accept()
+            return
+        choices = self._tree[self._shown_paths[level]]
         # Number keys start at 49 to 59
         mapping = dict(zip(range(49, 59), choices))
         k_choice = mapping.get(event.key(), None)
+        if k_choice is None:
+            k_choice = self._type_ahead(event.text(), choices, level)
         if k_choice is None:
             return
-        button: QRadioButton = current_focus.findChild(QRadioButton, k_choice)
+        button = self._level_buttons[self._shown_paths[level]][choices.index(k_choice)]
         button.setChecked(True)
+        button.setFocus()
         event.accept()
 
+    def _type_ahead(self, text: str, choices: List[str], level: int) -> Optional[str]:
+        if not text or not text.isprintable() or text.isspace():
+            return None
+        now = time.monotonic()
+        if now - self._typed_at > self.TYPE_AHEAD_TIMEOUT_S:
+            self._typed = ""
+        self._typed += text
+        self._typed_at = now
+        current = self.level_button_group[level].checkedButton()
+        return type_ahead_match(choices, self._typed, current.objectName() if current is not None else None)
+
+    def _focused_level(self) -> Optional[int]:
+        focused = self.focusWidget()
+        if focused is None or focused.parentWidget() is None:
+            return None
+        try:
+            level = self.level_widgets.index(focused.parentWidget().layout())
+        except ValueError:
+            return None
+        return level if self._shown_paths[level] is not None else None
+
+    def _focus_level(self, level: int):
+        if 0 <= level < self._max_depth and self._shown_paths[level] is not None:
+            self._typed = ""
+            self.level_button_group[level].checkedButton().setFocus()
+
     def eventFilter(self, q_object, event) -> bool:  # noqa
         if event.type() == QEvent.KeyPress and event.key() == Qt.Key_Space:
             self.keyPressEvent(event)
+        elif event.type() == QEvent.KeyPress and event.key() in (Qt.Key_Left, Qt.Key_Right):
+            # otherwise, the radio buttons use them to move to the previous / next choice of their level
+            self.keyPressEvent(event)
+            return True
         return super(NestedLabelSelectDialog, self).eventFilter(q_object, event)  # noqa
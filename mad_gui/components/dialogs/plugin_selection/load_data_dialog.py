@@ -7,42 +7,23 @@ from pathlib import Path
 import pandas as pd
 from PySide2 import QtCore
 from PySide2.QtGui import Qt
-from PySide2.QtUiTools import loadUiType
-from PySide2.QtWidgets import QDialog, QLabel, QLineEdit, QPushButton
+from PySide2.QtWidgets import QCheckBox, QDialog, QLabel, QLineEdit, QMessageBox, QPushButton
 
 from mad_gui import BaseImporter
 from mad_gui.components.dialogs.user_information import UserInformation
-from mad_gui.components.helper import ask_for_file_name, set_cursor
+from mad_gui.components.helper import ask_for_file_name, isolate_if_configured, set_cursor
 from mad_gui.config import Config
-from mad_gui.qt_designer import UI_PATH
-from mad_gui.utils.helper import resource_path
+from mad_gui.models.worklist import Worklist
+from mad_gui.plugins.caching import ImporterCache
+from mad_gui.plugins.discovery import resolve_plugin
+from mad_gui.plugins.sandbox import PluginExecutionError
+from mad_gui.qt_designer import load_ui_class
 from mad_gui.utils.model_base import BaseStateModel, Property
 from typing import Any, Dict, List, Optional, Tuple, Type
 
 LINK_IMPLEMENT_IMPORTER = "https://mad-gui.readthedocs.io/en/latest/customization.html#implement-an-importer"
 
-ui_path = resource_path(str(UI_PATH / "load.ui"))
-if ".ui" in ui_path:
-    try:
-        LoadWindow, _ = loadUiType(ui_path)
-    except TypeError:
-        try:
-            import sys
-            import os
-
-            uic_path = Path(os.sep.join(sys.executable.split(os.sep)[:-1])) / "Scripts"
-            sys.path.append(str(uic_path))
-            LoadWindow, _ = loadUiType(ui_path)
-        except TypeError as e:
-            raise FileNotFoundError(
-                "Probably python did not find `pyside2-uic`. See "
-                '"https://mad-gui.readthedocs.io/en/latest/troubleshooting.html#pyside2-uic-not-found" for more '
-                "information"
-            ) from e
-
-
-elif ".py" in ui_path:
-    from mad_gui.qt_designer.build.load import Ui_Form as LoadWindow  # noqa
+LoadWindow = load_ui_class("load", "Ui_Form")
 
 
 class LoadDataDialogState(BaseStateModel):
@@ -70,6 +51,12 @@ class LoadDataDialog(QDialog):
     initial_state
         Will be assigned to `self.state`, which keeps the data of this view.
 
+    Attributes
+    ----------
+    importer_cache
+        Keeps results of importers on disk, see :class:`~mad_gui.plugins.caching.ImporterCache`. It is only used if
+        the user keeps the checkbox `Use cache` checked.
+
     Methods
     -------
     get_data
@@ -99,6 +86,11 @@ class LoadDataDialog(QDialog):
         if self.state is None:
             self.state = LoadDataDialogState()
 
+        self.importer_cache = ImporterCache(
+            cache_dir=getattr(Config.settings, "IMPORTER_CACHE_DIR", None),
+            max_size_mb=getattr(Config.settings, "IMPORTER_CACHE_MAX_MB", 1024),
+        )
+
         self.ui = LoadWindow()
         self.setWindowIcon(parent.windowIcon())
         self.ui.setupUi(self)
@@ -117,6 +109,16 @@ class LoadDataDialog(QDialog):
         self.setWindowTitle("Load Data")
         self.ui.combo_plugin.addItems([loader.name() for loader in self.loaders])
 
+        self.check_use_cache = QCheckBox("Use cache (faster when loading the same file again)")
+        self.check_use_cache.setChecked(getattr(Config.settings, "USE_IMPORTER_CACHE", True))
+        self.btn_clear_cache = QPushButton("Clear cache")
+        self.btn_clear_cache.clicked.connect(self._handle_clear_cache)
+        self.ui.verticalLayout.addWidget(self.check_use_cache)
+        self.ui.verticalLayout.addWidget(self.btn_clear_cache)
+
+        self.check_worklist = QCheckBox("Afterwards, continue with the other files of this type in the folder")
+        self.ui.verticalLayout_2.addWidget(self.check_worklist)
+
         self.ui.btn_select_data.clicked.connect(lambda: self._handle_file_select("data_file"))
         self.ui.btn_select_video.clicked.connect(lambda: self._handle_file_select("video_file"))
         self.ui.btn_select_annotation.clicked.connect(lambda: self._handle_file_select("annotation_file"))
@@ -137,6 +139,9 @@ class LoadDataDialog(QDialog):
         for label in self.findChildren(QLabel):
             label.setStyleSheet(f"color: rgb({light.red()},{light.green()},{light.blue()});")
 
+        for check_box in self.findChildren(QCheckBox):
+            check_box.setStyleSheet(f"color: rgb({light.red()},{light.green()},{light.blue()});")
+
         for edit in self.findChildren(QLineEdit):
             edit.setStyleSheet(f"color: rgb({light.red()},{light.green()},{light.blue()});")
 
@@ -159,6 +164,14 @@ class LoadDataDialog(QDialog):
             self.state.set(property_name, file_name)
             self.base_dir = str(Path(file_name).parent)
 
+    def _handle_clear_cache(self):
+        size_mb = self.importer_cache.size_bytes() / 1024**2
+        answer = UserInformation.confirm(
+            f"Do you want to remove all cached importer results ({size_mb:.1f} MB in {self.importer_cache.cache_dir})?"
+        )
+        if answer == QMessageBox.Yes:
+            self.importer_cache.clear()
+
     def _handle_ok_click(self):
         """Use the selected loader for the selcted data.
 
@@ -183,15 +196,24 @@ class LoadDataDialog(QDialog):
         try:
             # TODO: Implement loader config
             user_config = {}
-            loader = self.loader_(parent=self, **user_config)
+            self.loader_ = resolve_plugin(self.loader_)
+            loader = isolate_if_configured(self.loader_(parent=self, **user_config))
         except Exception as e:  # noqa
             # ignore bare except because anything can go wrong in a user-implemented plugin
             print(e)
-            UserInformation().inform(f"Error creating an instance of the plugin {self.loader_.name}:\n\n {e}")
+            UserInformation().inform(f"Error creating an instance of the plugin {self.loader_.name()}:\n\n {e}")
             return None, None
 
+        cache = self.importer_cache if self.check_use_cache.isChecked() else None
         try:
-            data = loader.load_sensor_data(self.state.data_file)
+            if cache is not None:
+                data = cache.load_sensor_data(loader, self.state.data_file)
+            else:
+                data = loader.load_sensor_data(self.state.data_file)
+        except PluginExecutionError as e:
+            self.setCursor(Qt.ArrowCursor)
+            UserInformation.inform(f"Loading the data was stopped.\n\n{e}")
+            return None, None
         except Exception as e:  # noqa
             self.setCursor(Qt.ArrowCursor)
             UserInformation.inform(
@@ -206,7 +228,10 @@ class LoadDataDialog(QDialog):
         self.validate_data_format(data)
 
         if self.state.annotation_file:
-            annotations = loader.load_annotations(self.state.annotation_file)
+            if cache is not None:
+                annotations = cache.load_annotations(loader, self.state.annotation_file)
+            else:
+                annotations = loader.load_annotations(self.state.annotation_file)
             data = self._incorporate_annotations_to_data(data, annotations)
 
         return_dict = {
@@ -220,6 +245,9 @@ class LoadDataDialog(QDialog):
             # the plots for video-signal-synchronization
             return_dict = self._handle_video_file(return_dict, loader)
 
+        if self.check_worklist.isChecked():
+            return_dict["worklist"] = Worklist.from_directory(self.state.data_file, loader, cache=cache)
+
         return return_dict, loader
 
     def validate_data_format(self, plot_data: Dict):
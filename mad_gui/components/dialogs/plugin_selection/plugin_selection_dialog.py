@@ -1,43 +1,42 @@
 from PySide2 import QtCore
-from PySide2.QtUiTools import loadUiType
-from PySide2.QtWidgets import QDialog
+from PySide2.QtWidgets import QDialog, QMessageBox
 
 from mad_gui.components.dialogs.user_information import UserInformation
-from mad_gui.components.helper import set_cursor
+from mad_gui.components.helper import isolate_if_configured, set_cursor
+from mad_gui.config import Config
 from mad_gui.models.global_data import GlobalData
 from mad_gui.models.local import PlotData
-from mad_gui.plugins.base import BasePlugin
-from mad_gui.qt_designer import UI_PATH
-from mad_gui.utils.helper import resource_path
-from typing import List, Type
-
-ui_path = resource_path(str(UI_PATH / "plugin_selection.ui"))
-if ".ui" in ui_path:
-    try:
-        UiForm, _ = loadUiType(ui_path)
-    except TypeError:
-        try:
-            import sys
-            import os
-            from pathlib import Path
-
-            uic_path = Path(os.sep.join(sys.executable.split(os.sep)[:-1])) / "Scripts"
-            sys.path.append(str(uic_path))
-            UiForm, _ = loadUiType(ui_path)
-        except TypeError as e:
-            raise FileNotFoundError(
-                "Probably python did not find `pyside2-uic`. See "
-                '"https://mad-gui.readthedocs.io/en/latest/troubleshooting.html#pyside2-uic-not-found" for more '
-                "information"
-            ) from e
+from mad_gui.plugins.base import BaseAlgorithm, BasePlugin, BaseStreamingAlgorithm
+from mad_gui.plugins.caching import AlgorithmCache
+from mad_gui.plugins.discovery import resolve_plugin
+from mad_gui.plugins.pipeline import resolve_dependencies, run_pipeline
+from mad_gui.plugins.sandbox import PluginExecutionError
+from mad_gui.qt_designer import load_ui_class
+from mad_gui.state_keeper import StateKeeper
+from typing import List, Optional, Type
 
-elif ".py" in ui_path:
-    from mad_gui.qt_designer.build.plugin_selection import Ui_Form as UiForm  # noqa
+UiForm = load_ui_class("plugin_selection", "Ui_Form")
 
 
 class PluginSelectionDialog(QDialog):
     """A dialog to select the plugin to use.
 
+    Parameters
+    ----------
+    plugins
+        The plugins the user can select from.
+    parent
+        The main window.
+    algorithm_cache
+        If given, algorithms are applied via this cache, such that running an algorithm on unchanged data again
+        restores its previous result instead of computing it.
+
+    Attributes
+    ----------
+    executed_plugins
+        After an algorithm was applied, this keeps it and the algorithms it depends on that were executed before it,
+        see :attr:`~mad_gui.plugins.BaseAlgorithm.depends_on`.
+
     See Also
     --------
     :class:`~mad_gui.windows.BasePluginSelector`
@@ -46,16 +45,18 @@ class PluginSelectionDialog(QDialog):
 
     _data: PlotData
 
-    def __init__(self, plugins: List[Type[BasePlugin]], parent=None):
+    def __init__(self, plugins: List[Type[BasePlugin]], parent=None, algorithm_cache: Optional[AlgorithmCache] = None):
         super().__init__()
         self.plugins = plugins
         self.parent = parent
+        self.algorithm_cache = algorithm_cache
         self.ui = UiForm()
         self.setWindowIcon(parent.windowIcon())
         self.ui.setupUi(self)
         self.setStyleSheet(parent.styleSheet())
         self._setup_ui()
         self.executed_plugin = None
+        self.executed_plugins = []
 
     def _setup_ui(self):
         self.setWindowTitle("Select Plugin")
@@ -95,16 +96,35 @@ class PluginSelectionDialog(QDialog):
         try:
             # TODO: Implement loader config
             user_config = {}
+            plugin_class = resolve_plugin(plugin_class)
             plugin = plugin_class(parent=self, **user_config)
         except Exception as error:  # pylint: disable=broad-except
             # broad exception on purpose because we do not know which exceptions might be thrown by an plugin
             # created by someone else
             UserInformation().inform(f"Error loading Plugin {plugin_class.name()} \n Error:\n {str(error)}")
             return False
+        if not self._confirm_paged_data(plugin_class):
+            return False
 
         try:
-            plugin.process_data(self._data)
+            if isinstance(plugin, BaseAlgorithm):
+                steps = run_pipeline(
+                    [isolate_if_configured(plugin)],
+                    self._data,
+                    executed=self._executed_algorithms(plugin_class),
+                    cache=self.algorithm_cache,
+                    plugin_factory=lambda algorithm: isolate_if_configured(algorithm(parent=self)),
+                    max_workers=getattr(Config.settings, "PIPELINE_MAX_WORKERS", None),
+                )
+                self.executed_plugins = [step.algorithm for step in steps]
+            else:
+                plugin.process_data(self._data)
+                self.executed_plugins = [plugin_class]
             self.executed_plugin = plugin_class
+        except PluginExecutionError as error:
+            # the plugin ran in a separate process, so there is nothing to debug here
+            UserInformation().inform(str(error))
+            return False
         except Exception as error:
             UserInformation().inform(
                 f"An error occured inside your plugin {plugin_class.name()}: {str(error)}\n"
@@ -114,6 +134,37 @@ class PluginSelectionDialog(QDialog):
             raise error
         return True
 
+    def _confirm_paged_data(self, plugin_class) -> bool:
+        """Ask whether a plugin should receive the overview of paged sensor data, see :mod:`mad_gui.models.paging`."""
+        plot_data = self._data.plot_data if isinstance(self._data, GlobalData) else self._data
+        if not any(plot.source is not None for plot in plot_data.values()):
+            return True
+        if isinstance(plugin_class, type) and issubclass(plugin_class, BaseStreamingAlgorithm):
+            # reads all samples block by block
+            return True
+        answer = UserInformation.confirm(
+            f"The recording is too large to be kept in memory. Therefore, {plugin_class.name()} does not receive all "
+            "samples, but only an overview consisting of the minimum and maximum of short windows. Results that are "
+            "calculated from the sensor data will probably be wrong. Do you want to continue anyway?"
+        )
+        return answer == QMessageBox.Yes
+
+    @staticmethod
+    def _executed_algorithms(algorithm_class) -> List[Type[BaseAlgorithm]]:
+        """Return the algorithms that should not run before `algorithm_class` even though it depends on them."""
+        levels = resolve_dependencies([algorithm_class], StateKeeper.executed_algorithms)
+        missing = [dependency.name() for level in levels[:-1] for dependency in level]
+        if not missing:
+            return StateKeeper.executed_algorithms
+        # running them might replace annotations that the user created manually
+        answer = UserInformation.confirm(
+            f"{algorithm_class.name()} works with the results of {', '.join(missing)}, which have not been used yet. "
+            f"Do you want to run them first?"
+        )
+        if answer == QMessageBox.Yes:
+            return StateKeeper.executed_algorithms
+        return [*StateKeeper.executed_algorithms, *getattr(algorithm_class, "depends_on", ())]
+
     def process_data(self, data: GlobalData):
         self._data = data
         self.exec_()
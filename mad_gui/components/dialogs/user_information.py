@@ -2,7 +2,7 @@
 from PySide2.QtCore import Qt
 from PySide2.QtWidgets import QDialog, QMessageBox
 
-from typing import Optional
+from typing import List, Optional
 
 
 class UserInformation(QDialog):
@@ -14,8 +14,16 @@ class UserInformation(QDialog):
         Send a message to the use to be accepted with the `OK` button.
     confirm
         Pose a yes/no question and obtain the answer.
+
+    Attributes
+    ----------
+    headless_messages
+        If this is a list, messages are appended to it instead of being shown and questions are answered with `No`.
+        This is used when plugins run without the GUI, see :mod:`mad_gui.batch`.
     """
 
+    headless_messages: Optional[List[str]] = None
+
     @classmethod
     def _create_message(
         cls, text: str, buttons: [QMessageBox.StandardButton], help_link: Optional[str] = None
@@ -76,6 +84,9 @@ class UserInformation(QDialog):
         >>> from mad_gui.components.dialogs import UserInformation
         >>> UserInformation.inform("Please make sure to X")
         """
+        if cls.headless_messages is not None:
+            cls.headless_messages.append(text)
+            return
         if help_link:
             msg = cls._create_message(text, [QMessageBox.StandardButton.Ok], help_link)
         else:
@@ -118,5 +129,8 @@ class UserInformation(QDialog):
         ...
         Yes!
         """
+        if cls.headless_messages is not None:
+            cls.headless_messages.append(f"{text} No")
+            return QMessageBox.No
         msg = cls()._create_message(text, [QMessageBox.Yes, QMessageBox.No], help_link)
         return msg.exec_()
@@ -1,9 +1,12 @@
+import threading
 from pathlib import Path
 
 from PySide2.QtCore import QCoreApplication
-from PySide2.QtWidgets import QFileDialog
+from PySide2.QtWidgets import QApplication, QFileDialog, QWidget
 
-from typing import Optional
+from mad_gui.config import Config
+from mad_gui.plugins.sandbox import IsolatedPlugin
+from typing import Any, List, Optional
 
 
 def ask_for_file_name(base_dir: Path, parent=None, file_type="*.*") -> Optional[str]:
@@ -19,3 +22,40 @@ def ask_for_file_name(base_dir: Path, parent=None, file_type="*.*") -> Optional[
 def set_cursor(window, cursor_type):
     window.setCursor(cursor_type)
     QCoreApplication.processEvents()  # On windows, we have to force GUI to update the cursor
+
+
+class WindowBlocker:
+    """Disable all windows while a plugin runs in a worker process, see :func:`isolate_if_configured`.
+
+    The GUI keeps processing events while it waits for the worker. Without this, the user could, e.g., click `Use
+    algorithm` again and start a second run before the first one finished. Clicks on disabled windows are discarded.
+    """
+
+    def __init__(self):
+        self._disabled: List[QWidget] = []
+
+    def __call__(self, busy: bool):
+        if threading.current_thread() is not threading.main_thread():
+            # algorithms that run in parallel threads, see `PIPELINE_MAX_WORKERS`, while the GUI thread waits for them
+            return
+        if busy:
+            self._disabled = [widget for widget in QApplication.topLevelWidgets() if widget.isEnabled()]
+            for widget in self._disabled:
+                widget.setEnabled(False)
+        else:
+            for widget in self._disabled:
+                widget.setEnabled(True)
+            self._disabled = []
+
+
+def isolate_if_configured(plugin: Any) -> Any:
+    """Wrap `plugin` in an :class:`~mad_gui.plugins.sandbox.IsolatedPlugin`, if `ISOLATE_PLUGINS` is set."""
+    if not getattr(Config.settings, "ISOLATE_PLUGINS", False):
+        return plugin
+    return IsolatedPlugin(
+        plugin,
+        timeout_s=getattr(Config.settings, "PLUGIN_TIMEOUT_S", None),
+        max_memory_mb=getattr(Config.settings, "PLUGIN_MAX_MEMORY_MB", None),
+        poll_callback=QCoreApplication.processEvents,
+        busy_callback=WindowBlocker(),
+    )
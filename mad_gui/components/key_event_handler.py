@@ -1,4 +1,4 @@
-from PySide2.QtCore import QObject, Qt, Slot
+from PySide2.QtCore import QObject, Qt, Signal, Slot
 from PySide2.QtGui import QKeyEvent
 
 from mad_gui.models.ui_state import PlotState
@@ -15,7 +15,24 @@ def move_range(old_range: Tuple[float, float], distance: float, max_range: Tuple
 
 
 class KeyEventHandler(QObject):
-    """Used as a singleton to propagate key press events from children to :class:`mad_gui.windows.MainWindow`."""
+    """Used as a singleton to propagate key press events from children to :class:`mad_gui.windows.MainWindow`.
+
+    Attributes
+    ----------
+    undo_requested
+        Emitted upon `Ctrl+Z`.
+    redo_requested
+        Emitted upon `Ctrl+Y` or `Ctrl+Shift+Z`.
+    performance_hud_requested
+        Emitted upon `F12`, to show or hide the :class:`~mad_gui.components.performance_hud.PerformanceHud`.
+    search_requested
+        Emitted upon `Ctrl+F`, to show the :class:`~mad_gui.components.label_search.LabelSearchPanel`.
+    """
+
+    undo_requested = Signal()
+    redo_requested = Signal()
+    performance_hud_requested = Signal()
+    search_requested = Signal()
 
     STATE_CHANGE = {
         Qt.Key_A: "add",
@@ -32,9 +49,35 @@ class KeyEventHandler(QObject):
 
     @Slot(QKeyEvent)
     def key_pressed(self, event: QKeyEvent):
+        if self._undo_redo_events(event) or self._search_events(event):
+            return
+        if event.key() == Qt.Key_F12:
+            event.accept()
+            self.performance_hud_requested.emit()
+            return
         self._global_mode_change_events(event)
         self._global_plot_move(event)
 
+    def _undo_redo_events(self, ev) -> bool:
+        modifiers = ev.modifiers()
+        if not modifiers & Qt.ControlModifier:
+            return False
+        if ev.key() == Qt.Key_Z and not modifiers & Qt.ShiftModifier:
+            self.undo_requested.emit()
+        elif ev.key() == Qt.Key_Y or (ev.key() == Qt.Key_Z and modifiers & Qt.ShiftModifier):
+            self.redo_requested.emit()
+        else:
+            return False
+        ev.accept()
+        return True
+
+    def _search_events(self, ev) -> bool:
+        if ev.key() != Qt.Key_F or not ev.modifiers() & Qt.ControlModifier:
+            return False
+        self.search_requested.emit()
+        ev.accept()
+        return True
+
     def _global_mode_change_events(self, ev):
         new_mode = self.STATE_CHANGE.get(ev.key(), None)
         if new_mode:
@@ -0,0 +1,145 @@
+"""A panel to find annotations by their description and jump to them, see :class:`LabelSearchPanel`."""
+from PySide2.QtCore import QEvent, QObject, Qt, Signal
+from PySide2.QtGui import QKeyEvent
+from PySide2.QtWidgets import QHBoxLayout, QLabel, QLineEdit, QPushButton, QVBoxLayout, QWidget
+
+from mad_gui.models.label_index import Hit, LabelIndex
+from typing import Dict, List, Optional
+
+
+class LabelSearchPanel(QWidget):
+    """Search the annotations of all plots as the user types and step through the results.
+
+    Each word that is typed must be the beginning of a word of the annotation's description, label class, or plot,
+    e.g. `wal fa` finds a label described as `("Walking", "Fast")`. The buttons below the search field restrict the
+    results to the selected label classes and plots. `Enter` jumps to the next result, `Shift+Enter` to the previous
+    one, and `Esc` hides the panel.
+
+    Parameters
+    ----------
+    index
+        The index of all annotations, which is kept up to date by :class:`~mad_gui.windows.MainWindow`.
+    parent
+        The main window.
+
+    Attributes
+    ----------
+    hit_selected
+        Signal emitted with a :class:`~mad_gui.models.label_index.Hit`, when the user jumps to it.
+    """
+
+    hit_selected = Signal(object)
+
+    def __init__(self, index: LabelIndex, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.index = index
+        self.hits: List[Hit] = []
+        self.current = -1
+
+        self.query = QLineEdit(self)
+        self.query.setPlaceholderText("Search labels, e.g. 'walk fast'")
+        self.query.setClearButtonEnabled(True)
+        self.query.textChanged.connect(self.update_results)
+        # handles `Enter` and `Shift+Enter`, since `returnPressed` does not tell them apart
+        self.query.installEventFilter(self)
+        self.btn_previous = QPushButton("<", self)
+        self.btn_previous.clicked.connect(self.previous_hit)
+        self.btn_next = QPushButton(">", self)
+        self.btn_next.clicked.connect(self.next_hit)
+        self.count = QLabel(self)
+
+        search_row = QHBoxLayout()
+        search_row.addWidget(self.query)
+        search_row.addWidget(self.btn_previous)
+        search_row.addWidget(self.btn_next)
+        search_row.addWidget(self.count)
+        self.filter_row = QHBoxLayout()
+        layout = QVBoxLayout(self)
+        layout.addLayout(search_row)
+        layout.addLayout(self.filter_row)
+        self.class_filters: Dict[str, QPushButton] = {}
+        self.plot_filters: Dict[str, QPushButton] = {}
+        self.hide()
+
+    def show_and_focus(self):
+        self.refresh()
+        self.show()
+        self.query.setFocus()
+        self.query.selectAll()
+
+    def refresh(self):
+        """Update the filter buttons and the results after the annotations were replaced, e.g. by an algorithm."""
+        self.class_filters = self._update_filters(self.class_filters, self.index.label_classes)
+        self.plot_filters = self._update_filters(self.plot_filters, self.index.plots)
+        self.update_results()
+
+    def annotations_changed(self, _operation: Optional[Dict] = None):
+        """Update the results after a single annotation changed, but only while the results are shown."""
+        if self.isVisible():
+            self.update_results()
+
+    def update_results(self):
+        self.hits = self.index.search(
+            self.query.text(), self._checked(self.class_filters), self._checked(self.plot_filters)
+        )
+        self.current = -1
+        self._update_count()
+
+    def next_hit(self):
+        self._select(self.current + 1)
+
+    def previous_hit(self):
+        # the first step backwards from the start of the results wraps around to the last result
+        self._select(self.current - 1 if self.current >= 0 else len(self.hits) - 1)
+
+    def keyPressEvent(self, event: QKeyEvent):  # noqa
+        if event.key() == Qt.Key_Escape:
+            self.hide()
+            event.accept()
+            return
+        super().keyPressEvent(event)
+
+    def eventFilter(self, q_object: QObject, event: QEvent) -> bool:  # noqa
+        if q_object is self.query and event.type() == QEvent.KeyPress and event.key() in (Qt.Key_Return, Qt.Key_Enter):
+            if event.modifiers() & Qt.ShiftModifier:
+                self.previous_hit()
+            else:
+                self.next_hit()
+            return True
+        return super().eventFilter(q_object, event)
+
+    def _select(self, position: int):
+        if not self.hits:
+            return
+        self.current = position % len(self.hits)
+        self._update_count()
+        self.hit_selected.emit(self.hits[self.current])
+
+    def _update_count(self):
+        if not self.hits:
+            self.count.setText("no results" if self.query.text() else "")
+        elif self.current < 0:
+            self.count.setText(f"{len(self.hits)} results")
+        else:
+            self.count.setText(f"{self.current + 1} / {len(self.hits)}")
+
+    def _update_filters(self, buttons: Dict[str, QPushButton], names: List[str]) -> Dict[str, QPushButton]:
+        updated = {}
+        for name in names:
+            button = buttons.pop(name, None)
+            if button is None:
+                button = QPushButton(name, self)
+                button.setCheckable(True)
+                button.toggled.connect(self.update_results)
+                self.filter_row.addWidget(button)
+            updated[name] = button
+        for button in buttons.values():
+            # the label class or plot does not exist anymore
+            self.filter_row.removeWidget(button)
+            button.deleteLater()
+        return updated
+
+    @staticmethod
+    def _checked(buttons: Dict[str, QPushButton]) -> Optional[List[str]]:
+        """The names of the checked buttons, or `None` to not filter if none is checked."""
+        return [name for name, button in buttons.items() if button.isChecked()] or None
@@ -0,0 +1,89 @@
+"""Loads the visible part of a recording in the background, see :mod:`mad_gui.models.paging`."""
+from PySide2.QtCore import QObject, QTimer, Signal
+
+from mad_gui.models.paging import PageCache, PagedSensorData, pages_for_megabytes
+from typing import Optional, Tuple
+
+DEBOUNCE_MS = 50
+
+
+class PagedDataLoader(QObject):
+    """Read the visible part of a :class:`~mad_gui.models.paging.PagedSensorData` plus a margin on each side.
+
+    The visible range is submitted by the plot whenever the user pans or zooms. Once the range did not change for
+    :data:`DEBOUNCE_MS`, the window is read by the background thread of a :class:`~mad_gui.models.paging.PageCache`.
+    If the visible range contains too many samples to be shown in full resolution, the plot shows the overview.
+
+    Parameters
+    ----------
+    source
+        The paged sensor data of the plot.
+    sampling_rate_hz
+        The sampling rate of the data.
+    max_detail_samples
+        Full resolution data is only loaded if less than this many samples are visible.
+    cache_mb
+        The memory used for cached pages.
+    parent
+        The plot.
+
+    Attributes
+    ----------
+    window_loaded
+        Signal emitted in the GUI thread with the loaded window as :class:`pandas.DataFrame`, or with `None` if the
+        plot should show the overview again.
+    """
+
+    window_loaded = Signal(object)
+
+    def __init__(
+        self,
+        source: PagedSensorData,
+        sampling_rate_hz: float,
+        max_detail_samples: int = 1_000_000,
+        cache_mb: float = 256,
+        parent: Optional[QObject] = None,
+    ):
+        super().__init__(parent)
+        self.sampling_rate_hz = sampling_rate_hz
+        self.max_detail_samples = max_detail_samples
+        page_samples = 65536
+        self.cache = PageCache(source, page_samples, pages_for_megabytes(cache_mb, page_samples, source.channels))
+        self.shown: Optional[Tuple[int, int]] = None
+        self._visible: Optional[Tuple[int, int]] = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(DEBOUNCE_MS)
+        self._timer.timeout.connect(self._load)
+
+    def set_visible_range(self, x_min_s: float, x_max_s: float):
+        self._visible = (int(x_min_s * self.sampling_rate_hz), int(x_max_s * self.sampling_rate_hz) + 1)
+        self._timer.start()
+
+    def reset(self):
+        """Forget which window is shown, e.g. because the plot was drawn again from the overview."""
+        self.shown = None
+        if self._visible is not None:
+            self._timer.start()
+
+    def close(self):
+        self._timer.stop()
+        self.cache.close()
+
+    def _load(self):
+        start, stop = self._visible
+        if stop - start > self.max_detail_samples:
+            if self.shown is not None:
+                self.shown = None
+                self.window_loaded.emit(None)
+            return
+        if (
+            self.shown is not None
+            and self.shown[0] <= max(0, start)
+            and min(stop, self.cache.source.n_samples) <= self.shown[1]
+        ):
+            return
+        margin = stop - start
+        # the signal is emitted from the background thread, Qt delivers it in the thread of this object
+        self.cache.request(start - margin, stop + margin, self.window_loaded.emit)
+        self.shown = (max(0, start - margin), min(stop + margin, self.cache.source.n_samples))
@@ -0,0 +1,71 @@
+from PySide2.QtCore import Qt, QTimer
+from PySide2.QtWidgets import QLabel
+
+from mad_gui.utils import instrumentation
+from typing import Dict
+
+UPDATE_INTERVAL_MS = 500
+SHOWN_SPANS = 8
+
+
+def memory_usage_mb(plot_data) -> float:
+    """The memory used by the sensor data and the annotations of a :class:`~mad_gui.models.local.PlotData`."""
+    n_bytes = plot_data.data.memory_usage(deep=False).sum() if plot_data.data is not None else 0
+    for annotation in plot_data.annotations.values():
+        n_bytes += annotation.data.memory_usage(deep=True).sum()
+    return n_bytes / 1024**2
+
+
+class PerformanceHud(QLabel):
+    """An overlay in the upper right corner of the main window, which shows how fast the GUI currently is.
+
+    It shows the time it took to draw the plots, the number of items in each plot and the memory used by its data, and
+    the spans recorded by :mod:`mad_gui.utils.instrumentation` within the last second. Showing the overlay enables the
+    instrumentation.
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent=parent)
+        self.main_window = parent
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setTextFormat(Qt.PlainText)
+        self.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 170); color: rgb(220, 220, 220); font-family: monospace; padding: 6px;"
+        )
+        self._timer = QTimer(self)
+        self._timer.setInterval(UPDATE_INTERVAL_MS)
+        self._timer.timeout.connect(self.update_text)
+        self.hide()
+
+    def toggle(self):
+        self.set_visible(not self.isVisible())
+
+    def set_visible(self, visible: bool):
+        if visible:
+            instrumentation.enable()
+            self.update_text()
+            self.show()
+            self.raise_()
+            self._timer.start()
+        else:
+            self._timer.stop()
+            self.hide()
+
+    def update_text(self):
+        spans = instrumentation.summary(last_s=1)
+        paint = spans.pop("BasePlot.paintEvent", None)
+        if paint:
+            lines = [f"frame {paint['mean_ms']:6.1f} ms (max {paint['max_ms']:.1f} ms, {paint['count']} paints/s)"]
+        else:
+            lines = ["frame      - (no repaint)"]
+        for name, plot in self._plots().items():
+            n_items = len(plot.scene().items())
+            lines.append(f"{name}: {n_items} items, {memory_usage_mb(plot.plot_data):.1f} MB")
+        for name, stats in sorted(spans.items(), key=lambda item: -item[1]["total_ms"])[:SHOWN_SPANS]:
+            lines.append(f"{name}: {stats['count']}x {stats['mean_ms']:.1f} ms (max {stats['max_ms']:.1f} ms)")
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        self.move(self.main_window.width() - self.width() - 10, 10)
+
+    def _plots(self) -> Dict:
+        return getattr(self.main_window, "sensor_plots", {})
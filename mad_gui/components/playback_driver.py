@@ -0,0 +1,88 @@
+"""Forwards video positions to the plots at display rate while a video is playing."""
+import time
+from collections import deque
+
+from PySide2.QtCore import QObject, Qt, QTimer, Signal
+
+from typing import Optional
+
+
+class PlaybackDriver(QObject):
+    """Coalesce video positions and forward them to the plots at a capped frame rate.
+
+    While a video is playing, :class:`~mad_gui.windows.VideoWindow` receives a new position every few milliseconds.
+    Instead of moving the cursors and ranges of all plots for each of them, the positions are submitted to this driver.
+    It only keeps the latest position and emits it once per tick of its timer. If the driver is not running (e.g. the
+    video is paused and the user drags the slider), submitted positions are emitted immediately.
+
+    Parameters
+    ----------
+    max_fps
+        The maximum number of updates per second that are forwarded to the plots.
+    parent
+        The parent `QObject`, usually the :class:`~mad_gui.windows.VideoWindow`.
+
+    Attributes
+    ----------
+    position_changed
+        Signal emitted with the most recent position in percent since start of the synchronized stream.
+    """
+
+    position_changed = Signal(float)
+
+    def __init__(self, max_fps: float = 60, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._pending: Optional[float] = None
+        self._submitted_at: Optional[float] = None
+        self._latencies_ms = deque(maxlen=100)
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(max(1, int(1000 / max_fps)))
+        self.timer.timeout.connect(self.flush)
+
+    def start(self):
+        """Start forwarding positions at the capped frame rate."""
+        self.timer.start()
+
+    def stop(self):
+        """Stop the timer and forward the last pending position, such that the plots show the final frame."""
+        self.timer.stop()
+        self.flush()
+
+    def submit(self, percent_since_start: float):
+        """Set the position that will be forwarded with the next tick.
+
+        Parameters
+        ----------
+        percent_since_start
+            The percentage of the data stream since start, see :meth:`~mad_gui.windows.VideoWindow.frame_changed`.
+        """
+        if self._pending is None:
+            # we measure latency from the oldest position that is coalesced into the next update
+            self._submitted_at = time.perf_counter()
+        self._pending = percent_since_start
+        if not self.timer.isActive():
+            self.flush()
+
+    def flush(self):
+        """Emit the pending position, if there is one, and record how long it took until all plots were updated."""
+        if self._pending is None:
+            return
+        percent_since_start, self._pending = self._pending, None
+        self.position_changed.emit(percent_since_start)
+        # connected slots are called synchronously, so this includes updating cursors and ranges of all plots
+        self._latencies_ms.append((time.perf_counter() - self._submitted_at) * 1000)
+
+    @property
+    def last_latency_ms(self) -> Optional[float]:
+        """Time between receiving a position and having updated all plots for the most recent update."""
+        if not self._latencies_ms:
+            return None
+        return self._latencies_ms[-1]
+
+    @property
+    def latency_ms(self) -> Optional[float]:
+        """Mean end-to-end latency of the recent (up to 100) updates in milliseconds."""
+        if not self._latencies_ms:
+            return None
+        return sum(self._latencies_ms) / len(self._latencies_ms)
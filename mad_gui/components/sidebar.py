@@ -43,6 +43,7 @@ class Sidebar(QObject):
     def _toggle(self):
         if self.collapsed:
             self.ui.btn_load_data.setText("Load data")
+            self.ui.btn_next_recording.setText("Next recording")
             self.ui.btn_export.setText("Export data")
             self.ui.btn_use_algorithm.setText("Use algorithm")
             self.ui.btn_load_data_gui_format.setText("Reload displayed data")
@@ -53,6 +54,7 @@ class Sidebar(QObject):
             self.ui.btn_load_data_gui_format.setText("")
             self.ui.btn_use_algorithm.setText("")
             self.ui.btn_load_data.setText("")
+            self.ui.btn_next_recording.setText("")
             self.ui.btn_save_data_gui_format.setText("")
             self.ui.btn_export.setText("")
             # self.ui.btn_toggle_menu.setText("")
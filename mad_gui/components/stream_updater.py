@@ -0,0 +1,88 @@
+"""Moves received samples of a stream into the plot at a capped frame rate, see :mod:`mad_gui.models.streaming`."""
+import numpy as np
+import pandas as pd
+from PySide2.QtCore import QObject, QTimer, Signal
+
+from mad_gui.models.streaming import RingBuffer, SensorStream, StreamReceiver
+from typing import List, Optional
+
+
+class StreamUpdater(QObject):
+    """Collect the blocks received from a stream once per frame and announce that the plot should be updated.
+
+    The stream is read in a background thread by a :class:`~mad_gui.models.streaming.StreamReceiver`. Only the timer
+    of this object moves the received blocks into the :class:`~mad_gui.models.streaming.RingBuffer`, such that the
+    buffer is only accessed from the GUI thread.
+
+    Parameters
+    ----------
+    stream
+        The stream returned by the importer.
+    buffer_s
+        The number of seconds that are kept in the ring buffer.
+    max_fps
+        The maximum number of updates per second.
+    parent
+        The plot.
+    previous
+        The updater of a plot that showed the same stream before the plots were created again, e.g. after an
+        algorithm was applied. Its receiver and ring buffer are continued, such that neither samples nor the history
+        in the buffer are lost.
+
+    Attributes
+    ----------
+    samples_added
+        Signal emitted with the number of new samples, after they were added to :attr:`buffer`. All of them are
+        available via :meth:`new_samples`, even if there were more than fit into the buffer.
+    """
+
+    samples_added = Signal(int)
+
+    def __init__(
+        self,
+        stream: SensorStream,
+        buffer_s: float = 600,
+        max_fps: float = 30,
+        parent: Optional[QObject] = None,
+        previous: Optional["StreamUpdater"] = None,
+    ):
+        super().__init__(parent)
+        if previous is not None and previous.receiver.stream is stream:
+            previous.stop()
+            self.buffer, self.receiver = previous.buffer, previous.receiver
+        else:
+            self.buffer = RingBuffer(int(buffer_s * stream.sampling_rate_hz), stream.channels, stream.sampling_rate_hz)
+            self.receiver = StreamReceiver(stream)
+        self._new_blocks: List[np.ndarray] = []
+        self._new_first_sample = self.buffer.total_samples
+        self.timer = QTimer(self)
+        self.timer.setInterval(max(1, int(1000 / max_fps)))
+        self.timer.timeout.connect(self.update)
+        self.timer.start()
+
+    def update(self):
+        self._new_blocks = self.receiver.collect()
+        self._new_first_sample = self.buffer.total_samples
+        for block in self._new_blocks:
+            self.buffer.append(block)
+        n_new = self.buffer.total_samples - self._new_first_sample
+        if n_new:
+            self.samples_added.emit(n_new)
+        elif not self.receiver.is_running:
+            # the stream ended and everything was shown
+            self.timer.stop()
+
+    def new_samples(self) -> pd.DataFrame:
+        """The samples added by the latest update, indexed by their sample number like :meth:`RingBuffer.to_frame`."""
+        values = np.concatenate(self._new_blocks) if self._new_blocks else np.empty((0, len(self.buffer.channels)))
+        index = pd.RangeIndex(self._new_first_sample, self._new_first_sample + len(values))
+        return pd.DataFrame(values, index=index, columns=self.buffer.channels)
+
+    def stop(self):
+        """Stop updating the plot, while the stream is still received in the background, see `previous`."""
+        self.timer.stop()
+
+    def close(self):
+        """Stop updating the plot and close the stream, e.g. because other data is loaded."""
+        self.stop()
+        self.receiver.close()
@@ -25,7 +25,7 @@ class GlobalData(BaseStateModel):
     sync_file
         A file that keeps synchronization between video and sensor data. The GUI automatically searches for a file in
         the same folder as the video_file and if it finds a file, that has `*sync*.xlsx` in it assumes, this keeps
-        the video synchronization.
+        the video synchronization. A `.json` file with the same name next to it is read instead, if available.
     video_file
         File which contains the video to be displayed in the
         :class:`~mad_gui.components.dialogs.plugin_selection.LoadDataDialog`.
@@ -0,0 +1,63 @@
+"""Undo and redo of annotation changes."""
+from collections import deque
+
+from mad_gui.models.journal import invert_operation
+from typing import Dict, Optional
+
+
+class UndoHistory:
+    """Keep the recent annotation changes, such that they can be undone and redone.
+
+    The history stores the operations that are also written to the :class:`~mad_gui.models.journal.AnnotationJournal`.
+    Each of them only keeps the records of the single label that was changed, and undoing means applying the inverse
+    operation. Therefore, the memory needed for the history does not depend on the number of labels in the plots.
+
+    Parameters
+    ----------
+    max_steps
+        The number of changes that can be undone. Older changes are dropped.
+
+    Examples
+    --------
+    >>> history = UndoHistory()
+    >>> history.record(operation)  # for each change of an annotation
+    >>> plot.apply_annotation_operation(history.undo())
+    >>> plot.apply_annotation_operation(history.redo())
+    """
+
+    def __init__(self, max_steps: int = 500):
+        self._undo = deque(maxlen=max_steps)
+        self._redo = deque(maxlen=max_steps)
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def record(self, operation: Dict):
+        """Remember a change that was done by the user, which makes it impossible to redo undone changes."""
+        self._undo.append(operation)
+        self._redo.clear()
+
+    def undo(self) -> Optional[Dict]:
+        """Return the operation that reverts the most recent change or `None` if there is nothing to undo."""
+        if not self._undo:
+            return None
+        operation = self._undo.pop()
+        self._redo.append(operation)
+        return invert_operation(operation)
+
+    def redo(self) -> Optional[Dict]:
+        """Return the most recently undone operation or `None` if there is nothing to redo."""
+        if not self._redo:
+            return None
+        operation = self._redo.pop()
+        self._undo.append(operation)
+        return operation
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
@@ -0,0 +1,265 @@
+"""An append-only journal of annotation changes, which serves as autosave and enables crash recovery.
+
+Each change of a single annotation (a label or an event being added, moved, edited, or deleted) is appended as one
+line of JSON to a journal file. Together with a snapshot of all annotations at the time the data was loaded, the
+journal contains everything that is necessary to restore the annotations after a crash. To keep the journal short,
+it is regularly compacted, which means the operations are applied to the snapshot and the journal is truncated.
+Note that the journal does not replace saving: `Save displayed data` still writes the sensor data and all annotations
+to a new file, while the journal only makes keeping track of each change cheap.
+
+An operation is a dictionary like the following, where `before` is `None` for `add` and `after` is `None` for `delete`:
+
+>>> {
+...     "plot": "Pocket IMU",
+...     "op": "move",
+...     "label_class": "Activity",
+...     "kind": "region",
+...     "before": {"identifier": 0, "start": 100, "end": 300, "description": ["walking"]},
+...     "after": {"identifier": 0, "start": 120, "end": 300, "description": ["walking"]},
+... }
+
+Regions are identified by their `start` and `end` sample, events (`kind` is `event`) by their `pos` sample.
+"""
+import hashlib
+import json
+import os
+import pickle
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from typing import Dict, List, Optional, Union
+
+JOURNAL_FORMAT_VERSION = 1
+
+Annotations = Dict[str, Dict[str, pd.DataFrame]]
+"""The annotations of all plots, `{<plot name>: {<label class name>: <dataframe like AnnotationData.data>}}`."""
+
+
+def apply_operation(annotations: Annotations, operation: Dict) -> Annotations:
+    """Apply a single journaled operation to `annotations` in place and return them.
+
+    Raises
+    ------
+    KeyError
+        If the annotation that was changed according to `operation` does not exist in `annotations`.
+    """
+    plot_annotations = annotations.setdefault(operation["plot"], {})
+    df = plot_annotations.get(operation["label_class"], pd.DataFrame())
+    before, after = operation.get("before"), operation.get("after")
+    key_columns = ["pos"] if operation.get("kind") == "event" else ["start", "end"]
+
+    if before is not None:
+        if df.empty:
+            raise KeyError(f"Can not apply {operation['op']}, there are no annotations of {operation['label_class']}.")
+        matches = np.logical_and.reduce([df[column] == before[column] for column in key_columns])
+        if not matches.any():
+            raise KeyError(f"Can not apply {operation['op']}, the annotation {before} does not exist.")
+        df = df.drop(index=df.index[matches][0])
+    if after is not None:
+        df = pd.concat([df, pd.DataFrame.from_records([_from_json_record(after)])], ignore_index=True)
+    if not df.empty:
+        df = df.sort_values(by=key_columns[0]).reset_index(drop=True)
+    plot_annotations[operation["label_class"]] = df
+    return annotations
+
+
+def invert_operation(operation: Dict) -> Dict:
+    """Return the operation that reverts `operation`."""
+    inverse_op = {"add": "delete", "delete": "add"}.get(operation["op"], operation["op"])
+    return {**operation, "op": inverse_op, "before": operation.get("after"), "after": operation.get("before")}
+
+
+class AnnotationJournal:
+    """Keep an append-only journal of annotation changes for the currently loaded data file.
+
+    Parameters
+    ----------
+    directory
+        Where to keep snapshot and journal. Defaults to the environment variable `MAD_GUI_CACHE_DIR` or
+        `~/.cache/mad_gui`, plus `journal`.
+    compact_every
+        Compact the journal after this many operations.
+
+    Examples
+    --------
+    >>> journal = AnnotationJournal()
+    >>> if journal.has_recovery("/data/subject_01.csv"):
+    ...     annotations = journal.recover("/data/subject_01.csv")
+    >>> journal.start("/data/subject_01.csv", annotations)
+    >>> journal.append(operation)  # for each change of an annotation
+    """
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None, compact_every: int = 100):
+        if directory is None:
+            directory = Path(os.environ.get("MAD_GUI_CACHE_DIR", Path.home() / ".cache" / "mad_gui")) / "journal"
+        self.directory = Path(directory)
+        self.compact_every = compact_every
+        self.data_file: Optional[str] = None
+        self._annotations: Annotations = {}
+        self._pending: List[Dict] = []
+        self._seq = 0
+        self._journal_file = None
+
+    def snapshot_path(self, data_file: Union[str, Path]) -> Path:
+        return self.directory / f"{self._key(data_file)}.snapshot.pkl"
+
+    def journal_path(self, data_file: Union[str, Path]) -> Path:
+        return self.directory / f"{self._key(data_file)}.journal.jsonl"
+
+    @property
+    def is_active(self) -> bool:
+        return self.data_file is not None
+
+    def start(self, data_file: Union[str, Path], annotations: Annotations, saved: bool = True):
+        """Start journaling changes of annotations for `data_file`, beginning with a snapshot of `annotations`.
+
+        An existing journal for this file is overwritten, so check for :meth:`has_recovery` before.
+
+        Parameters
+        ----------
+        data_file
+            The file that was loaded, it identifies the journal.
+        annotations
+            The annotations as they are displayed after loading the file.
+        saved
+            Whether `annotations` correspond to a saved state, e.g. because they were just loaded from a file.
+        """
+        self.close()
+        self.data_file = str(data_file)
+        self._annotations = {plot: {k: v.copy() for k, v in labels.items()} for plot, labels in annotations.items()}
+        self._pending = []
+        self._seq = 0
+        self._write_snapshot(saved=saved)
+        self._journal_file = open(self.journal_path(data_file), "w", encoding="utf-8")  # noqa
+
+    def append(self, operation: Dict):
+        """Write a single operation to the journal, see the module's docstring for the format."""
+        if not self.is_active:
+            return
+        self._seq += 1
+        operation = {"seq": self._seq, "time": time.time(), **operation}
+        self._journal_file.write(json.dumps(operation, default=_to_json_value) + "\n")
+        self._journal_file.flush()
+        self._pending.append(operation)
+        if len(self._pending) >= self.compact_every:
+            self.compact()
+
+    def compact(self, saved: bool = False):
+        """Apply all journaled operations to the snapshot and truncate the journal.
+
+        Parameters
+        ----------
+        saved
+            Whether the current annotations were saved by the user, such that no recovery is necessary.
+        """
+        if not self.is_active:
+            return
+        for operation in self._pending:
+            apply_operation(self._annotations, operation)
+        self._pending = []
+        # the snapshot stores the last sequence number, so a crash before truncating does not apply operations twice
+        self._write_snapshot(saved=saved)
+        self._journal_file.seek(0)
+        self._journal_file.truncate()
+        self._journal_file.flush()
+
+    def replace(self, annotations: Annotations):
+        """Replace all annotations at once, e.g. after an algorithm was applied, by writing a new snapshot."""
+        if not self.is_active:
+            return
+        self.start(self.data_file, annotations, saved=False)
+
+    def close(self):
+        if self._journal_file is not None:
+            self._journal_file.close()
+        self._journal_file = None
+        self.data_file = None
+
+    def discard(self, data_file: Optional[Union[str, Path]] = None):
+        """Remove snapshot and journal, e.g. because the user decided to drop unsaved changes."""
+        data_file = data_file or self.data_file
+        if data_file is None:
+            return
+        if self.data_file == str(data_file):
+            self.close()
+        for path in [self.snapshot_path(data_file), self.journal_path(data_file)]:
+            if path.exists():
+                path.unlink()
+
+    def has_recovery(self, data_file: Union[str, Path]) -> bool:
+        """Whether there are changes of a previous session for `data_file`, which were not saved by the user."""
+        try:
+            snapshot = self._read_snapshot(data_file)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return False
+        return not snapshot["saved"] or bool(self._read_operations(data_file, after_seq=snapshot["seq"]))
+
+    def recover(self, data_file: Union[str, Path]) -> Annotations:
+        """Return the annotations of the last session for `data_file` by replaying the journal onto the snapshot.
+
+        Operations that can not be applied, e.g. because the last line was only written partially during a crash,
+        are skipped.
+        """
+        snapshot = self._read_snapshot(data_file)
+        annotations = snapshot["annotations"]
+        for operation in self._read_operations(data_file, after_seq=snapshot["seq"]):
+            try:
+                apply_operation(annotations, operation)
+            except KeyError:
+                continue
+        return annotations
+
+    def _write_snapshot(self, saved: bool):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.snapshot_path(self.data_file)
+        tmp_path = path.with_suffix(".tmp")
+        snapshot = {
+            "version": JOURNAL_FORMAT_VERSION,
+            "data_file": self.data_file,
+            "seq": self._seq,
+            "saved": saved,
+            "annotations": self._annotations,
+        }
+        with open(tmp_path, "wb") as file:
+            pickle.dump(snapshot, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def _read_snapshot(self, data_file: Union[str, Path]) -> Dict:
+        with open(self.snapshot_path(data_file), "rb") as file:
+            return pickle.load(file)
+
+    def _read_operations(self, data_file: Union[str, Path], after_seq: int) -> List[Dict]:
+        path = self.journal_path(data_file)
+        if not path.exists():
+            return []
+        operations = []
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    operation = json.loads(line)
+                except json.JSONDecodeError:
+                    # the last line might be incomplete if the GUI crashed while writing it
+                    continue
+                if operation["seq"] > after_seq:
+                    operations.append(operation)
+        return operations
+
+    @staticmethod
+    def _key(data_file: Union[str, Path]) -> str:
+        data_file = Path(data_file).absolute()
+        return f"{data_file.stem}_{hashlib.sha1(str(data_file).encode('utf-8')).hexdigest()[:12]}"
+
+
+def _to_json_value(value):
+    if hasattr(value, "item"):
+        # numpy scalars can not be serialized by json
+        return value.item()
+    return str(value)
+
+
+def _from_json_record(record: Dict) -> Dict:
+    # json turns the tuples of nested descriptions into lists
+    return {k: tuple(v) if isinstance(v, list) else v for k, v in record.items()}
@@ -0,0 +1,176 @@
+"""Find annotations by their description, label class, or plot, see :class:`LabelIndex`."""
+import re
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+_TOKEN = re.compile(r"\w+")
+
+
+class Hit(NamedTuple):
+    """An annotation that matches a search, `start` and `end` are in samples and equal for events."""
+
+    plot: str
+    label_class: str
+    start: float
+    end: float
+    description: Any
+
+
+def description_tokens(description: Any) -> List[str]:
+    """Split a (possibly nested) description like `("Walk", ("Fast", "Uphill"))` into lower case words."""
+    if description is None or (isinstance(description, float) and np.isnan(description)):
+        return []
+    if isinstance(description, (tuple, list)):
+        return [token for part in description for token in description_tokens(part)]
+    return _TOKEN.findall(str(description).lower())
+
+
+class LabelIndex:
+    """An inverted index from words to annotations, which answers prefix searches without scanning all annotations.
+
+    Each annotation is indexed by the words of its description, its label class, and the plot it belongs to. The
+    annotations of a label class of a plot can be replaced as a whole (:meth:`set_annotations`), e.g. after an
+    algorithm ran, or single annotations can be changed (:meth:`apply_change`), e.g. when the user edits a label.
+
+    Examples
+    --------
+    >>> index = LabelIndex()
+    >>> activities = pd.DataFrame({"start": [0], "end": [99], "description": [("Walk", "Fast")]})
+    >>> index.set_annotations("Left Foot", "Activity", activities)
+    >>> index.search("walk fa")
+    [Hit(plot='Left Foot', label_class='Activity', start=0, end=99, description=('Walk', 'Fast'))]
+    """
+
+    def __init__(self):
+        self._hits: Dict[int, Hit] = {}
+        self._tokens: Dict[int, Set[str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._groups: Dict[Tuple[str, str], Set[int]] = {}
+        self._next_id = 0
+        self._sorted_tokens: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._hits)
+
+    @property
+    def label_classes(self) -> List[str]:
+        return sorted({group[1] for group, ids in self._groups.items() if ids})
+
+    @property
+    def plots(self) -> List[str]:
+        return sorted({group[0] for group, ids in self._groups.items() if ids})
+
+    def clear(self):
+        self._hits.clear()
+        self._tokens.clear()
+        self._postings.clear()
+        self._groups.clear()
+        self._sorted_tokens = None
+
+    def set_plot_data(self, plot_data: Dict):
+        """Index all annotations of all plots, as kept in :attr:`mad_gui.models.GlobalData.plot_data`."""
+        self.clear()
+        for plot_name, plot in plot_data.items():
+            for label_class, annotations in plot.annotations.items():
+                self.set_annotations(plot_name, label_class, annotations.data)
+
+    def set_annotations(self, plot: str, label_class: str, annotations: pd.DataFrame):
+        """Replace the indexed annotations of a label class of a plot."""
+        for hit_id in self._groups.pop((plot, label_class), set()):
+            self._remove(hit_id)
+        if annotations is None or len(annotations) == 0:
+            return
+        is_event = "start" not in annotations.columns
+        starts = annotations["pos" if is_event else "start"].to_numpy()
+        ends = annotations["pos" if is_event else "end"].to_numpy()
+        descriptions = annotations["description"] if "description" in annotations.columns else [None] * len(starts)
+        for start, end, description in zip(starts, ends, descriptions):
+            self._add(Hit(plot, label_class, start, end, description))
+
+    def apply_change(self, operation: Dict):
+        """Update the index for a change as emitted by :attr:`~mad_gui.state_keeper.StateKeeper.annotation_changed`."""
+        plot, label_class = operation["plot"], operation["label_class"]
+        before, after = operation.get("before"), operation.get("after")
+        if before is not None:
+            start, end = self._position(before)
+            for hit_id in self._groups.get((plot, label_class), set()):
+                hit = self._hits[hit_id]
+                if hit.start == start and hit.end == end:
+                    self._remove(hit_id)
+                    break
+        if after is not None:
+            self._add(Hit(plot, label_class, *self._position(after), after.get("description", None)))
+
+    def search(
+        self, query: str = "", label_classes: Optional[Iterable[str]] = None, plots: Optional[Iterable[str]] = None
+    ) -> List[Hit]:
+        """Find the annotations that match all words of `query` and the filters, sorted by their start.
+
+        Parameters
+        ----------
+        query
+            Each word of the query must be the beginning of a word of the description, label class, or plot.
+        label_classes, plots
+            If given, only annotations of these label classes / plots are returned.
+        """
+        candidates: Optional[Set[int]] = None
+        for term in description_tokens(query):
+            matches = self._prefix_matches(term)
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+        for names, field in ((label_classes, 1), (plots, 0)):
+            if names is None:
+                continue
+            names = set(names)
+            in_groups = set().union(*(ids for group, ids in self._groups.items() if group[field] in names))
+            candidates = in_groups if candidates is None else candidates & in_groups
+        if candidates is None:
+            candidates = set(self._hits)
+        hits = [self._hits[hit_id] for hit_id in candidates]
+        return sorted(hits, key=lambda hit: (hit.start, hit.plot))
+
+    def _prefix_matches(self, prefix: str) -> Set[int]:
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._postings)
+        matches: Set[int] = set()
+        for i in range(bisect_left(self._sorted_tokens, prefix), len(self._sorted_tokens)):
+            token = self._sorted_tokens[i]
+            if not token.startswith(prefix):
+                break
+            matches |= self._postings[token]
+        return matches
+
+    def _add(self, hit: Hit):
+        hit_id = self._next_id
+        self._next_id += 1
+        tokens = set(description_tokens(hit.description) + description_tokens(hit.label_class))
+        tokens.update(description_tokens(hit.plot))
+        self._hits[hit_id] = hit
+        self._tokens[hit_id] = tokens
+        self._groups.setdefault((hit.plot, hit.label_class), set()).add(hit_id)
+        for token in tokens:
+            if token not in self._postings:
+                self._postings[token] = set()
+                self._sorted_tokens = None
+            self._postings[token].add(hit_id)
+
+    def _remove(self, hit_id: int):
+        hit = self._hits.pop(hit_id)
+        self._groups.get((hit.plot, hit.label_class), set()).discard(hit_id)
+        for token in self._tokens.pop(hit_id):
+            postings = self._postings[token]
+            postings.discard(hit_id)
+            if not postings:
+                del self._postings[token]
+                self._sorted_tokens = None
+
+    @staticmethod
+    def _position(record: Dict) -> Tuple[float, float]:
+        if "start" in record:
+            return record["start"], record["end"]
+        return record["pos"], record["pos"]
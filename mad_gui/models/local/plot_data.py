@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
+from mad_gui.models.paging import PagedSensorData
+from mad_gui.models.streaming import SensorStream
 from mad_gui.utils.model_base import BaseStateModel, Property
 from typing import Dict, List, Optional
 
@@ -65,13 +68,52 @@ class PlotData(BaseStateModel):
         Keeps things that belongs to the plotted data but should not be plotted. Here you can find everything that was
         returned from your loader for one sensor, where the key is not `sensor_data` or `sampling_rate_hz`, see
         :class:`mad_gui.plugins.BaseImporter`.
+
+    source
+        If the importer returned a :class:`~mad_gui.models.paging.PagedSensorData`, this keeps it and `data` is only
+        an overview of it, see :mod:`mad_gui.models.paging`.
+
+    stream
+        If the importer returned a :class:`~mad_gui.models.streaming.SensorStream`, this keeps it and `data` contains
+        the most recently received samples, see :mod:`mad_gui.models.streaming`.
     """
 
-    def __init__(self, data: pd.DataFrame, sampling_rate_hz: float, annotation: Dict = None, additional_data=None):
+    OVERVIEW_SAMPLES = 200_000
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        sampling_rate_hz: float,
+        annotation: Dict = None,
+        additional_data=None,
+        source: Optional[PagedSensorData] = None,
+        stream: Optional[SensorStream] = None,
+    ):
         self.data = data
+        self.source = source
+        self.stream = stream
         self.sampling_rate_hz = sampling_rate_hz
         self.annotations = annotation or {}
         self.additional_data = additional_data
+        self._time_axis = None
+        self._time_axis_key = None
+
+    @property
+    def time_axis(self) -> np.ndarray:
+        """The time of each sample of :attr:`data` in seconds, which is shared by all plotted channels.
+
+        The array is read-only and computed only once. It is computed again if the index of :attr:`data` or the
+        sampling rate changes.
+        """
+        if self.data is None:
+            return np.empty(0)
+        # keeping a reference to the index makes sure a new index can not be mistaken for the cached one
+        key = (self.data.index, self.sampling_rate_hz)
+        if self._time_axis_key is None or key[0] is not self._time_axis_key[0] or key[1] != self._time_axis_key[1]:
+            time_axis = self.data.index.to_numpy() / self.sampling_rate_hz
+            time_axis.setflags(write=False)
+            self._time_axis, self._time_axis_key = time_axis, key
+        return self._time_axis
 
     def to_dict(self):
         """Represent this object as a dictionary, such that it can be pickled.
@@ -81,7 +123,18 @@ class PlotData(BaseStateModel):
         dict
             A dictionary with the keys `sensor_data`, `annotations`, `events`, and `sampling_rate_hz`,
             where the first three are :class:`pandas.DataFrame` and the last is a float.
+
+        Raises
+        ------
+        ValueError
+            If the data is paged, because :attr:`data` is only an overview, which would be mistaken for the recording
+            when loading the dictionary again.
         """
+        if self.source is not None:
+            raise ValueError(
+                "The sensor data is paged (see mad_gui.models.paging), so only an overview of it is kept in memory, "
+                "which can not be saved in place of the recording."
+            )
         return {
             "sensor_data": self.data,
             "annotations": {k: v.to_df() for k, v in self.annotations.items() if k != "events"},
@@ -121,7 +174,13 @@ class PlotData(BaseStateModel):
         sensor_data = plot_data["sensor_data"]
         sampling_rate_hz = plot_data["sampling_rate_hz"]
 
-        obj = cls(sensor_data, sampling_rate_hz)
+        if isinstance(sensor_data, PagedSensorData):
+            obj = cls(sensor_data.overview(cls.OVERVIEW_SAMPLES), sampling_rate_hz, source=sensor_data)
+        elif isinstance(sensor_data, SensorStream):
+            no_samples = pd.DataFrame(columns=sensor_data.channels, index=pd.RangeIndex(0), dtype=float)
+            obj = cls(no_samples, sampling_rate_hz, stream=sensor_data)
+        else:
+            obj = cls(sensor_data, sampling_rate_hz)
         for selection in set(selections) - {"sensor_data", "sampling_rate_hz"}:
             if selection == "annotations":
                 obj._add_annotations(plot_data)
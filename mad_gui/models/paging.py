@@ -0,0 +1,208 @@
+"""Show recordings that do not fit into memory by loading only the part that is currently visible.
+
+Instead of a :class:`pandas.DataFrame`, an importer can return a :class:`PagedSensorData` as `sensor_data` from
+:meth:`~mad_gui.plugins.BaseImporter.load_sensor_data`. In that case :attr:`mad_gui.models.local.PlotData.data`
+only keeps an overview of the recording (see :meth:`PagedSensorData.overview`), which is shown when the user zooms
+out. As soon as the user zooms in far enough, the visible part of the recording plus a margin is read in a
+background thread via a :class:`PageCache` and shown in full resolution.
+
+Note that algorithms and exporters receive the overview in `PlotData.data`, so the GUI asks the user before running
+them. A :class:`~mad_gui.plugins.BaseStreamingAlgorithm` reads all samples block by block instead, and other plugins
+can read the full resolution data using `plot_data.source.read_window(...)`. Paged data can not be saved in the GUI
+format, since the overview would be mistaken for the recording when loading the file.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from typing import Callable, List, NamedTuple, Optional, Sequence
+
+
+class PagedSensorData:
+    """The sensor data of a single sensor, which is read window by window.
+
+    Importers subclass this and implement :meth:`read_window`, e.g. by seeking in a binary file or by reading
+    a row group of a Parquet file. For data that is already available as (memory mapped) array, see
+    :class:`ArraySensorData`.
+
+    Parameters
+    ----------
+    n_samples
+        The number of samples of the recording.
+    channels
+        The names of the channels.
+
+    Examples
+    --------
+    >>> class MyImporter(BaseImporter):
+    ...     def load_sensor_data(self, file):
+    ...         values = np.load(file, mmap_mode="r")
+    ...         return {"IMU": {"sensor_data": ArraySensorData(values, ["acc_x", "acc_y"]), "sampling_rate_hz": 100}}
+    """
+
+    def __init__(self, n_samples: int, channels: Sequence[str]):
+        self.n_samples = n_samples
+        self.channels = list(channels)
+
+    def read_window(
+        self, start_sample: int, stop_sample: int, channels: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """Read the samples from `start_sample` (inclusive) to `stop_sample` (exclusive).
+
+        Returns
+        -------
+        data
+            One column per channel and the sample numbers as index.
+        """
+        raise NotImplementedError()
+
+    def overview(self, max_samples: int, chunk_samples: int = 1_000_000) -> pd.DataFrame:
+        """A reduced version of the recording with at most `max_samples` rows, which keeps its peaks.
+
+        The recording is divided into buckets and for each bucket, the minimum and the maximum of each channel are
+        kept. The index consists of sample numbers of the recording, such that the overview is shown at the correct
+        time. However, within a bucket the minimum and maximum are shown at fixed positions.
+        The recording is read in chunks of `chunk_samples`, such that it never has to be in memory as a whole.
+        Importers that store an overview along with the recording can override this.
+        """
+        bucket = max(1, int(np.ceil(2 * self.n_samples / max_samples)))
+        if bucket == 1:
+            return self.read_window(0, self.n_samples)
+        chunk_samples = max(bucket, chunk_samples - chunk_samples % bucket)
+        parts = []
+        for start in range(0, self.n_samples, chunk_samples):
+            chunk = self.read_window(start, min(start + chunk_samples, self.n_samples)).to_numpy()
+            n_buckets = int(np.ceil(len(chunk) / bucket))
+            padded = np.full((n_buckets * bucket, chunk.shape[1]), np.nan)
+            padded[: len(chunk)] = chunk
+            padded = padded.reshape(n_buckets, bucket, -1)
+            envelope = np.empty((2 * n_buckets, chunk.shape[1]))
+            envelope[0::2] = np.nanmin(padded, axis=1)
+            envelope[1::2] = np.nanmax(padded, axis=1)
+            positions = start + np.arange(n_buckets) * bucket
+            index = np.minimum(np.stack([positions, positions + bucket // 2], 1).ravel(), self.n_samples - 1)
+            parts.append(pd.DataFrame(envelope, index=index))
+        overview = pd.concat(parts)
+        overview.columns = self.channels
+        return overview
+
+
+class ArraySensorData(PagedSensorData):
+    """Paged access to an array with one column per channel, e.g. a `numpy.memmap` or an HDF5 dataset."""
+
+    def __init__(self, values, channels: Sequence[str]):
+        super().__init__(len(values), channels)
+        self.values = values
+
+    def read_window(
+        self, start_sample: int, stop_sample: int, channels: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        start_sample, stop_sample = max(0, start_sample), min(self.n_samples, stop_sample)
+        window = pd.DataFrame(
+            np.asarray(self.values[start_sample:stop_sample]),
+            index=pd.RangeIndex(start_sample, max(start_sample, stop_sample)),
+            columns=self.channels,
+        )
+        return window if channels is None else window[list(channels)]
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    pages: int
+
+
+class PageCache:
+    """Read windows of a :class:`PagedSensorData` in pages of fixed size and keep the recently used ones in memory.
+
+    Parameters
+    ----------
+    source
+        The paged sensor data.
+    page_samples
+        The number of samples per page. Pages always contain all channels.
+    max_pages
+        The number of pages that are kept. If more pages are read, the least recently used ones are dropped.
+    """
+
+    def __init__(self, source: PagedSensorData, page_samples: int = 65536, max_pages: int = 64):
+        self.source = source
+        self.page_samples = page_samples
+        self.max_pages = max_pages
+        self._pages: "OrderedDict[int, pd.DataFrame]" = OrderedDict()
+        # pages are read by the background thread and the GUI thread
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mad_gui_pages")
+        self._pending: Optional[Future] = None
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(self._hits, self._misses, len(self._pages))
+
+    def read(self, start_sample: int, stop_sample: int, channels: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Return the samples from `start_sample` to `stop_sample`, reading only the pages that are not cached."""
+        start_sample, stop_sample = max(0, start_sample), min(self.source.n_samples, stop_sample)
+        if stop_sample <= start_sample:
+            return self.source.read_window(0, 0, channels)
+        first, last = start_sample // self.page_samples, (stop_sample - 1) // self.page_samples
+        window = pd.concat([self._page(index) for index in range(first, last + 1)])
+        window = window.loc[start_sample : stop_sample - 1]
+        return window if channels is None else window[list(channels)]
+
+    def request(
+        self,
+        start_sample: int,
+        stop_sample: int,
+        callback: Callable[[pd.DataFrame], None],
+        channels: Optional[Sequence[str]] = None,
+    ) -> Future:
+        """Read the window in the background thread and call `callback` with it from that thread.
+
+        A request that did not start yet is cancelled, since only the most recent window is of interest, e.g. while
+        the user is scrolling through the recording.
+        """
+        if self._pending is not None:
+            self._pending.cancel()
+
+        def read_and_call():
+            callback(self.read(start_sample, stop_sample, channels))
+
+        self._pending = self._executor.submit(read_and_call)
+        return self._pending
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+
+    def close(self):
+        """Stop the background thread and drop all pages."""
+        if self._pending is not None:
+            self._pending.cancel()
+        self._executor.shutdown(wait=False)
+        self.clear()
+
+    def _page(self, index: int) -> pd.DataFrame:
+        with self._lock:
+            page = self._pages.get(index, None)
+            if page is not None:
+                self._pages.move_to_end(index)
+                self._hits += 1
+                return page
+            self._misses += 1
+        start = index * self.page_samples
+        page = self.source.read_window(start, min(start + self.page_samples, self.source.n_samples))
+        with self._lock:
+            self._pages[index] = page
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        return page
+
+
+def pages_for_megabytes(megabytes: float, page_samples: int, channels: List[str]) -> int:
+    """The number of float64 pages that fit into the given amount of memory."""
+    return max(2, int(megabytes * 1024**2 / (page_samples * max(1, len(channels)) * 8)))
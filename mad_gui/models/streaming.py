@@ -0,0 +1,256 @@
+"""Show and annotate data while it is being recorded.
+
+Instead of a :class:`pandas.DataFrame`, an importer can return a :class:`SensorStream` as `sensor_data` from
+:meth:`~mad_gui.plugins.BaseImporter.load_sensor_data`. A :class:`StreamReceiver` reads blocks of samples from the
+stream in a background thread, and the plot moves them into a :class:`RingBuffer` at a capped frame rate (see
+:class:`~mad_gui.components.stream_updater.StreamUpdater`). The ring buffer keeps the most recent samples, which are
+also available as :attr:`mad_gui.models.local.PlotData.data`, e.g. for algorithms.
+
+Examples
+--------
+>>> class MyStreamImporter(BaseImporter):
+...     def load_sensor_data(self, file):
+...         # `file` could e.g. be a configuration file naming the port of the recording software
+...         stream = RawStream.from_socket("localhost", 5555, ["acc_x", "acc_y", "acc_z"], sampling_rate_hz=100)
+...         return {"IMU": {"sensor_data": stream, "sampling_rate_hz": 100}}
+"""
+import queue
+import socket
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from typing import BinaryIO, Iterator, List, Optional, Sequence, Union
+
+
+class RingBuffer:
+    """Keep the most recent `capacity` samples of all channels without moving them on each append.
+
+    The samples are stored in an array of twice the capacity. New samples are written behind the previous ones and
+    only when the end of the array is reached, the most recent `capacity` samples are moved to its beginning. Therefore,
+    :meth:`values` and :meth:`times` are always contiguous views, which can be plotted without copying them, and
+    appending takes constant time on average.
+
+    Parameters
+    ----------
+    capacity
+        The number of samples that are kept.
+    channels
+        The names of the channels.
+    sampling_rate_hz
+        Used to calculate the time of each sample, see :meth:`times`.
+    """
+
+    def __init__(self, capacity: int, channels: Sequence[str], sampling_rate_hz: float):
+        self.capacity = capacity
+        self.channels = list(channels)
+        self.sampling_rate_hz = sampling_rate_hz
+        # one contiguous row per channel and a last row with the time of each sample
+        self._storage = np.full((len(self.channels) + 1, 2 * capacity), np.nan)
+        self._stop = 0
+        self.total_samples = 0
+
+    def __len__(self) -> int:
+        return min(self._stop, self.capacity)
+
+    @property
+    def first_sample(self) -> int:
+        """The sample number (counted since the start of the stream) of the oldest sample in the buffer."""
+        return self.total_samples - len(self)
+
+    def append(self, block: Union[np.ndarray, pd.DataFrame]):
+        """Add samples, given as array of shape (samples, channels) or as dataframe with the channels as columns."""
+        if isinstance(block, pd.DataFrame):
+            block = block[self.channels].to_numpy()
+        block = np.asarray(block, dtype=float)
+        if len(block) > self.capacity:
+            # all samples in the buffer and the beginning of the block are dropped
+            self.total_samples += len(block) - self.capacity
+            self._stop = 0
+            block = block[-self.capacity :]
+        n_samples = len(block)
+        if n_samples == 0:
+            return
+        if self._stop + n_samples > len(self._storage[0]):
+            keep = self.capacity - n_samples
+            self._storage[:, :keep] = self._storage[:, self._stop - keep : self._stop]
+            self._stop = keep
+        self._storage[:-1, self._stop : self._stop + n_samples] = block.T
+        self._storage[-1, self._stop : self._stop + n_samples] = (
+            np.arange(self.total_samples, self.total_samples + n_samples) / self.sampling_rate_hz
+        )
+        self._stop += n_samples
+        self.total_samples += n_samples
+
+    def values(self, channel: str) -> np.ndarray:
+        return self._storage[self.channels.index(channel), self._stop - len(self) : self._stop]
+
+    def times(self) -> np.ndarray:
+        """The time in seconds since the start of the stream of each sample in the buffer."""
+        return self._storage[-1, self._stop - len(self) : self._stop]
+
+    def to_frame(self) -> pd.DataFrame:
+        """The samples in the buffer without copying them, indexed by their sample number."""
+        values = self._storage[:-1, self._stop - len(self) : self._stop]
+        index = pd.RangeIndex(self.first_sample, self.total_samples)
+        return pd.DataFrame(values.T, index=index, columns=self.channels, copy=False)
+
+
+class SensorStream:
+    """A source of samples that are being recorded, e.g. a socket, a pipe, or a file that is being appended to.
+
+    Subclasses implement :meth:`blocks`, see :class:`RawStream` for an example.
+
+    Parameters
+    ----------
+    channels
+        The names of the channels.
+    sampling_rate_hz
+        The sampling rate of the stream.
+    """
+
+    def __init__(self, channels: Sequence[str], sampling_rate_hz: float):
+        self.channels = list(channels)
+        self.sampling_rate_hz = sampling_rate_hz
+
+    def blocks(self) -> Iterator[np.ndarray]:
+        """Yield blocks of shape (samples, channels) as soon as they are available, until the stream ends.
+
+        This is called from a background thread and may block while waiting for data.
+        """
+        raise NotImplementedError()
+
+    def close(self):
+        """Stop reading, :meth:`blocks` should return soon after this was called."""
+
+
+class RawStream(SensorStream):
+    """A stream of raw little endian float64 values, where each sample consists of one value per channel.
+
+    Parameters
+    ----------
+    file
+        A file-like object opened in binary mode, e.g. `sys.stdin.buffer`, the `stdout` of a subprocess, or a file.
+    channels
+        The names of the channels.
+    sampling_rate_hz
+        The sampling rate of the stream.
+    follow
+        If true, wait for more data at the end of the file like `tail -f`, instead of ending the stream.
+    block_samples
+        The maximum number of samples per block.
+    """
+
+    POLL_INTERVAL_S = 0.05
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        channels: Sequence[str],
+        sampling_rate_hz: float,
+        follow: bool = False,
+        block_samples: int = 1024,
+    ):
+        super().__init__(channels, sampling_rate_hz)
+        self.file = file
+        self.follow = follow
+        self.block_samples = block_samples
+        self._closed = threading.Event()
+        self._socket: Optional[socket.socket] = None
+
+    @classmethod
+    def from_socket(cls, host: str, port: int, channels: Sequence[str], sampling_rate_hz: float) -> "RawStream":
+        connection = socket.create_connection((host, port))
+        stream = cls(connection.makefile("rb"), channels, sampling_rate_hz)
+        stream._socket = connection
+        return stream
+
+    @classmethod
+    def from_file(
+        cls, file: Union[str, Path], channels: Sequence[str], sampling_rate_hz: float, follow: bool = True
+    ) -> "RawStream":
+        """Read a file, which is possibly still being written by the recording software."""
+        return cls(open(file, "rb"), channels, sampling_rate_hz, follow=follow)  # pylint: disable=consider-using-with
+
+    def blocks(self) -> Iterator[np.ndarray]:
+        sample_bytes = 8 * len(self.channels)
+        remainder = b""
+        while not self._closed.is_set():
+            # read1 returns what is available instead of waiting for the whole block
+            read = getattr(self.file, "read1", self.file.read)
+            chunk = read(self.block_samples * sample_bytes)
+            if not chunk:
+                if not self.follow:
+                    return
+                time.sleep(self.POLL_INTERVAL_S)
+                continue
+            data = remainder + chunk
+            usable = len(data) - len(data) % sample_bytes
+            remainder = data[usable:]
+            if usable:
+                yield np.frombuffer(data[:usable], dtype="<f8").reshape(-1, len(self.channels))
+
+    def close(self):
+        self._closed.set()
+        if self._socket is not None:
+            # unblocks a pending read
+            self._socket.shutdown(socket.SHUT_RDWR)
+            self._socket.close()
+        self.file.close()
+
+
+class StreamReceiver:
+    """Read the blocks of a :class:`SensorStream` in a background thread and keep them until they are collected.
+
+    Parameters
+    ----------
+    stream
+        The stream to read from.
+    max_blocks
+        If the GUI does not collect blocks for a while, at most this many are kept. Reading from the stream waits
+        until blocks were collected, such that memory is bounded.
+    """
+
+    def __init__(self, stream: SensorStream, max_blocks: int = 1000):
+        self.stream = stream
+        self.error: Optional[Exception] = None
+        self._blocks: queue.Queue = queue.Queue(maxsize=max_blocks)
+        self._thread = threading.Thread(target=self._receive, name="mad_gui_stream", daemon=True)
+        self._thread.start()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread.is_alive()
+
+    def collect(self) -> List[np.ndarray]:
+        """Return all blocks that were received since the last call."""
+        blocks = []
+        while True:
+            try:
+                blocks.append(self._blocks.get_nowait())
+            except queue.Empty:
+                return blocks
+
+    def collect_into(self, buffer: RingBuffer) -> int:
+        """Move the received blocks into the buffer and return the number of new samples."""
+        before = buffer.total_samples
+        for block in self.collect():
+            buffer.append(block)
+        return buffer.total_samples - before
+
+    def close(self, timeout_s: float = 1.0):
+        self.stream.close()
+        # unblock the thread if it waits for blocks to be collected
+        self.collect()
+        self._thread.join(timeout_s)
+
+    def _receive(self):
+        try:
+            for block in self.stream.blocks():
+                self._blocks.put(block)
+        except (OSError, ValueError) as error:
+            # the stream was closed while reading
+            self.error = error
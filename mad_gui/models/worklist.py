@@ -0,0 +1,129 @@
+"""Keeps a list of recordings that the user annotates one after another."""
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+
+class Worklist:
+    """A list of recordings, where the next recording is loaded in the background.
+
+    While the user annotates the current recording, the next one is loaded with the same importer in a separate thread.
+    Therefore, switching to the next recording using :meth:`next` usually does not have to wait for the importer. To
+    limit memory usage, at most one recording ahead of the current one is kept in memory. If loading in the background
+    fails, :meth:`next` loads the recording again in the calling thread. This way, importers that show a dialog, which
+    is only possible in the GUI thread, still work and errors are raised where the user can be informed about them.
+
+    Parameters
+    ----------
+    files
+        The recordings to work through in the given order.
+    importer
+        An instance of the importer (see :class:`~mad_gui.plugins.BaseImporter`) that is used to load the recordings.
+    start_index
+        The index of the recording that is currently displayed.
+    cache
+        If given, recordings are loaded via this :class:`~mad_gui.plugins.caching.ImporterCache`.
+
+    Examples
+    --------
+    >>> worklist = Worklist.from_directory("/data/subject_01.csv", ExampleImporter())
+    >>> worklist.prefetch()
+    >>> # ... the user annotates subject_01
+    >>> file, data = worklist.next()
+    """
+
+    def __init__(self, files: Sequence[Union[str, Path]], importer, start_index: int = 0, cache=None):
+        self.files: List[str] = [str(file) for file in files]
+        self.importer = importer
+        self.index = start_index
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mad_gui_prefetch")
+        self._prefetched: Optional[Tuple[int, Future]] = None
+
+    @classmethod
+    def from_directory(cls, selected_file: Union[str, Path], importer, cache=None) -> "Worklist":
+        """Create a worklist of all files in the folder of `selected_file` that have the same file ending.
+
+        The files are sorted by name and the worklist starts at `selected_file`.
+        """
+        selected_file = Path(selected_file)
+        files = sorted(file for file in selected_file.parent.glob(f"*{selected_file.suffix}") if file.is_file())
+        return cls(files, importer, start_index=files.index(selected_file), cache=cache)
+
+    @property
+    def current_file(self) -> str:
+        return self.files[self.index]
+
+    @property
+    def has_next(self) -> bool:
+        return self.index + 1 < len(self.files)
+
+    @property
+    def remaining(self) -> int:
+        return len(self.files) - self.index - 1
+
+    def prefetch(self):
+        """Start loading the recording after the current one in the background, if that did not happen yet."""
+        if not self.has_next:
+            return
+        next_index = self.index + 1
+        if self._prefetched is not None and self._prefetched[0] == next_index:
+            return
+        self._discard_prefetched()
+        self._prefetched = (next_index, self._executor.submit(self.load, self.files[next_index]))
+
+    def next(self) -> Tuple[str, Dict[str, Any]]:
+        """Move to the next recording and start prefetching the one after it.
+
+        Returns
+        -------
+        file, data
+            The file of the next recording and the result of :meth:`load` for it.
+
+        Raises
+        ------
+        IndexError
+            If the current recording is the last one.
+        Exception
+            Anything the importer raised when loading the recording.
+        """
+        if not self.has_next:
+            raise IndexError("There are no more recordings in the worklist.")
+        next_index = self.index + 1
+        if self._prefetched is not None and self._prefetched[0] == next_index:
+            future = self._prefetched[1]
+            # the data is handed over to the caller, so we do not keep a reference to it
+            self._prefetched = None
+            if future.exception() is None:
+                data = future.result()
+            else:
+                data = self.load(self.files[next_index])
+        else:
+            self._discard_prefetched()
+            data = self.load(self.files[next_index])
+        self.index = next_index
+        self.prefetch()
+        return self.current_file, data
+
+    def load(self, file: str) -> Dict[str, Any]:
+        """Load a recording in the same format as :meth:`~mad_gui.components.dialogs.LoadDataDialog.get_data`."""
+        if self.cache is not None:
+            plot_data_dicts = self.cache.load_sensor_data(self.importer, file)
+        else:
+            plot_data_dicts = self.importer.load_sensor_data(file)
+        return {
+            "plot_data_dicts": plot_data_dicts,
+            "data_file_name": file,
+            "start_time": self.importer.get_start_time(file),
+        }
+
+    def close(self):
+        """Drop prefetched data and stop the background thread."""
+        self._discard_prefetched()
+        self._executor.shutdown(wait=False)
+
+    def _discard_prefetched(self):
+        if self._prefetched is not None:
+            self._prefetched[1].cancel()
+            self._prefetched = None
@@ -8,7 +8,7 @@ from mad_gui.components.dialogs import UserInformation
 from mad_gui.components.dialogs.label_annotation_dialog import NestedLabelSelectDialog
 from mad_gui.config import Config
 from mad_gui.state_keeper import StateKeeper
-from typing import Optional, Union, Sequence
+from typing import Dict, Optional, Union, Sequence
 
 
 class InvalidStartEnd(Exception):
@@ -37,6 +37,8 @@ class BaseEventLabel(pg.InfiniteLine):
         self.parent = parent
         self.removable = False
         self.belongs_to_region_label = belongs_to_region_label
+        # set by the region label, if this event belongs to one
+        self.region_label: Optional["BaseRegionLabel"] = None
         self.base_pen = mkPen(color="b", style=Qt.DashLine)
         self.description = description
         self.min_height = min_height or 0
@@ -45,6 +47,26 @@ class BaseEventLabel(pg.InfiniteLine):
         super().__init__(
             pos=pos_seconds, span=(self.min_height, self.max_height), pen=mkPen(color="b", style=Qt.DashLine)
         )
+        self._last_record = self.to_record()
+
+    def to_record(self) -> Dict:
+        """Represent this event like a row of the plot's annotations, see :class:`~mad_gui.models.local.PlotData`."""
+        return {
+            "pos": int(self.pos().x() * self.parent.plot_data.sampling_rate_hz),
+            "min_height": self.span[0],
+            "max_height": self.span[1],
+            "description": self.description,
+        }
+
+    def report_change(self, operation: str):
+        """Announce that this event was added, moved, edited, or deleted, see
+        :meth:`~mad_gui.plot_tools.plots.BasePlot.report_annotation_change`."""
+        if self.belongs_to_region_label:
+            # those are part of the region label's record, so the region label reports the change
+            if self.region_label is not None and operation != "add":
+                self.region_label.report_change("move" if operation == "move" else "edit")
+            return
+        self._last_record = _report_change(self, operation)
 
     def hoverEvent(self, event: QHoverEvent):  # noqa: N802
         """Actions when hovering over the InfiniteLine`"""
@@ -71,6 +93,7 @@ class BaseEventLabel(pg.InfiniteLine):
         if self.removable:
             self.parent.removeItem(self)
             self.parent.setCursor(Qt.ArrowCursor)
+            self.report_change("delete")
         elif self.movable:
             super().mousePressEvent(event)
             if event.modifiers() == Qt.ControlModifier:
@@ -82,12 +105,16 @@ class BaseEventLabel(pg.InfiniteLine):
                     pass
                 else:
                     self.description = description
+                    self.report_change("edit")
             else:
                 self.setPos(self.parent.snap_to_sample(self.pos().x()))
+                self.report_change("move")
 
     def mouseDragEvent(self, ev):  # noqa: N802
         super().mouseDragEvent(ev)
         self.setPos(self.parent.snap_to_sample(self.pos().x()))
+        if ev.isFinish():
+            self.report_change("move")
 
     def make_editable(self):
         self.removable = False
@@ -184,6 +211,26 @@ class BaseRegionLabel(pg.LinearRegionItem):
                 description = self.description
             self.setToolTip(f"{self.name}: {description}")
         self.setEnabled(False)
+        self._last_record = self.to_record()
+
+    def to_record(self) -> Dict:
+        """Represent this label like a row of the plot's annotations, see :class:`~mad_gui.models.local.PlotData`."""
+        sampling_rate_hz = self.parent.plot_data.sampling_rate_hz
+        start, end = self.getRegion()
+        record = {
+            "identifier": getattr(self, "id", None),
+            "start": int(start * sampling_rate_hz),
+            "end": int(end * sampling_rate_hz),
+            "description": getattr(self, "description", None),
+        }
+        for event_name, event_label in self.event_labels.items():
+            record[event_name] = event_label.pos().x() * sampling_rate_hz
+        return record
+
+    def report_change(self, operation: str):
+        """Announce that this label was added, moved, edited, or deleted, see
+        :meth:`~mad_gui.plot_tools.plots.BasePlot.report_annotation_change`."""
+        self._last_record = _report_change(self, operation)
 
     def _set_events(self, events: pd.DataFrame):
         for event, pos in events.items():
@@ -197,6 +244,7 @@ class BaseRegionLabel(pg.LinearRegionItem):
                 max_height=self.max_height,
                 belongs_to_region_label=True,
             )
+            self.event_labels[event].region_label = self
 
     def _left_mouse_click_event(self, ev):
         if self.removable and ev.button() == Qt.LeftButton:
@@ -204,6 +252,7 @@ class BaseRegionLabel(pg.LinearRegionItem):
                 self.parent.removeItem(event)
             self.parent.removeItem(self)
             StateKeeper.set_has_unsaved_changes(True)
+            self.report_change("delete")
         elif self.editable and ev.button() == Qt.LeftButton:
             if not self.descriptions:
                 UserInformation.inform(
@@ -219,6 +268,8 @@ class BaseRegionLabel(pg.LinearRegionItem):
                 )
             except NoLabelSelected:
                 pass
+            else:
+                self.report_change("edit")
 
     def _hover_event(self, ev):
         """Coloring if mouse hovers of the stride"""
@@ -367,6 +418,9 @@ class BaseRegionLabel(pg.LinearRegionItem):
                 i_child.pen.setColor(Config.theme.FAU_COLORS["dark_blue"])
         # TODO: change brush
         StateKeeper.set_has_unsaved_changes(True)
+        if hasattr(self, "_last_record"):
+            # otherwise, the label is still being initialized
+            self.report_change("move")
 
     def _hover_border_event(self, event: QHoverEvent):
         """Actions when hovering over the child item of type `pyqtgraph.InfiniteLine`"""
@@ -384,6 +438,16 @@ class BaseRegionLabel(pg.LinearRegionItem):
                 self.setEnabled(True)
 
 
+def _report_change(label: Union[BaseEventLabel, BaseRegionLabel], operation: str) -> Optional[Dict]:
+    """Report a change of `label` to its plot and return the label's record after the change."""
+    before = None if operation == "add" else label._last_record  # pylint: disable=protected-access
+    after = None if operation == "delete" else label.to_record()
+    if operation in ["move", "edit"] and pd.Series(before, dtype=object).equals(pd.Series(after, dtype=object)):
+        return after
+    label.parent.report_annotation_change(operation, label, before=before, after=after)
+    return after
+
+
 def edit_label_description(descriptions, parent, initial=None):
     """Setting the type of the activity to one given in the consts file.
 
@@ -399,7 +463,8 @@ def edit_label_description(descriptions, parent, initial=None):
 
     # the activities should be set by passing a `Settings` object which inherits from mad_gui.config.BaseSettings
     # and has an attribute `ACTIVITIES`, see our developer guidelines for more information
-    new_description = NestedLabelSelectDialog(parent=parent, initial_selection=initial).get_label(descriptions)
+    dialog = NestedLabelSelectDialog.for_descriptions(descriptions, parent=parent)
+    new_description = dialog.get_label(descriptions, initial_selection=initial)
     if not new_description:
         raise NoLabelSelected("Invalid description selected for label")
 
@@ -126,6 +126,7 @@ class StrideLabel(BaseRegionLabel):
     def _left_mouse_click_event(self, ev):
         if self.removable and ev.button() == Qt.LeftButton:
             self.parent.removeItem(self)
+            self.report_change("delete")
 
     def _region_changed(self):
         BaseRegionLabel._region_changed(self)
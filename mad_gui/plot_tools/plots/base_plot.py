@@ -9,7 +9,9 @@ from mad_gui.config import Config
 from mad_gui.models.local import AnnotationData, PlotData
 from mad_gui.plot_tools.labels import SynchronizationLabel
 from mad_gui.plot_tools.labels.base_label import BaseEventLabel, BaseRegionLabel
-from typing import List, Optional, Type, Union
+from mad_gui.state_keeper import StateKeeper
+from mad_gui.utils.instrumentation import timed
+from typing import Dict, List, Optional, Type, Union
 
 
 class BasePlot(pg.PlotWidget):
@@ -26,6 +28,7 @@ class BasePlot(pg.PlotWidget):
     ):
         super().__init__(parent=None)
         self.parent = parent
+        self.name = None
         self.plot_data = plot_data
         self.label_classes = label_classes
         self.event_classes = event_classes
@@ -40,12 +43,19 @@ class BasePlot(pg.PlotWidget):
         self.cursor_line_pen = pg.mkPen(color="y", width=1)
         self.sync_item = None
         self.sync_info = None
+        # all plots whose x-range is linked to this one, including this one, see `set_coupled_plot`
+        self.linked_plots: List[BasePlot] = [self]
         self.label_ranges = None
         self.event_ranges = None
         self.event_labels = {}
         self._initialize_labels(label_classes)
         self._initialize_events(event_classes)
 
+    @timed("BasePlot.paintEvent")
+    def paintEvent(self, ev):  # noqa
+        # Camelcase method overwrites qt method, only to measure how long drawing takes, see PerformanceHud
+        super().paintEvent(ev)
+
     def _initialize_events(self, event_classes: List):
         # if not hasattr(self.plot_data.annotations, "events"):
         #    return
@@ -90,10 +100,16 @@ class BasePlot(pg.PlotWidget):
             self.plot_data.annotations[label_class.name] = AnnotationData()
 
     @Slot(BaseEventLabel, pd.DataFrame)
+    @timed("BasePlot.set_events")
     def set_events(self, label_class: Type[BaseEventLabel], df: pd.DataFrame):
         if df is None or df.empty:
             return
         self.clear_labels(label_class)
+        self.add_events(label_class, df)
+
+    def add_events(self, label_class: Type[BaseEventLabel], df: pd.DataFrame) -> List[BaseEventLabel]:
+        """Plot the events in `df` in addition to the ones that are already plotted and return them."""
+        new_events = []
         for _, event in df.iterrows():
             new_event = label_class(
                 pos=event.pos,
@@ -101,12 +117,20 @@ class BasePlot(pg.PlotWidget):
                 parent=self,
             )
             self.addItem(new_event)
+            new_events.append(new_event)
+        return new_events
 
     @Slot(BaseRegionLabel, pd.DataFrame)
+    @timed("BasePlot.set_labels")
     def set_labels(self, label_class: Type[BaseRegionLabel], df: pd.DataFrame):
         if df is None or df.empty:
             return
         self.clear_labels(label_class)
+        self.add_labels(label_class, df)
+
+    def add_labels(self, label_class: Type[BaseRegionLabel], df: pd.DataFrame) -> List[BaseRegionLabel]:
+        """Plot the labels in `df` in addition to the ones that are already plotted and return them."""
+        new_labels = []
         for _, activity in df.iterrows():
             # make sure there are no np.nans in any string field
             mask = activity.index.isin(["start", "end"])
@@ -128,10 +152,12 @@ class BasePlot(pg.PlotWidget):
                 parent=self,
             )
             self.addItem(new_activity)
+            new_labels.append(new_activity)
 
             for event_name, event in new_activity.event_labels.items():
                 if event_name in plot_events:
                     self.addItem(event)
+        return new_labels
 
     @staticmethod
     def _enforce_columns(activity: pd.Series, necessary_columns: List) -> pd.Series:
@@ -150,9 +176,43 @@ class BasePlot(pg.PlotWidget):
             The title that should be shown on the top of the plot.
 
         """
+        self.name = title
         self.setTitle(title)
         self.plotItem.titleLabel.setText(text=title, color=Config.theme.FAU_COLORS["dark_blue"])
 
+    def report_annotation_change(
+        self,
+        operation: str,
+        label: Union[BaseRegionLabel, BaseEventLabel],
+        before: Optional[Dict] = None,
+        after: Optional[Dict] = None,
+    ):
+        """Announce a change of a single annotation via :attr:`~mad_gui.state_keeper.StateKeeper.annotation_changed`.
+
+        Parameters
+        ----------
+        operation
+            One of `add`, `move`, `edit`, or `delete`.
+        label
+            The label or event that was changed.
+        before, after
+            The label's record (see :meth:`~mad_gui.plot_tools.labels.BaseRegionLabel.to_record`) before and after the
+            change. `before` is `None` if the label was added and `after` is `None` if it was deleted.
+        """
+        is_event = isinstance(label, BaseEventLabel)
+        # events of the base class are kept as `events` in the plot's annotations, see `SensorPlot._sync_annotations`
+        label_class = "events" if type(label) is BaseEventLabel else label.name  # pylint: disable=unidiomatic-typecheck
+        StateKeeper.annotation_changed.emit(
+            {
+                "plot": self.name,
+                "op": operation,
+                "label_class": label_class,
+                "kind": "event" if is_event else "region",
+                "before": before,
+                "after": after,
+            }
+        )
+
     def configure_style(self):
         bg_color = Config.theme.PLOT_BACKGROUND
         if bg_color:
@@ -176,6 +236,10 @@ class BasePlot(pg.PlotWidget):
         """
         if getattr(Config.settings, "SENSORS_SYNCHRONIZED", False):
             self.setXLink(other)
+            if other is not None and other not in self.linked_plots:
+                # the linked plots share the list, this plot stays first
+                self.linked_plots.append(other)
+                other.linked_plots = self.linked_plots
         if getattr(Config.settings, "BIND_Y_AXIS", False):
             self.setYLink(other)
 
@@ -259,10 +323,24 @@ class BasePlot(pg.PlotWidget):
         # make at least sure it is at the position of an actual sample
         return round(pos * sampling_rate_hz) / sampling_rate_hz
 
+    def _range_follower(self) -> bool:
+        """Whether another linked plot sets the x-range of all of them while the video plays.
+
+        This is the first linked plot that is synchronized with the video, usually the main plot. If none of them
+        is synchronized, the first plot sets the range.
+        """
+        synchronized = [plot for plot in self.linked_plots if plot.has_sync_info]
+        leader = synchronized[0] if synchronized else self.linked_plots[0]
+        return leader is not self
+
+    @property
+    def has_sync_info(self) -> bool:
+        return self.sync_info is not None and not any(pd.isna(self.sync_info))
+
     def _percent_to_position(self, percent_since_start: float):
         if self.plot_data.data is None:
             return 0
-        if self.sync_info is None or any(pd.isna(self.sync_info)):
+        if not self.has_sync_info:
             x_axis = self.plotItem.listDataItems()[0].getData()[0]
             sec = percent_since_start / 100 * x_axis[-1]
         else:
@@ -294,11 +372,30 @@ class BasePlot(pg.PlotWidget):
         """
         if self.state.mode == "sync":
             return
+        if getattr(Config.settings, "SENSORS_SYNCHRONIZED", False) and self._range_follower():
+            # this plot's x-range is linked to the one that follows the video, so it is not set separately
+            return
         sec = self._percent_to_position(percent_since_start)
         x_min = sec - getattr(Config.settings, "PLOT_WIDTH_PLAYING_VIDEO", 20) * 0.5
         x_max = sec + getattr(Config.settings, "PLOT_WIDTH_PLAYING_VIDEO", 20) * 0.5
         self.setXRange(x_min, x_max)
 
+    @Slot(float)
+    def follow_video_position(self, percent_since_start: float):
+        """Move the video cursor line and the visible range in one pass.
+
+        This is connected to :attr:`~mad_gui.state_keeper.StateKeeper.data_position_changed`, which is emitted at
+        most once per frame by the :class:`~mad_gui.components.playback_driver.PlaybackDriver` while a video is
+        playing.
+
+        Parameters
+        ----------
+        percent_since_start
+            the percentage of the data stream to jump to since start
+        """
+        self.move_video_cursor_line(percent_since_start)
+        self.set_graph_position(percent_since_start)
+
     def finish_syncing(self):
         if self.sync_item:
             start_sample = self.sync_item.getRegion()[0] * self.plot_data.sampling_rate_hz
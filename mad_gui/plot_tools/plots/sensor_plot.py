@@ -4,7 +4,7 @@ import numpy as np
 import pandas as pd
 import pyqtgraph as pg
 from PySide2.QtCore import QObject, Qt, QTime, Slot
-from PySide2.QtUiTools import loadUiType
+from PySide2.QtGui import QTransform
 from PySide2.QtWidgets import (
     QButtonGroup,
     QCheckBox,
@@ -17,6 +17,8 @@ from PySide2.QtWidgets import (
     QWidgetAction,
 )
 
+from mad_gui.components.paged_data_loader import PagedDataLoader
+from mad_gui.components.stream_updater import StreamUpdater
 from mad_gui.config import Config
 from mad_gui.models.local import PlotData
 from mad_gui.models.ui_state import MODES
@@ -31,36 +33,15 @@ from mad_gui.plot_tools.plots.sensor_plot_mode_handler import (
     RemoveModeHandler,
     SyncModeHandler,
 )
-from mad_gui.qt_designer import UI_PATH
+from mad_gui.plugins.blockwise import add_annotations, attached
+from mad_gui.qt_designer import load_ui_class
 from mad_gui.state_keeper import StateKeeper
-from mad_gui.utils.helper import resource_path
+from mad_gui.utils.display_data import compact_channel
+from mad_gui.utils.instrumentation import span, timed
 from mad_gui.utils.model_base import BaseStateModel, Property
 from typing import Callable, Dict, List, Optional, Type, Union
 
-channel_selector_path = str(UI_PATH / "channel_selector.ui")
-ui_path = resource_path(channel_selector_path)
-if ".ui" in ui_path:
-    try:
-        ChannelSelector, _ = loadUiType(ui_path)
-    except TypeError:
-        try:
-            import sys
-            import os
-            from pathlib import Path
-
-            uic_path = Path(os.sep.join(sys.executable.split(os.sep)[:-1])) / "Scripts"
-            sys.path.append(str(uic_path))
-            ChannelSelector, _ = loadUiType(ui_path)
-        except TypeError as e:
-            raise FileNotFoundError(
-                "Probably python did not find `pyside2-uic`. See "
-                '"https://mad-gui.readthedocs.io/en/latest/troubleshooting.html#pyside2-uic-not-found" for more '
-                "information"
-            ) from e
-
-
-elif ".py" in ui_path:
-    from mad_gui.qt_designer.build.channel_selector import Ui_Form as ChannelSelector  # noqa
+ChannelSelector = load_ui_class("channel_selector", "Ui_Form")
 
 
 class TimeAxisItem(pg.AxisItem):
@@ -103,6 +84,9 @@ class SensorPlot(BasePlot):
     ----------
     parent
         Parent widget or frame
+    previous_stream_updater
+        If the plot data is a stream that was shown by another plot before, that plot's
+        :class:`~mad_gui.components.stream_updater.StreamUpdater`, which is continued by this plot.
     """
 
     MODE_HANDLERS: Dict[MODES, Type[BaseModeHandler]] = {
@@ -121,6 +105,7 @@ class SensorPlot(BasePlot):
         label_classes=List[BaseRegionLabel],
         event_classes: Optional[List[BaseEventLabel]] = None,
         parent: Optional[QWidget] = None,
+        previous_stream_updater: Optional[StreamUpdater] = None,
     ):
         super().__init__(
             plot_data=plot_data,
@@ -131,6 +116,7 @@ class SensorPlot(BasePlot):
         )
         self.start_time = start_time
         self.is_main_plot = False
+        self._follows_video = False
 
         self._skip_snap_to = False
         self.state = SensorPlotState()
@@ -146,6 +132,28 @@ class SensorPlot(BasePlot):
         if len(plot_data.data) > 10000 and getattr(Config.settings, "AUTO_DOWNSAMPLE", False):
             self.plotItem.setDownsampling(auto=True)
         self.plotItem.setClipToView(True)
+        self.paged_loader = None
+        if plot_data.source is not None:
+            # only an overview is plotted, the visible part is loaded in full resolution when zooming in
+            self.paged_loader = PagedDataLoader(
+                plot_data.source,
+                plot_data.sampling_rate_hz,
+                max_detail_samples=getattr(Config.settings, "PAGED_DATA_MAX_DETAIL_SAMPLES", 1_000_000),
+                cache_mb=getattr(Config.settings, "PAGED_DATA_CACHE_MB", 256),
+                parent=self,
+            )
+            self.paged_loader.window_loaded.connect(self._show_window)
+            self.getViewBox().sigXRangeChanged.connect(lambda _, x_range: self.paged_loader.set_visible_range(*x_range))
+        self.stream_updater = None
+        if plot_data.stream is not None:
+            self.stream_updater = StreamUpdater(
+                plot_data.stream,
+                buffer_s=getattr(Config.settings, "STREAM_BUFFER_S", 600),
+                max_fps=getattr(Config.settings, "STREAM_MAX_FPS", 30),
+                parent=self,
+                previous=previous_stream_updater,
+            )
+            self.stream_updater.samples_added.connect(self._show_stream)
         self.state.bind(
             Slot(list)(
                 lambda x: self._set_plot_data(
@@ -170,8 +178,10 @@ class SensorPlot(BasePlot):
         if self.sync_info is not None:
             self.add_video_cursor_line()
             self.autoRange()
-            StateKeeper.data_position_changed.connect(self.move_video_cursor_line)
-            StateKeeper.data_position_changed.connect(self.set_graph_position)
+            if not self._follows_video:
+                # this is called again each time the synchronization changes, but we must only connect once
+                StateKeeper.data_position_changed.connect(self.follow_video_position)
+                self._follows_video = True
 
     def _update_plotted_channels(self):
         submenus = self.getPlotItem().vb.menu.ctrl
@@ -215,6 +225,7 @@ class SensorPlot(BasePlot):
             return True
         return False
 
+    @timed("SensorPlot._set_plot_data")
     def _set_plot_data(
         self,
         data: pd.DataFrame,
@@ -247,7 +258,7 @@ class SensorPlot(BasePlot):
         ax_bottom = self.getAxis("bottom")
         ax_bottom.setLabel(text="time [seconds]")
 
-        if not isinstance(data.index[0], int):
+        if len(data) > 0 and not pd.api.types.is_integer(data.index[0]):
             raise TypeError(
                 f"The index of the dataframe created by a loader must contain integers. However, "
                 f"in this case it contained {type(data.index[0])}. You may change that by using "
@@ -267,28 +278,93 @@ class SensorPlot(BasePlot):
         # make it responsive even for zoomed-in large datasets
         self.getPlotItem().setClipToView(True)
 
+        self._channel_items = {}
+        # all channels share the same x values instead of each having a copy
+        if data is self.plot_data.data and sampling_rate_hz == self.plot_data.sampling_rate_hz:
+            x_axis = self.plot_data.time_axis
+        else:
+            x_axis = data.index.to_numpy() / sampling_rate_hz
         for channel_name in channels_to_plot:
             # make sure we use the same color for one channel even if only few channels are plotted
             color_index = np.argmax([channel_name == item for item in data.columns])
 
             data_to_plot = data[channel_name]
-            self._plot_channel(data_to_plot, sampling_rate_hz, hues=len(data.columns), color_index=color_index)
+            self._plot_channel(data_to_plot, x_axis, hues=len(data.columns), color_index=color_index)
 
         self.autoRange()
+        if getattr(self, "paged_loader", None) is not None:
+            # the plot shows the overview now
+            self.paged_loader.reset()
 
-    def _plot_channel(self, data_to_plot: pd.Series, sampling_rate_hz: float, hues: int, color_index: int):
-        x_axis = data_to_plot.index / sampling_rate_hz
+    def _plot_channel(self, data_to_plot: pd.Series, x_axis: np.ndarray, hues: int, color_index: int):
+        item = self.plot(pen=pg.mkPen(width=2, color=pg.intColor(index=color_index, hues=hues, sat=180)))
+        self._set_channel_data(item, data_to_plot, x_axis)
+        self._channel_items[data_to_plot.name] = item
 
+    @staticmethod
+    def _set_channel_data(item: pg.PlotDataItem, data_to_plot: pd.Series, x_axis: np.ndarray):
         if getattr(Config.settings, "NORMALIZE_DISPLAYED_DATA", False) is True:
             data_zero_mean = data_to_plot - data_to_plot.mean()
             data_to_plot = data_zero_mean / (data_zero_mean.max() - data_zero_mean.min())
 
-        self.plot(
-            x=x_axis,
-            y=data_to_plot,
-            pen=pg.mkPen(width=2, color=pg.intColor(index=color_index, hues=hues, sat=180)),
-        )
+        channel = compact_channel(data_to_plot, getattr(Config.settings, "DISPLAY_DTYPE", "float64"))
+        item.setData(x=x_axis, y=channel.values)
+        # for int16 the item keeps the scaled values, the transformation shows them at their real position
+        item.setTransform(QTransform(1, 0, 0, channel.gain, 0, channel.offset))
+
+    @Slot(int)
+    def _show_stream(self, n_new: int):
+        """Show the samples in the ring buffer of the stream, without copying or converting them."""
+        buffer = self.stream_updater.buffer
+        self.plot_data.data = buffer.to_frame()
+        x_axis = buffer.times()
+        for channel_name, item in self._channel_items.items():
+            item.setData(x=x_axis, y=buffer.values(channel_name))
+
+        x_min, x_max = self.getViewBox().viewRange()[0]
+        previous_latest = (buffer.total_samples - n_new - 1) / buffer.sampling_rate_hz
+        if buffer.total_samples == n_new:
+            self.setXRange(0, getattr(Config.settings, "PLOT_WIDTH_PLAYING_VIDEO", 20), padding=0)
+        elif x_max >= previous_latest:
+            # keep showing the newest samples, unless the user scrolled back to look at older ones
+            self.setXRange(x_axis[-1] - (x_max - x_min), x_axis[-1], padding=0)
+
+        algorithms = attached(self.plot_data.stream)
+        if algorithms:
+            # the buffer may have dropped some of the new samples already, if more were received than it can keep
+            self._process_stream_block(self.stream_updater.new_samples(), algorithms)
+
+    def _process_stream_block(self, block: pd.DataFrame, algorithms: List):
+        """Pass new samples to the algorithms that were applied to the stream and plot the annotations they find.
+
+        Like annotations the user creates, they are reported as added, e.g. such that they can be undone.
+        """
+        for algorithm, sensor, state in algorithms:
+            for name, new_annotations in (algorithm.process_block(sensor, block, state) or {}).items():
+                if len(new_annotations) == 0:
+                    continue
+                if self._get_label_class(name) is not None:
+                    new_labels = self.add_labels(self._get_label_class(name), new_annotations)
+                elif self._get_event_class(name) is not None:
+                    new_labels = self.add_events(self._get_event_class(name), new_annotations)
+                else:
+                    # the plot does not know this label, so we at least keep the annotations
+                    add_annotations(self.plot_data, {name: new_annotations})
+                    continue
+                for label in new_labels:
+                    label.report_change("add")
+
+    @Slot(object)
+    def _show_window(self, window: Optional[pd.DataFrame]):
+        """Show a window of a paged recording in full resolution, or the overview if `window` is `None`."""
+        if window is None:
+            data, x_axis = self.plot_data.data, self.plot_data.time_axis
+        else:
+            data, x_axis = window, window.index.to_numpy() / self.plot_data.sampling_rate_hz
+        for channel_name, item in self._channel_items.items():
+            self._set_channel_data(item, data[channel_name], x_axis)
 
+    @timed("SensorPlot._change_mode")
     def _change_mode(self, new_mode: MODES):
         """Adapt tool tip text depending on mode and remove potentially plotted green line indicating a new event.
 
@@ -305,6 +381,7 @@ class SensorPlot(BasePlot):
         # On mode change, we sync the annotation state:
         self._sync_annotations()
 
+    @timed("SensorPlot._sync_annotations")
     def _sync_annotations(self):
         for label_class in self.label_classes:
             self.plot_data.annotations[label_class.name].data = self._get_labels_from_plot(label_class)
@@ -349,11 +426,13 @@ class SensorPlot(BasePlot):
 
     def mousePressEvent(self, ev):  # noqa
         # Camelcase method overwrites qt method
-        self.mode_handler.handle_mouse_click(ev)
+        with span("mode_handler.handle_mouse_click", handler=type(self.mode_handler).__name__):
+            self.mode_handler.handle_mouse_click(ev)
 
     def mouseMoveEvent(self, ev):  # noqa
         # Camelcase method overwrites qt method
-        self.mode_handler.handle_mouse_movement(ev)
+        with span("mode_handler.handle_mouse_movement", handler=type(self.mode_handler).__name__):
+            self.mode_handler.handle_mouse_movement(ev)
 
     def _snap_to(self, pos: float, f: Callable):
         if self._skip_snap_to:
@@ -409,6 +488,84 @@ class SensorPlot(BasePlot):
         """
         return self._snap_to(pos, np.argmin)
 
+    def apply_annotation_operation(self, operation: Dict):
+        """Apply a change of a single annotation, e.g. to undo or redo it.
+
+        Only the affected label is removed from or added to the plot, all other labels stay untouched.
+
+        Parameters
+        ----------
+        operation
+            A dictionary as emitted by :meth:`~mad_gui.plot_tools.plots.BasePlot.report_annotation_change`.
+
+        Raises
+        ------
+        KeyError
+            If the label, which should be changed, is not plotted.
+        """
+        is_event = operation["kind"] == "event"
+        if is_event:
+            label_class = BaseEventLabel if operation["label_class"] == "events" else None
+            label_class = label_class or self._get_event_class(operation["label_class"])
+        else:
+            label_class = self._get_label_class(operation["label_class"])
+        if label_class is None:
+            raise KeyError(f"The plot does not know the label class {operation['label_class']}.")
+
+        before, after = operation.get("before"), operation.get("after")
+        if before is not None:
+            item = self._find_annotation_item(label_class, before)
+            if item is None:
+                raise KeyError(f"There is no plotted {operation['label_class']} at {before}.")
+            if not is_event:
+                for event in item.event_labels.values():
+                    self.removeItem(event)
+            self.removeItem(item)
+        if after is not None:
+            new_item = self._create_annotation_item(label_class, after, is_event)
+            # the mode handlers only configure the labels that exist when the mode is activated
+            mode = self.state.mode
+            if mode == "edit" or (mode == "sync" and not is_event):
+                new_item.make_editable()
+            elif mode == "remove":
+                new_item.make_removable()
+        StateKeeper.set_has_unsaved_changes(True)
+
+    def _find_annotation_item(self, label_class, record: Dict):
+        keys = ["pos"] if issubclass(label_class, BaseEventLabel) else ["start", "end"]
+        for item in self._iter_labels_from_plot(label_class):
+            if getattr(item, "belongs_to_region_label", False):
+                continue
+            item_record = item.to_record()
+            if all(item_record[key] == record[key] for key in keys):
+                return item
+        return None
+
+    def _create_annotation_item(self, label_class, record: Dict, is_event: bool):
+        if is_event:
+            new_item = label_class(
+                parent=self,
+                pos=record["pos"],
+                description=record["description"],
+                min_height=record["min_height"],
+                max_height=record["max_height"],
+            )
+            self.addItem(new_item)
+            return new_item
+        events = {k: v for k, v in record.items() if k not in ["identifier", "start", "end", "description"]}
+        new_item = label_class(
+            identifier=record["identifier"],
+            start=record["start"],
+            end=record["end"],
+            description=record["description"],
+            events=pd.Series(events) if events else None,
+            parent=self,
+        )
+        self.addItem(new_item)
+        for event in new_item.event_labels.values():
+            self.addItem(event)
+        return new_item
+
     @staticmethod
     def _get_appropriate_stride_id():
         # TODO: find the proper stride number and renumber strides in stride_list
@@ -428,14 +585,7 @@ class SensorPlot(BasePlot):
         for event in events:
             if event.belongs_to_region_label:
                 continue
-            pos = event.pos()
-            data_dict = {
-                "pos": int(pos.x() * self.plot_data.sampling_rate_hz),
-                "min_height": event.span[0],
-                "max_height": event.span[1],
-                "description": event.description,
-            }
-            event_dicts.append(data_dict)
+            event_dicts.append(event.to_record())
         df = pd.DataFrame.from_records(event_dicts)
         if df.empty:
             return df
@@ -467,17 +617,7 @@ class SensorPlot(BasePlot):
         labels = self._iter_labels_from_plot(label_type)
         label_dicts = []
         for label in labels:
-            start, end = label.getRegion()
-
-            data_dict = {
-                "identifier": label.id,
-                "start": int(start * self.plot_data.sampling_rate_hz),
-                "end": int(end * self.plot_data.sampling_rate_hz),
-                "description": label.description,
-            }
-            for event_name, event_label in label.event_labels.items():
-                data_dict.update({event_name: event_label.pos().x() * self.plot_data.sampling_rate_hz})
-            label_dicts.append(data_dict)
+            label_dicts.append(label.to_record())
         df = pd.DataFrame.from_records(label_dicts)
         if df.empty:
             return df
@@ -144,6 +144,7 @@ class AddModeHandler(BaseModeHandler):
         )
 
         plot.addItem(new_event)
+        new_event.report_change("add")
 
     def _add_label_at_mouse_pos(self, pos):
         plot = self.plot
@@ -205,6 +206,7 @@ class AddModeHandler(BaseModeHandler):
         for event in new_label.event_labels.values():
             plot.addItem(event)
         plot.addItem(new_label)
+        new_label.report_change("add")
         self._clear_partial_label()
 
     def _reposition_new_end(self, pos):
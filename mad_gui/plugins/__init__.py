@@ -5,7 +5,28 @@ If data of a specific system should be used within our GUI, a file in this direc
 functionalities given by :py:mod:`mad_gui.plugins.base`, see classes below.
 """
 
-from mad_gui.plugins.base import BaseExporter, BaseImporter, BaseAlgorithm
-from mad_gui.plugins.example import ExampleImporter, ExampleExporter
+from mad_gui.plugins.base import BaseExporter, BaseImporter, BaseAlgorithm, BaseStreamingAlgorithm
+from mad_gui.plugins.caching import AlgorithmCache, ImporterCache
+from mad_gui.plugins.discovery import PluginDescriptor, discover_plugins
 
-__all__ = ["BaseImporter", "BaseAlgorithm", "BaseExporter", "ExampleImporter", "ExampleExporter"]
+__all__ = [
+    "BaseImporter",
+    "BaseAlgorithm",
+    "BaseStreamingAlgorithm",
+    "BaseExporter",
+    "ExampleImporter",
+    "ExampleExporter",
+    "ImporterCache",
+    "AlgorithmCache",
+    "PluginDescriptor",
+    "discover_plugins",
+]
+
+
+def __getattr__(name):
+    # the examples are imported only when they are used, see mad_gui.plugins.discovery
+    if name in ("ExampleImporter", "ExampleExporter"):
+        from mad_gui.plugins import example
+
+        return getattr(example, name)
+    raise AttributeError(f"module {__name__} has no attribute {name}")
@@ -1,17 +1,31 @@
 """Base class for importing and processing sensor data and annotations."""
 import abc
 import datetime
+import time
 from pathlib import Path
 
 import pandas as pd
 
 from mad_gui.components.dialogs.user_information import UserInformation
 from mad_gui.models.local import PlotData
-from typing import Dict, Union
+from mad_gui.plugins.blockwise import attach, run_blockwise
+from mad_gui.plugins.dataset import RecordBatch
+from mad_gui.state_keeper import StateKeeper
+from mad_gui.utils.sync_file import read_sync
+from typing import Any, Dict, Iterator, Sequence, Type, Union
 
 
 class BasePlugin:
-    """All plugins inherit from this."""
+    """All plugins inherit from this.
+
+    Attributes
+    ----------
+    version
+        Increase this, whenever a change of the plugin changes its results. Results of the plugin that were cached
+        before, e.g. by :class:`~mad_gui.plugins.caching.ImporterCache`, are not used anymore afterwards.
+    """
+
+    version = None
 
     def __init__(self, parent=None):
         """Set a parent, in case this would be necessary at any later stage.
@@ -65,6 +79,16 @@ class BaseImporter(BasePlugin):
             channel, `sampling_rate_hz` is a float.
             If this dictionary has further keys, those will later be stored in
             :class:`mad_gui.models.local.PlotData`'s additional_data.
+            For recordings that do not fit into memory, `sensor_data` can be a
+            :class:`~mad_gui.models.paging.PagedSensorData` instead, which is read window by window.
+            To show data while it is being recorded, it can be a :class:`~mad_gui.models.streaming.SensorStream`.
+
+        Notes
+        -----
+        When the user works through all files of a folder, the next file is loaded in a background thread, using this
+        method and :meth:`get_start_time`. Qt widgets, like :class:`~mad_gui.components.dialogs.UserInformation`, can
+        not be created there. Raise an exception instead; the file is then loaded again in the GUI thread, where
+        dialogs can be shown.
 
         Examples
         --------
@@ -142,7 +166,7 @@ class BaseImporter(BasePlugin):
 
     @staticmethod
     def get_sync_file(video_file: str) -> str:
-        """Searches for an excel file that has `sync` in its name and returns the file name.
+        """Searches for an excel (or json) file that has `sync` in its name and returns the file name.
 
         Attributes
         ----------
@@ -155,6 +179,9 @@ class BaseImporter(BasePlugin):
             The path of the excel file that has `sync` in its name and returns the sync indices from there.
         """
         files = list(Path(video_file).parent.glob("*sync*.xlsx"))
+        if len(files) == 0:
+            # sync files saved by the GUI have a JSON sidecar, which can also be used on its own
+            files = list(Path(video_file).parent.glob("*sync*.json"))
         if len(files) == 0:
             UserInformation.inform(
                 text="Video and data not synchronized because not sync file was found.",
@@ -178,6 +205,8 @@ class BaseImporter(BasePlugin):
 
         The Excel file should have as first column (index) "start" and "end" and the columns should be
         "PLOTNAME_sample" video_ms."
+        If there is a JSON file with the same name next to the Excel file (the GUI writes one when saving the
+        synchronization), it is read instead, since this is much faster than parsing the Excel file.
 
         Attributes
         ----------
@@ -191,14 +220,29 @@ class BaseImporter(BasePlugin):
             Currently only implemented to accept two synchronized events. Between those, the GUI interpolates linearly.
         """
         try:
-            sync = pd.read_excel(sync_file, index_col=0, engine="openpyxl")
-            return sync
-        except IndexError:
+            return read_sync(sync_file)
+        except (IndexError, ValueError):
+            # ValueError includes json.JSONDecodeError, e.g. for a sidecar that was not written completely
             UserInformation.inform("Format of the sync file is unknown.")
 
 
 class BaseAlgorithm(BasePlugin):
-    """A base class for implementing an algorithm."""
+    """A base class for implementing an algorithm.
+
+    Attributes
+    ----------
+    depends_on
+        Algorithms that must have been applied before this one, e.g. because they create the annotations this one
+        works with. When the user selects this algorithm, those of them that were not executed yet are run first,
+        see :mod:`mad_gui.plugins.pipeline`.
+    cacheable
+        Set this to `True` if the algorithm only changes annotations and has no side effects like showing its results
+        in a dialog. Then, running it again on unchanged data and annotations restores its previous annotations
+        instead of computing them again, see :class:`~mad_gui.plugins.caching.AlgorithmCache`.
+    """
+
+    depends_on: Sequence[Type["BaseAlgorithm"]] = ()
+    cacheable: bool = False
 
     @classmethod
     @abc.abstractmethod
@@ -234,6 +278,84 @@ class BaseAlgorithm(BasePlugin):
         raise NotImplementedError()
 
 
+class BaseStreamingAlgorithm(BaseAlgorithm):
+    """A base class for algorithms that process the data block by block, keeping a state between the blocks.
+
+    Such an algorithm only needs memory for a single block and its state. Therefore, it can process recordings that
+    do not fit into memory (see :mod:`mad_gui.models.paging`), and it can detect events while the data is being
+    recorded (see :mod:`mad_gui.models.streaming`). If it is applied to a stream, it processes the samples that were
+    received so far and afterwards each block of new samples, such that its annotations appear in the plot as soon
+    as they are found.
+
+    Attributes
+    ----------
+    block_samples
+        The number of samples per block when processing a recording. Blocks of a stream contain the samples that were
+        received since the plot was updated the last time.
+
+    Examples
+    --------
+    >>> class ThresholdDetector(BaseStreamingAlgorithm):
+    ...     @classmethod
+    ...     def name(cls):
+    ...         return "Find values above 2"
+    ...
+    ...     def initial_state(self, sensor, sampling_rate_hz):
+    ...         # whether the last sample of the previous block was above the threshold
+    ...         return {"above": False}
+    ...
+    ...     def process_block(self, sensor, block, state):
+    ...         if len(block) == 0:
+    ...             return {}
+    ...         above = (block["acc_x"] > 2).to_numpy()
+    ...         previous = np.concatenate([[state["above"]], above[:-1]])
+    ...         state["above"] = bool(above[-1])
+    ...         # one event where the values exceed the threshold, instead of one per sample above it
+    ...         return {"Peak": pd.DataFrame({"pos": block.index[above & ~previous], "description": "above 2"})}
+    """
+
+    block_samples = 100_000
+
+    def initial_state(self, sensor: str, sampling_rate_hz: float) -> Any:  # noqa
+        """Return the state that is passed along with the first block of a plot, by default an empty dictionary."""
+        return {}
+
+    @abc.abstractmethod
+    def process_block(self, sensor: str, block: pd.DataFrame, state: Any) -> Dict[str, pd.DataFrame]:
+        """Process the next block of samples of a plot.
+
+        Parameters
+        ----------
+        sensor
+            The name of the plot.
+        block
+            The samples of the block, one column per channel. The index consists of the sample numbers counted from
+            the start of the recording / stream, which are also the unit of the returned annotations.
+        state
+            The state as returned by :meth:`initial_state`, which can be changed in place, e.g. to remember the
+            start of a label that has not ended yet.
+
+        Returns
+        -------
+        new_annotations
+            A dictionary, where keys are names of labels or events and the values are dataframes with the new
+            annotations of this block, with the columns `start` and `end` (labels) or `pos` (events) and optionally
+            `description`.
+        """
+        raise NotImplementedError()
+
+    def process_data(self, plot_data: Dict[str, PlotData]):
+        """Process all data block by block, see :func:`~mad_gui.plugins.blockwise.run_blockwise`.
+
+        Streams are processed as far as they were received and the algorithm continues with each new block.
+        """
+        states = run_blockwise(self, plot_data)
+        for sensor, plot in plot_data.items():
+            if plot.stream is not None:
+                attach(plot.stream, self, sensor, states[sensor])
+        return plot_data
+
+
 class BaseExporter(BasePlugin):
     """Export the plotted data and/or annotations."""
 
@@ -264,3 +386,55 @@ class BaseExporter(BasePlugin):
             "the chosen exporter / recording system."
         )
         raise NotImplementedError()
+
+    def export_to_directory(self, global_data, directory: Union[Path, str]):  # noqa
+        """Export into `directory` without any user interaction.
+
+        This is used when processing many recordings without the GUI, see :mod:`mad_gui.batch`. Your exporter does
+        not have to implement this method, unless you want to use it there. Usually, `process_data` asks the user for
+        a directory and then calls this method.
+
+        Parameters
+        ----------
+        global_data
+            A :class:`mad_gui.models.global_data.GlobalData` object, see :meth:`process_data`.
+        directory
+            The directory to write the results to. It already exists.
+        """
+        raise NotImplementedError(f"{self.name()} does not support exporting without user interaction.")
+
+    def iter_batches(self, global_data, include_sensor_data: bool = False) -> Iterator[RecordBatch]:
+        """Yield the data to export, one table at a time.
+
+        By default, this yields the annotations of each label class of each plot, which are not empty. Your exporter
+        can override this, e.g. to add features per label, and pass the result to
+        :func:`~mad_gui.plugins.dataset.write_dataset` in its :meth:`export_to_directory`.
+
+        Parameters
+        ----------
+        global_data
+            A :class:`mad_gui.models.global_data.GlobalData` object, see :meth:`process_data`.
+        include_sensor_data
+            Whether to also yield the sensor data of each plot, as table `sensor_data`.
+
+        Yields
+        ------
+        batch
+            A :class:`~mad_gui.plugins.dataset.RecordBatch` with the name of the table and plot and the data.
+        """
+        for plot_name, plot_data in global_data.plot_data.items():
+            if include_sensor_data:
+                yield RecordBatch("sensor_data", plot_name, plot_data.data)
+            for label_name, annotations in plot_data.annotations.items():
+                if len(annotations.data) == 0:
+                    continue
+                yield RecordBatch(label_name, plot_name, annotations.data)
+
+    def provenance(self, global_data) -> Dict:
+        """Describe where the exported data comes from, to be stored as metadata of the exported files."""
+        return {
+            "data_file": global_data.data_file,
+            "exporter": type(self).__name__,
+            "executed_algorithms": [algorithm.__name__ for algorithm in StateKeeper.executed_algorithms],
+            "exported_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        }
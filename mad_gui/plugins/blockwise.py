@@ -0,0 +1,93 @@
+"""Run a :class:`~mad_gui.plugins.base.BaseStreamingAlgorithm` block by block.
+
+For recordings, the blocks are read one after another (see :func:`iter_blocks`), such that only a single block is in
+memory at a time if the recording is paged (see :mod:`mad_gui.models.paging`). For streams (see
+:mod:`mad_gui.models.streaming`), the algorithm is attached to the stream using :func:`attach` and the plot passes it
+each block of new samples, such that its annotations appear while the data is being recorded.
+"""
+import weakref
+
+import pandas as pd
+
+from mad_gui.models.local import AnnotationData, PlotData
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+_attached: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def iter_blocks(plot_data: PlotData, block_samples: int) -> Iterator[pd.DataFrame]:
+    """Yield the sensor data of a plot in blocks, which are indexed by sample number.
+
+    For paged data, the blocks are read from the :attr:`~mad_gui.models.local.PlotData.source` instead of the
+    overview.
+    """
+    if plot_data.source is not None:
+        for start in range(0, plot_data.source.n_samples, block_samples):
+            yield plot_data.source.read_window(start, start + block_samples)
+        return
+    for start in range(0, len(plot_data.data), block_samples):
+        yield plot_data.data.iloc[start : start + block_samples]
+
+
+def add_annotations(plot_data: PlotData, new_annotations: Dict[str, pd.DataFrame]):
+    """Append annotations returned by :meth:`~mad_gui.plugins.base.BaseStreamingAlgorithm.process_block`."""
+    for label_name, new in new_annotations.items():
+        if new is None or len(new) == 0:
+            continue
+        annotations = plot_data.annotations.setdefault(label_name, AnnotationData())
+        annotations.data = pd.concat([annotations.data, new], ignore_index=True)
+
+
+def run_blockwise(
+    algorithm,
+    plot_data: Dict[str, PlotData],
+    on_annotations: Optional[Callable[[str, Dict[str, pd.DataFrame]], None]] = None,
+) -> Dict[str, Any]:
+    """Pass all blocks of each plot to `algorithm` and set the annotations it returns in the plot data.
+
+    Like for other algorithms, the annotations of each label or event class the algorithm returned replace the
+    existing annotations of that class.
+
+    Parameters
+    ----------
+    algorithm
+        An instance of a :class:`~mad_gui.plugins.base.BaseStreamingAlgorithm`.
+    plot_data
+        The plot data of all plots, as passed to :meth:`~mad_gui.plugins.BaseAlgorithm.process_data`.
+    on_annotations
+        Called with the name of the plot and the annotations after each block that resulted in annotations, e.g. to
+        show progress.
+
+    Returns
+    -------
+    states
+        The state of the algorithm for each plot after the last block.
+    """
+    states = {}
+    for sensor, plot in plot_data.items():
+        state = algorithm.initial_state(sensor, plot.sampling_rate_hz)
+        found: Dict[str, List[pd.DataFrame]] = {}
+        for block in iter_blocks(plot, algorithm.block_samples):
+            new_annotations = {
+                name: new for name, new in (algorithm.process_block(sensor, block, state) or {}).items() if len(new)
+            }
+            for label_name, new in new_annotations.items():
+                found.setdefault(label_name, []).append(new)
+            if on_annotations is not None and new_annotations:
+                on_annotations(sensor, new_annotations)
+        for label_name, new in found.items():
+            plot.annotations.setdefault(label_name, AnnotationData()).data = pd.concat(new, ignore_index=True)
+        states[sensor] = state
+    return states
+
+
+def attach(stream, algorithm, sensor: str, state: Any):
+    """Pass all blocks that are received from `stream` from now on to `algorithm`, see :func:`attached`."""
+    # running the algorithm again replaces the previous run, instead of creating all annotations twice
+    entries = [entry for entry in _attached.get(stream, []) if entry[0].__class__ is not algorithm.__class__]
+    _attached[stream] = entries + [(algorithm, sensor, state)]
+
+
+def attached(stream) -> List[Tuple[Any, str, Any]]:
+    """The algorithms that were attached to the stream, with the name of the plot and their state."""
+    return list(_attached.get(stream, []))
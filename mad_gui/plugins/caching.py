@@ -0,0 +1,357 @@
+"""Caches for results of plugins, such that they do not have to be computed again."""
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from mad_gui.models.paging import PagedSensorData
+from mad_gui.models.streaming import SensorStream
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Union
+
+_MISSING = object()
+
+
+def file_fingerprint(file: Union[str, Path]) -> Tuple[str, int, int]:
+    """Identify the content of a file by its path, size and modification time."""
+    file = Path(file).resolve()
+    stat = file.stat()
+    return str(file), stat.st_size, stat.st_mtime_ns
+
+
+def class_of_plugin(plugin: Union[type, Any]) -> type:
+    """Return the class of a plugin, which might also be wrapped by :class:`~mad_gui.plugins.sandbox.IsolatedPlugin`."""
+    if isinstance(plugin, type):
+        return plugin
+    return getattr(plugin, "plugin_class", type(plugin))
+
+
+def plugin_identifier(plugin: Union[type, Any]) -> Tuple[str, str, Optional[str]]:
+    """Identify a plugin class (or an instance of it) by its module, name and optional `version` attribute."""
+    plugin_class = class_of_plugin(plugin)
+    version = getattr(plugin_class, "version", None)
+    return plugin_class.__module__, plugin_class.__qualname__, None if version is None else str(version)
+
+
+def frame_fingerprint(frame: pd.DataFrame) -> str:
+    """Identify the content of a dataframe, including its index and column names."""
+    digest = hashlib.sha1(repr((frame.shape, list(frame.columns))).encode("utf-8"))
+    if not frame.empty:
+        digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class _FrameReference:
+    """Placeholder for a dataframe that is stored in a separate file of a cache entry."""
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+
+
+class ImporterCache:
+    """Keep the results of importers on disk, such that re-opening a recording does not parse it again.
+
+    The results are stored in `cache_dir`, one directory per entry. Entries are identified by path, size and
+    modification time of the loaded file, the importer class, its `version` attribute, and the method that was called.
+    Therefore, an entry is not used anymore as soon as the file is modified or the importer's version changes.
+    Dataframes are stored in the Arrow IPC (feather) format if `pyarrow` is installed and the dataframe can be
+    represented in it, otherwise they are pickled.
+    If the total size of the cache exceeds `max_size_mb`, the least recently used entries are removed.
+
+    Parameters
+    ----------
+    cache_dir
+        The directory to keep the cache in. Defaults to the environment variable `MAD_GUI_CACHE_DIR` or to
+        `~/.cache/mad_gui`.
+    max_size_mb
+        The maximum size of the cache on disk.
+
+    Examples
+    --------
+    >>> cache = ImporterCache()
+    >>> data = cache.load_sensor_data(ExampleImporter(), "/some/file.csv")  # parses the file
+    >>> data = cache.load_sensor_data(ExampleImporter(), "/some/file.csv")  # loads it from the cache
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, max_size_mb: float = 1024):
+        self.cache_dir = Path(cache_dir) if cache_dir else self.default_directory()
+        self.max_size_bytes = max_size_mb * 1024**2
+
+    @staticmethod
+    def default_directory() -> Path:
+        base_dir = os.environ.get("MAD_GUI_CACHE_DIR", Path.home() / ".cache" / "mad_gui")
+        return Path(base_dir) / "importer"
+
+    def load_sensor_data(self, importer, file: Union[str, Path]):
+        """Return the result of `importer.load_sensor_data(file)`, from the cache if possible."""
+        return self.cached_call(importer, "load_sensor_data", file)
+
+    def load_annotations(self, importer, file: Union[str, Path]):
+        """Return the result of `importer.load_annotations(file)`, from the cache if possible."""
+        return self.cached_call(importer, "load_annotations", file)
+
+    def cached_call(self, importer, method_name: str, file: Union[str, Path]):
+        key = self.key(importer, method_name, file)
+        result = self.get(key)
+        if result is _MISSING:
+            result = getattr(importer, method_name)(file)
+            if not _reads_lazily(result):
+                self.put(key, result)
+        return result
+
+    def key(self, importer, method_name: str, file: Union[str, Path]) -> str:
+        description = [file_fingerprint(file), plugin_identifier(importer), method_name]
+        return hashlib.sha1(json.dumps(description).encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        entry = self.cache_dir / key
+        try:
+            with open(entry / "structure.pkl", "rb") as file:
+                structure = pickle.load(file)
+            value = self._restore_frames(structure, entry)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return _MISSING
+        # the modification time of the entry keeps track of when it was used the last time
+        os.utime(entry)
+        return value
+
+    def put(self, key: str, value: Any):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = self.cache_dir / key
+        # write into a temporary directory first, such that a crash never leaves a half-written entry behind
+        tmp_entry = Path(tempfile.mkdtemp(prefix=f".{key}_", dir=self.cache_dir))
+        try:
+            structure = self._store_frames(value, tmp_entry, counter=[0])
+            with open(tmp_entry / "structure.pkl", "wb") as file:
+                pickle.dump(structure, file, protocol=pickle.HIGHEST_PROTOCOL)
+            shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp_entry, entry)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            warnings.warn(f"Could not write importer result to the cache: {e}")
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+            return
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the cache is smaller than `max_size_mb`."""
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        sizes = {entry: self._entry_size(entry) for entry in entries}
+        total = sum(sizes.values())
+        for entry in entries:
+            if total <= self.max_size_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= sizes[entry]
+
+    def clear(self):
+        """Remove all entries of the cache."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def size_bytes(self) -> int:
+        return sum(self._entry_size(entry) for entry in self._entries())
+
+    def _entries(self):
+        if not self.cache_dir.exists():
+            return []
+        return [entry for entry in self.cache_dir.iterdir() if entry.is_dir() and not entry.name.startswith(".")]
+
+    @staticmethod
+    def _entry_size(entry: Path) -> int:
+        return sum(file.stat().st_size for file in entry.iterdir())
+
+    def _store_frames(self, value: Any, entry: Path, counter: list):
+        if isinstance(value, pd.DataFrame):
+            counter[0] += 1
+            return _FrameReference(self._write_frame(value, entry / f"frame_{counter[0]}"))
+        if isinstance(value, dict):
+            return {k: self._store_frames(v, entry, counter) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return type(value)(self._store_frames(v, entry, counter) for v in value)
+        return value
+
+    def _restore_frames(self, structure: Any, entry: Path):
+        if isinstance(structure, _FrameReference):
+            return self._read_frame(entry / structure.file_name)
+        if isinstance(structure, dict):
+            return {k: self._restore_frames(v, entry) for k, v in structure.items()}
+        if isinstance(structure, (list, tuple)):
+            return type(structure)(self._restore_frames(v, entry) for v in structure)
+        return structure
+
+    @staticmethod
+    def _write_frame(frame: pd.DataFrame, path: Path) -> str:
+        feather_path = path.with_suffix(".feather")
+        try:
+            frame.to_feather(feather_path)
+            return feather_path.name
+        except Exception:  # noqa
+            # pyarrow is not installed or it can not represent this frame (e.g. non-default index or tuples as values)
+            if feather_path.exists():
+                feather_path.unlink()
+        pickle_path = path.with_suffix(".pkl")
+        frame.to_pickle(pickle_path, protocol=pickle.HIGHEST_PROTOCOL)
+        return pickle_path.name
+
+    @staticmethod
+    def _read_frame(path: Path) -> pd.DataFrame:
+        if path.suffix == ".feather":
+            return pd.read_feather(path)
+        return pd.read_pickle(path)
+
+
+def _reads_lazily(value: Any) -> bool:
+    """Whether an importer returned paged or streamed data, which must not be copied into the cache."""
+    if isinstance(value, (PagedSensorData, SensorStream)):
+        return True
+    if isinstance(value, dict):
+        return any(_reads_lazily(v) for v in value.values())
+    return False
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+
+
+class AlgorithmCache:
+    """Keep the annotations created by algorithms in memory, such that running an algorithm again is instant.
+
+    Entries are identified by the content of the sensor data and annotations of all plots that are passed to the
+    algorithm, the algorithm class, its `version` attribute and optional parameters. Therefore, an entry is not used
+    anymore as soon as the data or any annotation changes. The cache only stores the annotations after the algorithm
+    was applied, so only algorithms that declare `cacheable = True` (see :class:`~mad_gui.plugins.BaseAlgorithm`)
+    are cached, all others are always executed. Algorithms applied to streams are never cached.
+    If there are more than `max_entries` entries or they need more than `max_size_mb` in memory, the least recently
+    used entries are removed.
+
+    Parameters
+    ----------
+    max_entries
+        The maximum number of results to keep.
+    max_size_mb
+        The maximum memory the kept annotations may use.
+
+    Examples
+    --------
+    >>> cache = AlgorithmCache()
+    >>> cache.process_data(StationaryMomentsDetector(), plot_data)  # runs the algorithm
+    False
+    >>> cache.process_data(StationaryMomentsDetector(), plot_data)  # restores the annotations from the cache
+    True
+    >>> cache.stats.hits, cache.stats.misses
+    (1, 1)
+    """
+
+    def __init__(self, max_entries: int = 32, max_size_mb: float = 256):
+        self.max_entries = max_entries
+        self.max_size_bytes = max_size_mb * 1024**2
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Dict[str, pd.DataFrame]], int]]" = OrderedDict()
+        # algorithms of a pipeline may use the cache from several threads
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(self._entries),
+            size_bytes=sum(size for _, size in self._entries.values()),
+        )
+
+    def process_data(self, algorithm, plot_data: Dict[str, Any], parameters: Optional[Dict] = None) -> bool:
+        """Apply `algorithm` to `plot_data` like `algorithm.process_data(plot_data)`, from the cache if possible.
+
+        Parameters
+        ----------
+        algorithm
+            An instance of a :class:`~mad_gui.plugins.BaseAlgorithm`.
+        plot_data
+            A dictionary of :class:`~mad_gui.models.local.PlotData` objects, which is modified in place.
+        parameters
+            Anything else that influences the result of the algorithm, must be serializable as JSON.
+
+        Returns
+        -------
+        hit
+            Whether the annotations were restored from the cache.
+        """
+        if not getattr(class_of_plugin(algorithm), "cacheable", False):
+            # it may change more than the annotations or have side effects, which would be skipped
+            algorithm.process_data(plot_data)
+            return False
+        if any(getattr(plot, "stream", None) is not None for plot in plot_data.values()):
+            # the result depends on samples that are received later, and streaming algorithms attach to the stream
+            algorithm.process_data(plot_data)
+            return False
+        key = self.key(algorithm, plot_data, parameters)
+        annotations = self.get(key)
+        if annotations is not None:
+            for plot_name, plot_annotations in annotations.items():
+                for label_name, data in plot_annotations.items():
+                    plot_data[plot_name].annotations[label_name].data = data.copy()
+            return True
+        algorithm.process_data(plot_data)
+        self.put(
+            key,
+            {
+                plot_name: {label_name: labels.data.copy() for label_name, labels in plot.annotations.items()}
+                for plot_name, plot in plot_data.items()
+            },
+        )
+        return False
+
+    def key(self, algorithm, plot_data: Dict[str, Any], parameters: Optional[Dict] = None) -> str:
+        description = [plugin_identifier(algorithm), json.dumps(parameters or {}, sort_keys=True, default=str)]
+        for plot_name, plot in sorted(plot_data.items()):
+            description.append([plot_name, plot.sampling_rate_hz, frame_fingerprint(plot.data)])
+            for label_name, labels in sorted(plot.annotations.items()):
+                description.append([label_name, frame_fingerprint(labels.data)])
+        return hashlib.sha1(json.dumps(description, default=str).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Dict[str, pd.DataFrame]]]:
+        with self._lock:
+            if key not in self._entries:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key: str, annotations: Dict[str, Dict[str, pd.DataFrame]]):
+        size = sum(
+            int(data.memory_usage(index=True, deep=True).sum())
+            for plot_annotations in annotations.values()
+            for data in plot_annotations.values()
+        )
+        with self._lock:
+            self._entries[key] = (annotations, size)
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the cache is within `max_entries` and `max_size_mb`."""
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self.stats.size_bytes > self.max_size_bytes):
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,159 @@
+"""Write sensor data and annotations of all plots into a single dataset on disk.
+
+Exporters yield their data as :class:`RecordBatch` objects (see :meth:`~mad_gui.plugins.BaseExporter.iter_batches`),
+which are written one after another by :func:`write_dataset`. Therefore, an exporter never needs to keep more than one
+table in memory at a time. By default, the dataset is partitioned in the Hive style, i.e. the table and the plot are
+encoded in the directory names::
+
+    <directory>/table=Activity/plot=Pocket%20IMU/part-0.parquet
+    <directory>/table=sensor_data/plot=Pocket%20IMU/part-0.parquet
+    <directory>/_mad_gui.json
+
+Such a dataset can for example be read using `pyarrow.dataset.dataset(<directory>/table=Activity,
+partitioning="hive")`. Provenance, e.g. the executed algorithms, is stored in the file `_mad_gui.json` and, for
+Parquet and Arrow files, additionally in the metadata of each file's schema under the key `mad_gui`.
+
+Writing Parquet or Arrow files requires `pyarrow` to be installed, CSV does not.
+"""
+import json
+from pathlib import Path
+from urllib.parse import quote
+
+import pandas as pd
+
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Union
+
+METADATA_FILE_NAME = "_mad_gui.json"
+METADATA_KEY = b"mad_gui"
+
+
+class RecordBatch(NamedTuple):
+    """A single table to be exported.
+
+    Attributes
+    ----------
+    table
+        What the data contains, i.e. `sensor_data` or the name of a label class like `Activity`.
+    plot
+        The name of the plot the data belongs to.
+    data
+        The data itself. A named index is written as column, an unnamed one is dropped.
+    """
+
+    table: str
+    plot: str
+    data: pd.DataFrame
+
+
+def write_dataset(
+    batches: Iterable[RecordBatch],
+    directory: Union[str, Path],
+    file_format: str = "parquet",
+    metadata: Optional[Dict] = None,
+    partitioned: bool = True,
+) -> List[Path]:
+    """Write all `batches` into `directory`.
+
+    Parameters
+    ----------
+    batches
+        The tables to write, usually the result of :meth:`~mad_gui.plugins.BaseExporter.iter_batches`. Several batches
+        of the same table and plot are written to separate files (`part-0`, `part-1`, ...).
+    directory
+        The root directory of the dataset. It is created if it does not exist.
+    file_format
+        One of `parquet`, `arrow` (Arrow IPC / Feather V2) or `csv`.
+    metadata
+        Provenance of the data, e.g. the result of :meth:`~mad_gui.plugins.BaseExporter.provenance`. Must be
+        serializable as JSON.
+    partitioned
+        If `False`, all files are written directly into `directory` and named `<plot>_<table>.<format>`, with spaces
+        replaced by underscores.
+
+    Returns
+    -------
+    files
+        The written files.
+    """
+    if file_format not in WRITERS:
+        raise ValueError(f"Unknown file format {file_format}, known are {list(WRITERS)}.")
+    write = WRITERS[file_format]
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    metadata = metadata or {}
+
+    files = []
+    contents = []
+    n_parts: Dict[tuple, int] = {}
+    for batch in batches:
+        part = n_parts.get((batch.table, batch.plot), 0)
+        n_parts[(batch.table, batch.plot)] = part + 1
+        path = _batch_path(directory, batch, part, file_format, partitioned)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = _flatten_index(batch.data)
+        write(data, path, metadata)
+        files.append(path)
+        contents.append(
+            {
+                "file": path.relative_to(directory).as_posix(),
+                "table": batch.table,
+                "plot": batch.plot,
+                "rows": len(data),
+            }
+        )
+
+    with open(directory / METADATA_FILE_NAME, "w", encoding="utf-8") as file:
+        json.dump({"format": file_format, "metadata": metadata, "files": contents}, file, indent=2, default=str)
+    return files
+
+
+def write_parquet(data: pd.DataFrame, path: Union[str, Path], metadata: Optional[Dict] = None):
+    import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+    pq.write_table(_to_arrow(data, metadata), str(path))
+
+
+def write_arrow(data: pd.DataFrame, path: Union[str, Path], metadata: Optional[Dict] = None):
+    import pyarrow.feather as feather  # pylint: disable=import-outside-toplevel
+
+    feather.write_feather(_to_arrow(data, metadata), str(path))
+
+
+def write_csv(data: pd.DataFrame, path: Union[str, Path], metadata: Optional[Dict] = None):  # noqa
+    # CSV can not keep metadata, it is only available in the dataset's metadata file
+    data.to_csv(path, index=False)
+
+
+WRITERS: Dict[str, Callable] = {"parquet": write_parquet, "arrow": write_arrow, "csv": write_csv}
+"""Functions that write a single dataframe, by file format. Add an entry to support another format."""
+
+
+def _batch_path(directory: Path, batch: RecordBatch, part: int, file_format: str, partitioned: bool) -> Path:
+    if partitioned:
+        partition = directory / f"table={quote(batch.table, safe='')}" / f"plot={quote(batch.plot, safe='')}"
+        return partition / f"part-{part}.{file_format}"
+    suffix = f"_{part}" if part else ""
+    return directory / f"{batch.plot}_{batch.table}{suffix}.{file_format}".replace(" ", "_")
+
+
+def _flatten_index(data: pd.DataFrame) -> pd.DataFrame:
+    if any(name is not None for name in data.index.names):
+        return data.reset_index()
+    return data.reset_index(drop=True)
+
+
+def _to_arrow(data: pd.DataFrame, metadata: Optional[Dict]):
+    import pyarrow as pa  # pylint: disable=import-outside-toplevel
+
+    # object columns, e.g. descriptions that are strings or tuples for nested labels, are written as strings such that
+    # all files of a table have the same schema no matter which kinds of values they contain
+    object_columns = data.columns[data.dtypes == object]
+    if len(object_columns):
+        data = data.copy()
+        for column in object_columns:
+            data[column] = data[column].map(
+                lambda value: value if value is None or isinstance(value, str) else str(value)
+            )
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    schema_metadata = {**(table.schema.metadata or {}), METADATA_KEY: json.dumps(metadata or {}, default=str).encode()}
+    return table.replace_schema_metadata(schema_metadata)
@@ -0,0 +1,145 @@
+"""Register plugins without importing them, such that their modules and dependencies are only loaded when used.
+
+Instead of a plugin class, a :class:`PluginDescriptor` can be passed to :func:`~mad_gui.start_gui`. It knows the
+name and the kind of the plugin, which is enough to show it in the dropdowns of the GUI. The module of the plugin is
+imported as soon as the user selects it and starts loading data, applying an algorithm, or exporting.
+
+Installed packages can also register their plugins via entry points, which are found by :func:`discover_plugins`.
+The name of the entry point is shown in the GUI and the group defines the kind of the plugin, for example in the
+`pyproject.toml` of a package using poetry::
+
+    [tool.poetry.plugins."mad_gui.importers"]
+    "My recording system" = "my_package.importer:MyImporter"
+
+    [tool.poetry.plugins."mad_gui.algorithms"]
+    "My step detection" = "my_package.algorithms:StepDetection"
+"""
+import importlib
+import warnings
+from importlib.metadata import entry_points
+
+from typing import Any, Dict, List, Optional
+
+ENTRY_POINT_GROUPS = {
+    "importer": "mad_gui.importers",
+    "algorithm": "mad_gui.algorithms",
+    "exporter": "mad_gui.exporters",
+}
+
+
+class PluginDescriptor:
+    """Describe a plugin, which is imported only when it is used.
+
+    The descriptor can be used like the plugin class in most places: calling it creates an instance of the plugin and
+    all attributes, which are not given to the descriptor, are taken from the plugin class, which imports it.
+
+    Parameters
+    ----------
+    target
+        Where to find the plugin class, as `package.module:ClassName`.
+    name
+        The name shown in the GUI, which is usually returned by the plugin's `name()`.
+    kind
+        One of `importer`, `algorithm`, or `exporter`.
+    file_type
+        For importers, the file types shown when selecting files, see :attr:`~mad_gui.plugins.BaseImporter.file_type`.
+        If not given, the importer is imported, when the user selects a file.
+
+    Examples
+    --------
+    >>> importer = PluginDescriptor("my_package.importer:MyImporter", "My recording system", "importer")
+    >>> start_gui(plugins=[importer])
+    """
+
+    def __init__(self, target: str, name: str, kind: str, file_type: Optional[Dict[str, str]] = None):
+        if kind not in ENTRY_POINT_GROUPS:
+            raise ValueError(f"The kind of the plugin {name} must be one of {list(ENTRY_POINT_GROUPS)}, not {kind}.")
+        if ":" not in target:
+            raise ValueError(f"Expected the target of plugin {name} as `package.module:ClassName`, but got {target}.")
+        self.target = target
+        self._name = name
+        self.kind = kind
+        if file_type is not None:
+            self.file_type = file_type
+        self._plugin_class: Optional[type] = None
+
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def base_class(self) -> type:
+        from mad_gui.plugins.base import BaseAlgorithm, BaseExporter, BaseImporter  # pylint: disable=C0415
+
+        return {"importer": BaseImporter, "algorithm": BaseAlgorithm, "exporter": BaseExporter}[self.kind]
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._plugin_class is not None
+
+    def load(self) -> type:
+        """Import the plugin class.
+
+        Raises
+        ------
+        ImportError
+            If the module can not be imported, e.g. because a dependency of the plugin is missing.
+        TypeError
+            If the target does not inherit from the base class for its `kind`.
+        """
+        if self._plugin_class is None:
+            module_name, _, class_name = self.target.partition(":")
+            plugin_class = getattr(importlib.import_module(module_name), class_name)
+            if not isinstance(plugin_class, type) or not issubclass(plugin_class, self.base_class):
+                raise TypeError(
+                    f"{self.target} was registered as {self.kind}, but it does not inherit from "
+                    f"{self.base_class.__name__}."
+                )
+            self._plugin_class = plugin_class
+        return self._plugin_class
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") and name not in ("__name__", "__qualname__", "__module__"):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __repr__(self) -> str:
+        return f"PluginDescriptor({self.target!r}, {self._name!r}, {self.kind!r})"
+
+
+def is_plugin_of_kind(plugin: Any, base_class: type) -> bool:
+    """Whether `plugin`, a class or a :class:`PluginDescriptor`, is a subclass of `base_class`, without importing it."""
+    if isinstance(plugin, PluginDescriptor):
+        return issubclass(plugin.base_class, base_class)
+    return isinstance(plugin, type) and issubclass(plugin, base_class)
+
+
+def resolve_plugin(plugin: Any) -> type:
+    """Return the plugin class, importing it if `plugin` is a :class:`PluginDescriptor`."""
+    return plugin.load() if isinstance(plugin, PluginDescriptor) else plugin
+
+
+def discover_plugins(groups: Optional[Dict[str, str]] = None) -> List[PluginDescriptor]:
+    """Find the plugins installed packages registered as entry points, without importing them.
+
+    Parameters
+    ----------
+    groups
+        The entry point group for each kind of plugin, defaults to :data:`ENTRY_POINT_GROUPS`.
+    """
+    groups = groups or ENTRY_POINT_GROUPS
+    all_entry_points = entry_points()
+    descriptors = []
+    for kind, group in groups.items():
+        if hasattr(all_entry_points, "select"):
+            group_entry_points = all_entry_points.select(group=group)
+        else:
+            group_entry_points = all_entry_points.get(group, [])
+        for entry_point in group_entry_points:
+            try:
+                descriptors.append(PluginDescriptor(entry_point.value, entry_point.name, kind))
+            except ValueError as e:
+                warnings.warn(f"Ignoring the plugin {entry_point.name}: {e}")
+    return descriptors
@@ -1,4 +1,3 @@
-import os
 from pathlib import Path
 
 import numpy as np
@@ -8,33 +7,13 @@ from PySide2.QtWidgets import QFileDialog
 from mad_gui.components.dialogs import UserInformation
 from mad_gui.models import GlobalData
 from mad_gui.models.local import PlotData
-from mad_gui.plot_tools.labels import BaseRegionLabel, BaseEventLabel
 from mad_gui.plugins.base import BaseAlgorithm, BaseExporter, BaseImporter
-from mad_gui.state_keeper import StateKeeper
+from mad_gui.plugins.dataset import RecordBatch, write_dataset
+from mad_gui.plugins.example_labels import ActivityLabel, MyEvent, Stride  # noqa: F401
+from mad_gui.plugins.region_statistics import label_statistics
 from typing import Dict
 
 
-class ActivityLabel(BaseRegionLabel):
-    min_height = 0.8
-    max_height = 1
-    name = "Activity"
-    descriptions = {"Jump": None, "Walk": ["Slow", "Normal", "Fast"]}
-
-
-class MyEvent(BaseEventLabel):
-    min_height = 0
-    max_height = 1
-    name = "Peak"
-    descriptions = {"Positive peak": None, "Negative peak": None}
-    snap_to_min = False
-
-
-class Stride(BaseRegionLabel):
-    name = "Stride"
-    min_height = 0
-    max_height = 0.75
-
-
 class ExampleImporter(BaseImporter):
     """An exemplary importer.
 
@@ -68,6 +47,8 @@ class StationaryMomentsDetector(BaseAlgorithm):
     passed to :meth:`~mad_gui.start_gui` in order for this algorithm to create annotations.
     """
 
+    cacheable = True
+
     @classmethod
     def name(cls):
         return "Find Resting Phases (MaD GUI example)"
@@ -77,39 +58,41 @@ class StationaryMomentsDetector(BaseAlgorithm):
             sensor_plot.annotations["Activity"].data = self.get_annotations(sensor_plot.data)
 
     @staticmethod
-    def _get_standing_windows(data: pd.DataFrame, window_length: int):
-        diff = data.diff().apply(np.linalg.norm, axis=1)
-
-        standing_windows = abs(diff.rolling(window=window_length).mean()) < 0.2
-
-        # from standing_windows we get only a single one if the complete windows is standing -> we need to transform
-        # this single one to a series of window_length ones
-        standing = np.zeros(shape=(1, len(data)))
-        for idx, value in standing_windows.iteritems():
-            if value:
-                filter_lag = window_length
-                start = max(0, idx - filter_lag)
-                stop = min(idx + window_length - filter_lag, len(data))
-                standing[0, start:stop] = 1
-        return standing
+    def _get_standing_windows(data: pd.DataFrame, window_length: int) -> np.ndarray:
+        diff = np.linalg.norm(data.diff().to_numpy(dtype=float), axis=1)
+        mean_diff = pd.Series(diff, index=data.index).rolling(window=window_length).mean().to_numpy()
+        # comparisons with nan (the first `window_length` samples) are False, like in pandas
+        with np.errstate(invalid="ignore"):
+            standing_windows = np.abs(mean_diff) < 0.2
+
+        # from standing_windows we get only a single one if the complete window is standing -> we need to transform
+        # this single one to a series of window_length ones, which are the `window_length` samples before it
+        # (positions, such that the index of the data does not have to start at 0)
+        ends = np.flatnonzero(standing_windows)
+        n_samples = len(data)
+        starts = np.maximum(ends - window_length, 0)
+        ends = np.minimum(ends, n_samples)
+        valid = starts < ends
+        # +1 at the start and -1 at the end of each window, the cumulative sum is > 0 wherever a window covers a sample
+        coverage = np.bincount(starts[valid], minlength=n_samples + 1) - np.bincount(
+            ends[valid], minlength=n_samples + 1
+        )
+        standing = (np.cumsum(coverage[:-1]) > 0).astype(float)
+        return standing.reshape(1, n_samples)
 
     @staticmethod
-    def _binary_to_df(array: np.ndarray):
-        # now we have something like [0 1 1 1 1 0], which we want to transform to start: 1, end: 4
-        df = pd.DataFrame(array).T
-        starts_stops = df.diff()
-        annotations = pd.DataFrame(columns=["start", "end"])
-        start = stop = None
-        for idx in df.index:
-            if starts_stops[0].iloc[idx] == 1:
-                start = idx
-            if start and (starts_stops[0].iloc[idx] == -1 or idx == len(df)):
-                stop = idx
-            if start and stop:
-                annotations = annotations.append(pd.DataFrame(data=[[start, stop]], columns=["start", "end"]))
-                start = None
-                stop = None
-        return annotations
+    def _binary_to_df(array: np.ndarray) -> pd.DataFrame:
+        # now we have something like [0 1 1 1 1 0], which we want to transform to start: 1, end: 5
+        flags = np.asarray(array, dtype=float).ravel()
+        changes = np.diff(flags)
+        starts = np.flatnonzero(changes == 1) + 1
+        ends = np.flatnonzero(changes == -1) + 1
+        if len(starts) > 0:
+            # a phase that is already going on in the first sample has no start and is skipped
+            ends = ends[ends > starts[0]]
+        # a phase that is still going on in the last sample has no end and is skipped as well
+        n_phases = min(len(starts), len(ends))
+        return pd.DataFrame({"start": starts[:n_phases], "end": ends[:n_phases]})
 
     def get_annotations(self, data: pd.DataFrame):
         acc = data[["acc_x", "acc_y", "acc_z"]]
@@ -130,26 +113,25 @@ class EnergyCalculator(BaseAlgorithm):
     features for each existing annotation.
     """
 
+    depends_on = (StationaryMomentsDetector,)
+    cacheable = True
+
     @classmethod
     def name(cls):
         return "Mean energy of acceleration (MaD GUI example)"
 
     def process_data(self, plot_data: Dict[str, PlotData]):
         for sensor_plot in plot_data.values():
-            for i_activity, activity in sensor_plot.annotations["Activity"].data.iterrows():
-                description = sensor_plot.annotations["Activity"].data.at[i_activity, "description"]
-                sensor_plot.annotations["Activity"].data.at[i_activity, "description"] = (
-                    str(description)
-                    + " ("
-                    + self.calculate_features(sensor_plot.data.iloc[activity.start : activity.end])
-                    + ")"
-                )
-
-    @staticmethod
-    def calculate_features(sensor_data: pd.DataFrame) -> str:
-        signal = sensor_data[["acc_x", "acc_y", "acc_z"]]
-        energy = np.sqrt((signal**2).sum(axis=1).mean())
-        return f"mean acceleration = {energy:.2f}"
+            annotations = sensor_plot.annotations["Activity"].data
+            if annotations.empty:
+                continue
+            # all activities at once, instead of slicing the data for each of them
+            rms = label_statistics(sensor_plot, "Activity", channels=["acc_x", "acc_y", "acc_z"], statistics=["rms"])
+            energies = np.sqrt((rms**2).sum(axis=1, min_count=1))
+            annotations["description"] = [
+                f"{description} (mean acceleration = {energy:.2f})"
+                for description, energy in zip(annotations["description"], energies)
+            ]
 
 
 class ExampleExporter(BaseExporter):
@@ -163,16 +145,22 @@ class ExampleExporter(BaseExporter):
         directory = QFileDialog().getExistingDirectory(
             None, "Save .csv results to this folder", str(Path(global_data.data_file).parent)
         )
-        for plot_name, plot_data in global_data.plot_data.items():
-            for label_name, annotations in plot_data.annotations.items():
-                if len(annotations.data) == 0:
-                    continue
-                save_file_name = (
-                    directory + os.sep + plot_name.replace(" ", "_") + "_" + label_name.replace(" ", "_") + ".csv"
-                )
-                annotations.data.to_csv(save_file_name)
-                algorithms_str = "Algorithms:" + ",".join([algo.__name__ for algo in StateKeeper.executed_algorithms])
-                df_algorithms = pd.DataFrame(data=[algorithms_str])
-                df_algorithms.to_csv(save_file_name, mode="a", header=False, index=False)
-
+        if not directory:
+            # user clicked cancel
+            return
+        self.export_to_directory(global_data, directory)
         UserInformation.inform(f"The results were saved to {directory}.")
+
+    def export_to_directory(self, global_data: GlobalData, directory: str):
+        # like the csv files exported by previous versions, the first column is the index of each annotation
+        batches = (
+            RecordBatch(batch.table, batch.plot, batch.data.reset_index()) for batch in self.iter_batches(global_data)
+        )
+        # the executed algorithms are stored in the metadata file of the dataset
+        write_dataset(
+            batches,
+            directory,
+            file_format="csv",
+            metadata=self.provenance(global_data),
+            partitioned=False,
+        )
@@ -0,0 +1,27 @@
+"""The labels used by the example plugins.
+
+They are kept apart from :mod:`mad_gui.plugins.example`, such that they can be passed to the GUI without importing the
+example plugins.
+"""
+from mad_gui.plot_tools.labels import BaseEventLabel, BaseRegionLabel
+
+
+class ActivityLabel(BaseRegionLabel):
+    min_height = 0.8
+    max_height = 1
+    name = "Activity"
+    descriptions = {"Jump": None, "Walk": ["Slow", "Normal", "Fast"]}
+
+
+class MyEvent(BaseEventLabel):
+    min_height = 0
+    max_height = 1
+    name = "Peak"
+    descriptions = {"Positive peak": None, "Negative peak": None}
+    snap_to_min = False
+
+
+class Stride(BaseRegionLabel):
+    name = "Stride"
+    min_height = 0
+    max_height = 0.75
@@ -1,8 +1,13 @@
 from mad_gui.plugins.base import BasePlugin
+from mad_gui.plugins.discovery import is_plugin_of_kind
 from typing import List, Type, TypeVar
 
 T = TypeVar("T", bound=BasePlugin)
 
 
 def filter_plugins(plugin_list: List[Type[BasePlugin]], baseclass: Type[T]) -> List[Type[T]]:
-    return [b for b in plugin_list if issubclass(b, baseclass)]
+    """Return the plugins that inherit from `baseclass`, which might also be :class:`~mad_gui.plugins.PluginDescriptor`.
+
+    Descriptors are not imported for this.
+    """
+    return [b for b in plugin_list if is_plugin_of_kind(b, baseclass)]
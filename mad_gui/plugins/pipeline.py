@@ -0,0 +1,206 @@
+"""Run several algorithms, respecting their dependencies (see :attr:`~mad_gui.plugins.BaseAlgorithm.depends_on`).
+
+The algorithms and their dependencies form a directed acyclic graph. It is split into levels, where each algorithm
+only depends on algorithms of previous levels. Algorithms of the same level do not depend on each other, so each of
+them runs on its own copy of the annotations. Afterwards, the annotations each of them changed are merged into the plot
+data, before the next level starts. The algorithms of a level can run in parallel threads by passing `max_workers`.
+By default, they run one after another, since algorithms may show dialogs, which is only possible in the GUI thread.
+The GUI therefore only runs them in parallel if the setting `PIPELINE_MAX_WORKERS` is set (see `Adjusting Constants` in
+the README).
+
+Examples
+--------
+>>> steps = run_pipeline([EnergyCalculator], plot_data)  # runs StationaryMomentsDetector first
+>>> [step.algorithm.__name__ for step in steps]
+['StationaryMomentsDetector', 'EnergyCalculator']
+"""
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+from mad_gui.models.local import AnnotationData, PlotData
+from mad_gui.plugins.caching import class_of_plugin, frame_fingerprint
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Union
+
+
+class PipelineStep(NamedTuple):
+    """The result of running a single algorithm within :func:`run_pipeline`.
+
+    Attributes
+    ----------
+    algorithm
+        The class of the algorithm.
+    duration_s
+        How long the algorithm took.
+    cached
+        Whether the result was restored from an :class:`~mad_gui.plugins.caching.AlgorithmCache`.
+    """
+
+    algorithm: type
+    duration_s: float
+    cached: bool
+
+
+def resolve_dependencies(algorithms: Sequence[type], executed: Sequence[type] = ()) -> List[List[type]]:
+    """Sort `algorithms` and their dependencies into levels, which can be executed one after another.
+
+    Parameters
+    ----------
+    algorithms
+        The algorithm classes that should be executed.
+    executed
+        Algorithms that were already executed. They are not executed again as dependency, only if they are listed in
+        `algorithms`.
+
+    Returns
+    -------
+    levels
+        Each level is a list of algorithms that only depend on algorithms of previous levels. Within a level, the
+        order of `algorithms` is kept.
+
+    Raises
+    ------
+    ValueError
+        If the dependencies contain a cycle.
+    """
+    needed: List[type] = []
+
+    def collect(algorithm: type, path: List[type]):
+        if algorithm in path:
+            cycle = " -> ".join(a.__name__ for a in [*path[path.index(algorithm) :], algorithm])
+            raise ValueError(f"The dependencies of the algorithms contain a cycle: {cycle}")
+        for dependency in getattr(algorithm, "depends_on", ()):
+            if dependency not in executed:
+                collect(dependency, [*path, algorithm])
+        if algorithm not in needed:
+            needed.append(algorithm)
+
+    for algorithm in algorithms:
+        collect(algorithm, [])
+
+    depths: Dict[type, int] = {}
+
+    def depth(algorithm: type) -> int:
+        if algorithm not in depths:
+            dependencies = [d for d in getattr(algorithm, "depends_on", ()) if d in needed]
+            depths[algorithm] = 1 + max((depth(d) for d in dependencies), default=-1)
+        return depths[algorithm]
+
+    levels: List[List[type]] = [[] for _ in range(1 + max((depth(a) for a in needed), default=-1))]
+    for algorithm in needed:
+        levels[depth(algorithm)].append(algorithm)
+    return levels
+
+
+def run_pipeline(
+    algorithms: Sequence[Union[type, Any]],
+    plot_data: Dict[str, PlotData],
+    executed: Sequence[type] = (),
+    cache=None,
+    max_workers: Optional[int] = None,
+    parent=None,
+    plugin_factory: Optional[Callable[[type], Any]] = None,
+) -> List[PipelineStep]:
+    """Apply `algorithms` and their dependencies to `plot_data`, which is modified in place.
+
+    Parameters
+    ----------
+    algorithms
+        Classes of :class:`~mad_gui.plugins.BaseAlgorithm` or instances of them. Dependencies are instantiated with
+        `parent`.
+    plot_data
+        The data of all plots, like it is passed to :meth:`~mad_gui.plugins.BaseAlgorithm.process_data`.
+    executed
+        Algorithms that were already executed, e.g. `StateKeeper.executed_algorithms`, see
+        :func:`resolve_dependencies`.
+    cache
+        If given, each algorithm is applied via this :class:`~mad_gui.plugins.caching.AlgorithmCache`, such that
+        intermediate results are reused when running the pipeline again.
+    max_workers
+        If given, the algorithms of a level run in up to this many threads in parallel. By default, they run one
+        after another in the calling thread, which is required if they create Qt widgets, e.g. to show their results.
+    parent
+        Passed to the algorithms that are instantiated.
+    plugin_factory
+        Creates an instance of an algorithm class, e.g. to run it isolated. Defaults to `algorithm(parent=parent)`.
+
+    Returns
+    -------
+    steps
+        One entry per executed algorithm, in the order they were merged.
+
+    Notes
+    -----
+    Algorithms that run in parallel share the sensor data, so they must not modify it in place. If two of them change
+    annotations of the same label class, the one listed later in `algorithms` wins.
+    """
+    instances = {class_of_plugin(a): a for a in algorithms if not isinstance(a, type)}
+    algorithm_classes = [class_of_plugin(a) for a in algorithms]
+    plugin_factory = plugin_factory or (lambda algorithm_class: algorithm_class(parent=parent))
+
+    steps = []
+    for level in resolve_dependencies(algorithm_classes, executed):
+        level_instances = [instances[a] if a in instances else plugin_factory(a) for a in level]
+        if len(level) == 1:
+            # nothing to merge, so the algorithm can work on the data directly
+            steps.append(_run_step(level_instances[0], plot_data, cache))
+            continue
+        copies = [_copy_plot_data(plot_data) for _ in level]
+        if max_workers is None or max_workers <= 1:
+            level_steps = [_run_step(a, copy, cache) for a, copy in zip(level_instances, copies)]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mad_gui_pipeline") as pool:
+                futures = [pool.submit(_run_step, a, copy, cache) for a, copy in zip(level_instances, copies)]
+                level_steps = [future.result() for future in futures]
+        _merge(plot_data, copies, level_steps)
+        steps.extend(level_steps)
+    return steps
+
+
+def _run_step(algorithm, plot_data: Dict[str, PlotData], cache) -> PipelineStep:
+    start = time.perf_counter()
+    if cache is not None:
+        cached = cache.process_data(algorithm, plot_data)
+    else:
+        algorithm.process_data(plot_data)
+        cached = False
+    return PipelineStep(class_of_plugin(algorithm), time.perf_counter() - start, cached)
+
+
+def _copy_plot_data(plot_data: Dict[str, PlotData]) -> Dict[str, PlotData]:
+    copies = {}
+    for plot_name, plot in plot_data.items():
+        annotations = {}
+        for label_name, labels in plot.annotations.items():
+            annotations[label_name] = AnnotationData()
+            annotations[label_name].data = labels.data.copy()
+        copies[plot_name] = PlotData(
+            plot.data, plot.sampling_rate_hz, annotations, plot.additional_data, source=plot.source, stream=plot.stream
+        )
+    return copies
+
+
+def _merge(plot_data: Dict[str, PlotData], copies: List[Dict[str, PlotData]], steps: List[PipelineStep]):
+    original = {
+        (plot_name, label_name): frame_fingerprint(labels.data)
+        for plot_name, plot in plot_data.items()
+        for label_name, labels in plot.annotations.items()
+    }
+    changed_by: Dict[tuple, type] = {}
+    for copy, step in zip(copies, steps):
+        for plot_name, plot in copy.items():
+            if plot.data is not plot_data[plot_name].data:
+                plot_data[plot_name].data = plot.data
+            for label_name, labels in plot.annotations.items():
+                key = (plot_name, label_name)
+                if original.get(key) == frame_fingerprint(labels.data):
+                    continue
+                if key in changed_by:
+                    warnings.warn(
+                        f"{changed_by[key].__name__} and {step.algorithm.__name__} both changed {label_name} of "
+                        f"{plot_name}, the result of {step.algorithm.__name__} is used."
+                    )
+                changed_by[key] = step.algorithm
+                if label_name not in plot_data[plot_name].annotations:
+                    plot_data[plot_name].annotations[label_name] = AnnotationData()
+                plot_data[plot_name].annotations[label_name].data = labels.data
@@ -0,0 +1,171 @@
+"""Compute statistics of the sensor data within many regions (e.g. all labels of a class) at once.
+
+Instead of slicing the sensor data for each label and computing features one label at a time, the functions in this
+module use :func:`numpy.ufunc.reduceat` to reduce all regions in one vectorized call. This makes it possible to
+compute features for tens of thousands of labels within an algorithm or an exporter without noticeable delay.
+
+Examples
+--------
+>>> from mad_gui.plugins.region_statistics import label_statistics
+>>> features = label_statistics(plot_data, "Activity", channels=["acc_x", "acc_y", "acc_z"], statistics=["mean", "rms"])
+>>> features.columns.tolist()
+['acc_x_mean', 'acc_y_mean', 'acc_z_mean', 'acc_x_rms', 'acc_y_rms', 'acc_z_rms']
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from typing import Optional, Sequence, Union
+
+STATISTICS = ("mean", "rms", "energy", "min", "max", "var", "duration")
+"""All statistics :func:`region_statistics` can compute.
+
+- `mean`: arithmetic mean
+- `rms`: root mean square, i.e. `sqrt(mean(x**2))`
+- `energy`: sum of squares, i.e. `sum(x**2)`
+- `min`, `max`: minimum and maximum
+- `var`: population variance (`ddof=0`)
+- `duration`: number of samples in the region, or seconds if a sampling rate is given
+"""
+
+
+def region_statistics(
+    data: Union[pd.DataFrame, np.ndarray],
+    starts: Sequence[float],
+    ends: Sequence[float],
+    statistics: Sequence[str] = STATISTICS,
+    sampling_rate_hz: Optional[float] = None,
+) -> pd.DataFrame:
+    """Compute statistics of each channel of `data` within each region `[start, end)`.
+
+    Parameters
+    ----------
+    data
+        Sensor data, where each column is one channel. Regions refer to row positions (like `iloc`), not to index
+        labels.
+    starts, ends
+        First sample and the sample after the last sample of each region. Regions may overlap and do not need to be
+        sorted. Regions that are empty or have a `nan` border result in `nan` statistics. Borders outside the data are
+        clipped.
+    statistics
+        The statistics to compute, see :data:`STATISTICS`.
+    sampling_rate_hz
+        If given, `duration` is given in seconds (column `duration_s`) instead of samples (column `duration`).
+
+    Returns
+    -------
+    statistics
+        One row per region and one column per statistic and channel named `<channel>_<statistic>`, plus the duration.
+        Channels of a :class:`numpy.ndarray` are named by their column number.
+
+    Notes
+    -----
+    `nan` values in the sensor data propagate to all statistics of the regions containing them. To keep the variance
+    accurate for data with a large offset, the mean of each channel is subtracted before summing squares.
+    """
+    unknown = set(statistics) - set(STATISTICS)
+    if unknown:
+        raise ValueError(f"Unknown statistics {unknown}, known are {STATISTICS}.")
+
+    if isinstance(data, pd.DataFrame):
+        channels = [str(channel) for channel in data.columns]
+        values = data.to_numpy(dtype=float)
+    else:
+        values = np.asarray(data, dtype=float)
+        if values.ndim == 1:
+            values = values[:, np.newaxis]
+        channels = [str(channel) for channel in range(values.shape[1])]
+    n_samples = len(values)
+
+    starts = np.asarray(starts, dtype=float)
+    ends = np.asarray(ends, dtype=float)
+    valid = ~(np.isnan(starts) | np.isnan(ends))
+    starts = np.clip(np.where(valid, starts, 0), 0, n_samples).astype(np.int64)
+    ends = np.clip(np.where(valid, ends, 0), 0, n_samples).astype(np.int64)
+    lengths = ends - starts
+    valid &= lengths > 0
+
+    results = {}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if {"mean", "var"} & set(statistics):
+            results["mean"] = _reduce(np.add, values, starts, ends, valid) / lengths[:, np.newaxis]
+        if {"rms", "energy"} & set(statistics):
+            results["energy"] = _reduce(np.add, values**2, starts, ends, valid)
+            results["rms"] = np.sqrt(results["energy"] / lengths[:, np.newaxis])
+        if "var" in statistics:
+            with warnings.catch_warnings():
+                # channels that only contain nan
+                warnings.simplefilter("ignore", RuntimeWarning)
+                offset = np.nanmean(values, axis=0) if n_samples else np.zeros(len(channels))
+            centered = values - offset
+            centered_squares = _reduce(np.add, centered**2, starts, ends, valid) / lengths[:, np.newaxis]
+            results["var"] = np.maximum(centered_squares - (results["mean"] - offset) ** 2, 0)
+    if "min" in statistics:
+        results["min"] = _reduce(np.minimum, values, starts, ends, valid)
+    if "max" in statistics:
+        results["max"] = _reduce(np.maximum, values, starts, ends, valid)
+
+    columns = {}
+    for statistic in statistics:
+        if statistic == "duration":
+            continue
+        for i_channel, channel in enumerate(channels):
+            columns[f"{channel}_{statistic}"] = results[statistic][:, i_channel]
+    if "duration" in statistics:
+        duration = np.where(valid, lengths, np.nan).astype(float)
+        if sampling_rate_hz:
+            columns["duration_s"] = duration / sampling_rate_hz
+        else:
+            columns["duration"] = duration
+    return pd.DataFrame(columns)
+
+
+def label_statistics(
+    plot_data,
+    label_name: str,
+    channels: Optional[Sequence[str]] = None,
+    statistics: Sequence[str] = STATISTICS,
+) -> pd.DataFrame:
+    """Compute statistics of the sensor data within all labels of one class.
+
+    Parameters
+    ----------
+    plot_data
+        A :class:`~mad_gui.models.local.PlotData` object.
+    label_name
+        The name of the label class, i.e. the key in `plot_data.annotations`.
+    channels
+        The channels of the sensor data to compute statistics for. Uses all channels if `None`.
+    statistics
+        See :func:`region_statistics`.
+
+    Returns
+    -------
+    statistics
+        Same as :func:`region_statistics`, with the index of the annotations and the duration in seconds.
+    """
+    annotations = plot_data.annotations[label_name].data
+    sensor_data = plot_data.data if channels is None else plot_data.data[list(channels)]
+    if annotations.empty:
+        return region_statistics(sensor_data, [], [], statistics, plot_data.sampling_rate_hz)
+    result = region_statistics(
+        sensor_data, annotations["start"], annotations["end"], statistics, plot_data.sampling_rate_hz
+    )
+    result.index = annotations.index
+    return result
+
+
+def _reduce(ufunc: np.ufunc, values: np.ndarray, starts: np.ndarray, ends: np.ndarray, valid: np.ndarray):
+    """Reduce `values` within each region using `ufunc.reduceat`, with `nan` for invalid regions."""
+    result = np.full((len(starts), values.shape[1]), np.nan)
+    if not valid.any():
+        return result
+    # reduceat reduces between consecutive indices, so interleaving starts and ends gives the regions at even positions
+    # and whatever lies between two regions at odd positions. A padding row makes `end == len(values)` a valid index.
+    padded = np.concatenate([values, np.zeros((1, values.shape[1]))])
+    indices = np.empty(2 * valid.sum(), dtype=np.int64)
+    indices[0::2] = starts[valid]
+    indices[1::2] = ends[valid]
+    result[valid] = ufunc.reduceat(padded, indices, axis=0)[0::2]
+    return result
@@ -0,0 +1,404 @@
+"""Run methods of plugins in a separate process, such that a broken plugin can not freeze or crash the GUI.
+
+The plugin class is instantiated in a newly spawned worker process, which executes a single method and sends the
+result back. Dataframes with a single numeric dtype, usually the sensor data, are transferred via shared memory
+instead of being pickled. While waiting, the GUI checks how long the worker is running and how much memory it uses
+and terminates it if it exceeds the given limits. The memory limit is only supported on Linux.
+
+Since the worker runs without the GUI, plugins executed this way can not show dialogs, e.g. via
+:class:`~mad_gui.components.dialogs.UserInformation`, and must be importable, i.e. defined in a module instead of an
+interactive session.
+
+Examples
+--------
+>>> report = run_isolated(ExampleImporter, "load_sensor_data", "/data/subject_01.csv", timeout_s=60)
+>>> report.status, report.duration_s
+('ok', 0.93)
+>>> data = report.value
+"""
+import multiprocessing
+import sys
+import threading
+import time
+import traceback
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Union
+
+POLL_INTERVAL_S = 0.05
+# how long the worker waits for the GUI to copy the shared memory, before it exits anyways
+_ACK_TIMEOUT_S = 60
+
+
+class SandboxReport(NamedTuple):
+    """The result of running a plugin's method using :func:`run_isolated`.
+
+    Attributes
+    ----------
+    status
+        `ok`, `error` (the plugin raised an exception), `timeout`, `memory` (the memory limit was exceeded), or
+        `crashed` (the worker process ended without a result, e.g. because of a segmentation fault).
+    value
+        What the method returned, `None` unless `status` is `ok`.
+    error
+        A description of what went wrong, including the traceback of an exception raised by the plugin.
+    duration_s
+        How long the worker process was running.
+    peak_memory_mb
+        The highest resident memory of the worker process that was observed, `None` if it can not be measured.
+    """
+
+    status: str
+    value: Any
+    error: Optional[str]
+    duration_s: float
+    peak_memory_mb: Optional[float]
+
+
+class PluginExecutionError(RuntimeError):
+    """Raised by :class:`IsolatedPlugin` if the plugin did not finish successfully."""
+
+    def __init__(self, plugin_name: str, report: SandboxReport):
+        messages = {
+            "error": "raised an error",
+            "timeout": f"did not finish within {report.duration_s:.0f} s",
+            "memory": f"used more than the allowed memory ({report.peak_memory_mb:.0f} MB)",
+            "crashed": "crashed",
+        }
+        super().__init__(f"{plugin_name} {messages.get(report.status, report.status)}:\n{report.error}")
+        self.report = report
+
+
+def run_isolated(
+    plugin_class: type,
+    method_name: str,
+    *args,
+    timeout_s: Optional[float] = None,
+    max_memory_mb: Optional[float] = None,
+    poll_callback: Optional[Callable] = None,
+) -> SandboxReport:
+    """Call `plugin_class().<method_name>(*args)` in a worker process.
+
+    Parameters
+    ----------
+    plugin_class
+        The plugin, which is instantiated without arguments in the worker process.
+    method_name
+        The method to call. For `process_data` of algorithms, pass the plot data as created by
+        :func:`plot_data_to_dicts`, the result then has the same format.
+    args
+        Passed to the method, must be picklable.
+    timeout_s
+        Terminate the worker, if it takes longer than this.
+    max_memory_mb
+        Terminate the worker, if its resident memory exceeds this. Ignored on systems other than Linux.
+    poll_callback
+        Called regularly while waiting for the worker, e.g. `QApplication.processEvents` to keep the GUI responsive.
+        It is only called if this function runs in the main thread.
+
+    Returns
+    -------
+    report
+        The result, see :class:`SandboxReport`. Failures of the plugin are reported there instead of being raised.
+    """
+    context = multiprocessing.get_context("spawn")
+    connection, worker_connection = context.Pipe()
+    input_handles: List[shared_memory.SharedMemory] = []
+    shared_args = _share(args, input_handles)
+    process = context.Process(
+        target=_worker,
+        args=(worker_connection, plugin_class, method_name, shared_args),
+        name=f"mad_gui_sandbox_{plugin_class.__name__}",
+        daemon=True,
+    )
+
+    start = time.perf_counter()
+    peak_memory_mb = None
+    status, value, error = "crashed", None, None
+    try:
+        process.start()
+        worker_connection.close()
+        while True:
+            if connection.poll(POLL_INTERVAL_S):
+                status, value, error = connection.recv()
+                if status == "ok":
+                    value = _unshare(value)
+                # the worker keeps the shared memory until we copied it
+                connection.send("done")
+                break
+            if not process.is_alive():
+                error = f"The worker process exited with code {process.exitcode}."
+                break
+            memory_mb = _resident_memory_mb(process.pid)
+            if memory_mb is not None:
+                peak_memory_mb = max(peak_memory_mb or 0, memory_mb)
+            if max_memory_mb is not None and memory_mb is not None and memory_mb > max_memory_mb:
+                status, error = "memory", f"The worker used {memory_mb:.0f} MB, the limit is {max_memory_mb:.0f} MB."
+                break
+            if timeout_s is not None and time.perf_counter() - start > timeout_s:
+                status, error = "timeout", f"The worker was stopped after {timeout_s:.0f} s."
+                break
+            if poll_callback is not None and threading.current_thread() is threading.main_thread():
+                poll_callback()
+    except (EOFError, OSError) as e:
+        status, error = "crashed", f"Lost the connection to the worker process: {e}"
+    finally:
+        duration_s = time.perf_counter() - start
+        if status in ("timeout", "memory"):
+            process.kill()
+        process.join(timeout=1)
+        if process.is_alive():
+            process.kill()
+            process.join()
+        connection.close()
+        _release(input_handles)
+    return SandboxReport(status, value if status == "ok" else None, error, duration_s, peak_memory_mb)
+
+
+class IsolatedPlugin:
+    """Wrap a plugin, such that its methods, which process data, run in a worker process using :func:`run_isolated`.
+
+    These are `load_sensor_data`, `load_annotations`, and `get_start_time` of importers, `process_data` of
+    algorithms, and `export_to_directory` of exporters. All other attributes are taken from `plugin`, which is used
+    as it is for everything else, e.g. `process_data` of exporters, since they usually show dialogs.
+
+    Parameters
+    ----------
+    plugin
+        An instance of the plugin.
+    timeout_s, max_memory_mb, poll_callback
+        See :func:`run_isolated`.
+    busy_callback
+        Called with `True` before and with `False` after each method runs in the worker process, e.g. to disable the
+        GUI, because `poll_callback` may process user input meanwhile.
+
+    Attributes
+    ----------
+    last_report
+        The :class:`SandboxReport` of the last method that was executed.
+
+    Raises
+    ------
+    PluginExecutionError
+        From all wrapped methods, if the plugin did not finish successfully.
+    """
+
+    def __init__(
+        self,
+        plugin,
+        timeout_s: Optional[float] = None,
+        max_memory_mb: Optional[float] = None,
+        poll_callback: Optional[Callable] = None,
+        busy_callback: Optional[Callable[[bool], None]] = None,
+    ):
+        self.plugin = plugin
+        self.plugin_class = type(plugin)
+        self.timeout_s = timeout_s
+        self.max_memory_mb = max_memory_mb
+        self.poll_callback = poll_callback
+        self.busy_callback = busy_callback
+        self.last_report: Optional[SandboxReport] = None
+
+    def __getattr__(self, name: str):
+        if name == "plugin":
+            raise AttributeError(name)
+        return getattr(self.plugin, name)
+
+    def load_sensor_data(self, file: Union[str, Path]):
+        return self._run("load_sensor_data", str(file))
+
+    def load_annotations(self, file_path: Union[str, Path]):
+        return self._run("load_annotations", str(file_path))
+
+    def get_start_time(self, *args):
+        return self._run("get_start_time", *args)
+
+    def process_data(self, data):
+        if not isinstance(data, dict):
+            # exporters get the GlobalData object and usually interact with the user
+            return self.plugin.process_data(data)
+        result = self._run("process_data", plot_data_to_dicts(data))
+        for plot_name, plot_result in result.items():
+            plot = data[plot_name]
+            if plot_result["sensor_data"] is not None:
+                plot.data = plot_result["sensor_data"]
+            for label_name, annotations in plot_result["annotations"].items():
+                if label_name not in plot.annotations:
+                    plot.annotations[label_name] = _annotation_data()
+                plot.annotations[label_name].data = annotations
+        return None
+
+    def export_to_directory(self, global_data, directory: Union[str, Path]):
+        exported = {"data_file": global_data.data_file, "plot_data": plot_data_to_dicts(global_data.plot_data)}
+        return self._run("export_to_directory", exported, str(directory))
+
+    def _run(self, method_name: str, *args):
+        if self.busy_callback is not None:
+            self.busy_callback(True)
+        try:
+            self.last_report = run_isolated(
+                self.plugin_class,
+                method_name,
+                *args,
+                timeout_s=self.timeout_s,
+                max_memory_mb=self.max_memory_mb,
+                poll_callback=self.poll_callback,
+            )
+        finally:
+            if self.busy_callback is not None:
+                self.busy_callback(False)
+        if self.last_report.status != "ok":
+            raise PluginExecutionError(self.plugin_class.name(), self.last_report)
+        return self.last_report.value
+
+
+def plot_data_to_dicts(plot_data: Dict) -> Dict[str, Dict[str, Any]]:
+    """Represent a dictionary of :class:`~mad_gui.models.local.PlotData` by dictionaries, which can be pickled."""
+    return {
+        plot_name: {
+            "sensor_data": plot.data,
+            "sampling_rate_hz": plot.sampling_rate_hz,
+            "annotations": {label_name: labels.data for label_name, labels in plot.annotations.items()},
+            "additional_data": plot.additional_data,
+        }
+        for plot_name, plot in plot_data.items()
+    }
+
+
+def plot_data_from_dicts(plot_data: Dict[str, Dict[str, Any]]) -> Dict:
+    """The inverse of :func:`plot_data_to_dicts`."""
+    from mad_gui.models.local import PlotData  # pylint: disable=import-outside-toplevel
+
+    result = {}
+    for plot_name, plot in plot_data.items():
+        annotations = {}
+        for label_name, labels in plot["annotations"].items():
+            annotations[label_name] = _annotation_data()
+            annotations[label_name].data = labels
+        result[plot_name] = PlotData(
+            plot["sensor_data"], plot["sampling_rate_hz"], annotations, plot["additional_data"]
+        )
+    return result
+
+
+def _annotation_data():
+    from mad_gui.models.local import AnnotationData  # pylint: disable=import-outside-toplevel
+
+    return AnnotationData()
+
+
+def _worker(connection, plugin_class: type, method_name: str, args: tuple):
+    handles: List[shared_memory.SharedMemory] = []
+    try:
+        args = _unshare(args)
+        plugin = plugin_class()
+        if method_name == "process_data" and args and isinstance(args[0], dict):
+            plot_data = plot_data_from_dicts(args[0])
+            original_data = {plot_name: plot.data for plot_name, plot in plot_data.items()}
+            plugin.process_data(plot_data)
+            value = {
+                plot_name: {
+                    "sensor_data": None if plot.data is original_data.get(plot_name) else plot.data,
+                    "annotations": {label_name: labels.data for label_name, labels in plot.annotations.items()},
+                }
+                for plot_name, plot in plot_data.items()
+            }
+        elif method_name == "export_to_directory":
+            from mad_gui.models.global_data import GlobalData  # pylint: disable=import-outside-toplevel
+
+            global_data = GlobalData()
+            global_data.data_file = args[0]["data_file"]
+            global_data.plot_data = plot_data_from_dicts(args[0]["plot_data"])
+            value = plugin.export_to_directory(global_data, *args[1:])
+        else:
+            value = getattr(plugin, method_name)(*args)
+        connection.send(("ok", _share(value, handles), None))
+    except BaseException:  # noqa
+        # anything that goes wrong inside the plugin is reported to the GUI
+        _release(handles)
+        handles = []
+        connection.send(("error", None, traceback.format_exc()))
+    try:
+        connection.poll(_ACK_TIMEOUT_S)
+    finally:
+        for handle in handles:
+            handle.close()
+        connection.close()
+
+
+class _SharedFrame(NamedTuple):
+    name: str
+    shape: tuple
+    dtype: str
+    columns: pd.Index
+    index: pd.Index
+
+
+def _share(value: Any, handles: List[shared_memory.SharedMemory]) -> Any:
+    """Replace dataframes with a single numeric dtype by references to shared memory, which keeps their values."""
+    if isinstance(value, pd.DataFrame) and _is_shareable(value):
+        values = value.to_numpy()
+        handle = shared_memory.SharedMemory(create=True, size=values.nbytes)
+        handles.append(handle)
+        np.ndarray(values.shape, values.dtype, buffer=handle.buf)[:] = values
+        return _SharedFrame(handle.name, values.shape, values.dtype.str, value.columns, value.index)
+    if isinstance(value, dict):
+        return {k: _share(v, handles) for k, v in value.items()}
+    if type(value) in (list, tuple):
+        return type(value)(_share(v, handles) for v in value)
+    return value
+
+
+def _unshare(value: Any) -> Any:
+    """Copy the dataframes referenced by :func:`_share` out of the shared memory and release it."""
+    if isinstance(value, _SharedFrame):
+        handle = shared_memory.SharedMemory(name=value.name)
+        try:
+            shared = np.ndarray(value.shape, np.dtype(value.dtype), buffer=handle.buf)
+            values = shared.copy()
+            del shared
+        finally:
+            handle.close()
+            _unlink(handle)
+        return pd.DataFrame(values, index=value.index, columns=value.columns)
+    if isinstance(value, dict):
+        return {k: _unshare(v) for k, v in value.items()}
+    if type(value) in (list, tuple):
+        return type(value)(_unshare(v) for v in value)
+    return value
+
+
+def _is_shareable(frame: pd.DataFrame) -> bool:
+    dtypes = set(frame.dtypes)
+    return len(dtypes) == 1 and next(iter(dtypes)).kind in "biuf" and frame.size > 0
+
+
+def _release(handles: List[shared_memory.SharedMemory]):
+    for handle in handles:
+        handle.close()
+        _unlink(handle)
+
+
+def _unlink(handle: shared_memory.SharedMemory):
+    try:
+        handle.unlink()
+    except FileNotFoundError:
+        # the other process already released it
+        pass
+
+
+def _resident_memory_mb(pid: int) -> Optional[float]:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="utf-8") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        return None
+    return None
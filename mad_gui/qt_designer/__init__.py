@@ -1,3 +1,76 @@
+"""The layouts of the windows and dialogs, as created with Qt Designer, and the icons they use.
+
+At runtime, :func:`load_ui_class` prefers the classes that were generated from the `.ui` files in advance (see the
+`compile_ui` task in `dodo.py`), because generating them with `pyside2-uic` on every start is slow. Similarly,
+:func:`register_resources` prefers the binary resource file `window_buttons.rcc` over importing the icons embedded in
+`window_buttons_rc.py`. Without those files, both fall back to the slower way, so nothing needs to be compiled in
+advance for the GUI to work.
+"""
+import importlib
+import os
+import sys
+import types
 from pathlib import Path
 
+from PySide2.QtCore import QResource
+from PySide2.QtUiTools import loadUiType
+
+from mad_gui.utils.helper import resource_path
+
 UI_PATH = Path(__file__).parent
+BUILD_PATH = UI_PATH / "build"
+RESOURCE_FILE = UI_PATH / "window_buttons.rcc"
+
+_resources_registered = False
+
+
+def register_resources():
+    """Make the icons of the buttons (`:/btn/images/...`) available to Qt, once."""
+    global _resources_registered  # pylint: disable=global-statement
+    if _resources_registered:
+        return
+    if RESOURCE_FILE.is_file() and QResource.registerResource(str(RESOURCE_FILE)):
+        # the code generated from the .ui files imports `window_buttons_rc`, which is not needed anymore
+        sys.modules.setdefault("window_buttons_rc", types.ModuleType("window_buttons_rc"))
+    else:
+        from mad_gui.qt_designer import window_buttons_rc  # pylint: disable=import-outside-toplevel
+
+        sys.modules.setdefault("window_buttons_rc", window_buttons_rc)
+    _resources_registered = True
+
+
+def load_ui_class(ui_name: str, class_name: str = "Ui_Form") -> type:
+    """Return the class that sets up the layout given in `<ui_name>.ui`.
+
+    Parameters
+    ----------
+    ui_name
+        The name of the `.ui` file in this directory, without suffix, e.g. `main`.
+    class_name
+        The name of the generated class, which is `Ui_<name of the top level widget>`.
+    """
+    register_resources()
+    ui_path = resource_path(str(UI_PATH / f"{ui_name}.ui"))
+    if ui_path.endswith(".py") or _is_precompiled(ui_name):
+        # within the standalone executable, only the precompiled classes are available
+        return getattr(importlib.import_module(f"mad_gui.qt_designer.build.{ui_name}"), class_name)
+    try:
+        ui_class, _ = loadUiType(ui_path)
+    except TypeError:
+        try:
+            uic_path = Path(os.sep.join(sys.executable.split(os.sep)[:-1])) / "Scripts"
+            sys.path.append(str(uic_path))
+            ui_class, _ = loadUiType(ui_path)
+        except TypeError as error:
+            raise FileNotFoundError(
+                "Probably python did not find `pyside2-uic`. See "
+                '"https://mad-gui.readthedocs.io/en/latest/troubleshooting.html#pyside2-uic-not-found" for more '
+                "information"
+            ) from error
+    return ui_class
+
+
+def _is_precompiled(ui_name: str) -> bool:
+    """Whether the generated class exists and is not outdated, i.e. the `.ui` file did not change afterwards."""
+    generated = BUILD_PATH / f"{ui_name}.py"
+    return generated.is_file() and generated.stat().st_mtime >= (UI_PATH / f"{ui_name}.ui").stat().st_mtime
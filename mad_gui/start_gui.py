@@ -5,35 +5,46 @@ from pathlib import Path
 import pyqtgraph
 from PySide2.QtWidgets import QApplication
 
+from mad_gui.batch import add_batch_arguments, run_batch_from_args
 from mad_gui.config import BaseSettings, BaseTheme
 from mad_gui.plot_tools.labels import BaseEventLabel, BaseRegionLabel
 from mad_gui.plugins.base import BasePlugin
-from mad_gui.plugins.example import (
-    EnergyCalculator,
-    ExampleExporter,
-    ExampleImporter,
-    StationaryMomentsDetector,
-    ActivityLabel,
-    Stride,
-    MyEvent,
-)
+from mad_gui.plugins.discovery import PluginDescriptor, discover_plugins
+from mad_gui.plugins.example_labels import ActivityLabel, MyEvent, Stride
 from mad_gui.windows import MainWindow
 from typing import Optional, Sequence, Type
 
+# the example plugins are only imported when the user selects them
+DEFAULT_PLUGINS = (
+    PluginDescriptor(
+        "mad_gui.plugins.example:ExampleImporter",
+        "Example Importer",
+        "importer",
+        file_type={"data_file": "*.csv", "video_file": "*.mp4", "annotation_file": "*.csv"},
+    ),
+    PluginDescriptor(
+        "mad_gui.plugins.example:StationaryMomentsDetector", "Find Resting Phases (MaD GUI example)", "algorithm"
+    ),
+    PluginDescriptor(
+        "mad_gui.plugins.example:EnergyCalculator", "Mean energy of acceleration (MaD GUI example)", "algorithm"
+    ),
+    PluginDescriptor(
+        "mad_gui.plugins.example:ExampleExporter", "Export annotations to csv (MaD GUI example)", "exporter"
+    ),
+)
+DEFAULT_LABELS = (ActivityLabel, Stride)
+DEFAULT_EVENTS = (MyEvent,)
+
 
 def start_gui(
     data_dir=Path("."),
-    plugins: Optional[Sequence[BasePlugin]] = (
-        ExampleImporter,
-        StationaryMomentsDetector,
-        EnergyCalculator,
-        ExampleExporter,
-    ),
-    labels: Optional[Sequence[BaseRegionLabel]] = (ActivityLabel, Stride),
-    events: Optional[Sequence[BaseEventLabel]] = (MyEvent,),
+    plugins: Optional[Sequence[BasePlugin]] = DEFAULT_PLUGINS,
+    labels: Optional[Sequence[BaseRegionLabel]] = DEFAULT_LABELS,
+    events: Optional[Sequence[BaseEventLabel]] = DEFAULT_EVENTS,
     settings: Optional[Type[BaseSettings]] = BaseSettings,
     theme: Optional[Type[BaseTheme]] = BaseTheme,
     use_opengl: bool = True,
+    discover: bool = True,
 ):
     """Use this function to start the GUI and pass your plugins, like importers and algorithms to it.
 
@@ -60,9 +71,14 @@ def start_gui(
         If you want to use OpenGL for the plots, set this to `True`.
         On some operating systems, this makes zooming and scrolling much smoother.
         However, under Linux this can cause degraded performance, so you can set it to `False` there.
-
+    discover
+        Additionally show the plugins that installed packages registered via entry points, see
+        :mod:`mad_gui.plugins.discovery`.
 
     """
+    if discover:
+        plugins = [*(plugins or []), *discover_plugins()]
+
     # Create the Qt Application
     pyqtgraph.setConfigOptions(useOpenGL=use_opengl, useNumba=True)
     app = QApplication(sys.argv)
@@ -74,9 +90,23 @@ def start_gui(
     sys.exit(app.exec_())
 
 
-if __name__ == "__main__":
+def main(argv: Optional[Sequence[str]] = None):
+    """Start the GUI or, using the sub-command `batch`, process a directory of recordings without a display.
 
-    parser = argparse.ArgumentParser()
+    See :mod:`mad_gui.batch` for the arguments of `batch`.
+    """
+    parser = argparse.ArgumentParser(prog="mad_gui")
     parser.add_argument("--data_dir")
-    args = parser.parse_args()
+    subparsers = parser.add_subparsers(dest="command")
+    add_batch_arguments(
+        subparsers.add_parser("batch", help="Apply importer, algorithms and exporter to all files of a directory.")
+    )
+    args = parser.parse_args(argv)
+    if args.command == "batch":
+        run_batch_from_args(args, plugins=DEFAULT_PLUGINS, labels=(*DEFAULT_LABELS, *DEFAULT_EVENTS))
+        return
     start_gui(args.data_dir)
+
+
+if __name__ == "__main__":
+    main()
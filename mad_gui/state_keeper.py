@@ -19,6 +19,9 @@ class _StateKeeper(QObject):
         One of the states "add", "remove", "edit", or "investigate". State information is color-coded by the buttons
         in the
         upper part of the GUI. Can be changed by mouse-click or shortcuts "a", "e", or "Esc".
+    annotation_changed
+        Signal emitted with a dictionary describing a single change of an annotation (added, moved, edited or deleted),
+        see :meth:`mad_gui.plot_tools.plots.BasePlot.report_annotation_change` and :mod:`mad_gui.models.journal`.
     gui_has_unsaved_changes
         Keeps information if there has been any user interaction since last time data was either exported using
         :meth:`mad_gui.MainWindow._export` or saved using :meth:`mad_gui.MainWindow._save_data_gui_format`.
@@ -29,6 +32,7 @@ class _StateKeeper(QObject):
     executed_algorithms = []
 
     save_sync = Signal()
+    annotation_changed = Signal(object)
 
     data_position_changed = Signal(float)
     video_window_closed = Signal()
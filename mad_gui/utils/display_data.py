@@ -0,0 +1,100 @@
+"""Keep sensor data compact in memory while it is plotted.
+
+Importers usually return float64 data, although a plot has only a few hundred pixels in y-direction. Using the setting
+`DISPLAY_DTYPE` (see `Adjusting Constants` in the README), the plotted channels are therefore stored as `float32`,
+which halves their memory, or as `int16` with a gain and an offset per channel, which quarters it. The data in
+:attr:`mad_gui.models.local.PlotData.data` is not changed by this, such that algorithms and exporters still get
+the full precision.
+
+With the setting `MEMMAP_SENSOR_DATA`, the full precision data is additionally moved into a memory mapped temporary
+file (see :func:`to_memmap`), such that the operating system can page it out while only the compact copy is needed.
+"""
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from typing import NamedTuple, Optional, Union
+
+DISPLAY_DTYPES = ("float64", "float32", "int16")
+
+_INT16_MAX = np.iinfo(np.int16).max
+
+
+class DisplayChannel(NamedTuple):
+    """The values of a channel as stored for plotting, the real values are `values * gain + offset`."""
+
+    values: np.ndarray
+    gain: float = 1.0
+    offset: float = 0.0
+
+    @property
+    def is_scaled(self) -> bool:
+        return self.gain != 1.0 or self.offset != 0.0
+
+    def to_float(self) -> np.ndarray:
+        if not self.is_scaled:
+            return self.values.astype(np.float64, copy=False)
+        return self.values * self.gain + self.offset
+
+
+def compact_channel(values: Union[pd.Series, np.ndarray], dtype: str = "float32") -> DisplayChannel:
+    """Convert the values of a channel to the given dtype for plotting.
+
+    Parameters
+    ----------
+    values
+        The values of one channel.
+    dtype
+        One of :data:`DISPLAY_DTYPES`. For `int16`, the values are scaled to the full range of `int16`, which
+        results in a resolution of 1/65534 of the range of the channel. Channels that contain NaN or infinite values
+        can not be represented as `int16` and are stored as `float32` instead.
+    """
+    if dtype not in DISPLAY_DTYPES:
+        raise ValueError(f"The display dtype must be one of {DISPLAY_DTYPES}, but it is {dtype}.")
+    values = np.asarray(values)
+    if dtype == "int16" and len(values) > 0 and np.isfinite(values).all():
+        minimum, maximum = float(values.min()), float(values.max())
+        offset = (maximum + minimum) / 2
+        gain = (maximum - minimum) / (2 * _INT16_MAX) or 1.0
+        scaled = np.rint((values - offset) / gain)
+        return DisplayChannel(scaled.astype(np.int16), gain, offset)
+    if dtype == "float64":
+        return DisplayChannel(values.astype(np.float64, copy=False))
+    return DisplayChannel(values.astype(np.float32))
+
+
+def to_memmap(data: pd.DataFrame, directory: Optional[Union[str, Path]] = None) -> pd.DataFrame:
+    """Return a copy of `data`, of which the values are kept in a memory mapped temporary file.
+
+    The file is deleted as soon as the returned dataframe is not used anymore. Dataframes with columns of different
+    or non-numeric dtypes are returned unchanged, since they can not be represented by a single memory map.
+
+    Parameters
+    ----------
+    data
+        The sensor data.
+    directory
+        Where to create the temporary file, defaults to the temporary directory of the operating system.
+    """
+    dtypes = set(data.dtypes)
+    if len(data.columns) == 0 or len(dtypes) != 1 or not np.issubdtype(dtypes.pop(), np.number):
+        return data
+    if is_memory_mapped(data):
+        return data
+    if directory:
+        Path(directory).mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryFile(dir=directory) as file:
+        # column major, such that each channel is contiguous on disk
+        values = np.memmap(file, dtype=data.dtypes.iloc[0], mode="w+", shape=data.shape, order="F")
+        values[:] = data.to_numpy()
+    # the memory map keeps the (already deleted) file open
+    return pd.DataFrame(values, index=data.index, columns=data.columns, copy=False)
+
+
+def is_memory_mapped(data: pd.DataFrame) -> bool:
+    values = data.to_numpy()
+    while values is not None and not isinstance(values, np.memmap):
+        values = values.base
+    return values is not None
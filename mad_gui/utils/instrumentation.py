@@ -0,0 +1,143 @@
+"""Record how long the hot paths of the GUI take, e.g. plotting data, setting labels, or changing the mode.
+
+Instrumentation is disabled by default, in which case :func:`timed` and :func:`span` only check a flag. It is enabled
+by the settings `SHOW_PERFORMANCE_HUD` or `PERFORMANCE_TRACE_FILE` (see `Adjusting Constants` in the README) or by
+pressing `F12` in the GUI, which also shows the :class:`~mad_gui.components.performance_hud.PerformanceHud`.
+
+The recorded spans can be written as trace file (see :func:`dump_trace`), which can be inspected with
+`chrome://tracing` or https://ui.perfetto.dev.
+
+Examples
+--------
+>>> from mad_gui.utils import instrumentation
+>>> instrumentation.enable()
+>>> @instrumentation.timed()
+... def process():
+...     with instrumentation.span("load", file="recording.csv"):
+...         ...
+>>> process()
+>>> instrumentation.summary()["process"]["count"]
+1
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+from typing import Callable, Deque, Dict, Optional, Tuple, Union
+
+MAX_SPANS = 200_000
+"""Number of spans that are kept, older ones are dropped."""
+
+# (name, start in ns, duration in ns, thread id, arguments)
+_Span = Tuple[str, int, int, int, Optional[Dict]]
+
+_enabled = False
+_spans: Deque[_Span] = deque(maxlen=MAX_SPANS)
+
+
+def enable(enabled: bool = True):
+    """Start or stop recording spans. Already recorded spans are kept, see :func:`clear`."""
+    global _enabled  # pylint: disable=global-statement
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def clear():
+    _spans.clear()
+
+
+def record(name: str, start_ns: int, duration_ns: int, **args):
+    """Add a span that was measured elsewhere, using the clock of :func:`time.perf_counter_ns`."""
+    if _enabled:
+        # appending to a deque is thread safe, so spans can be recorded from worker threads
+        _spans.append((name, start_ns, duration_ns, threading.get_ident(), args or None))
+
+
+@contextmanager
+def span(name: str, **args):
+    """Record how long the code within the `with` block takes. Keyword arguments are shown in the trace."""
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        record(name, start, time.perf_counter_ns() - start, **args)
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """Decorate a function to record a span for each call, named like the function by default."""
+
+    def decorator(function: Callable) -> Callable:
+        span_name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(span_name, start, time.perf_counter_ns() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def summary(last_s: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+    """Statistics of the durations in milliseconds per span name.
+
+    Parameters
+    ----------
+    last_s
+        Only use the spans that ended within this many seconds, e.g. for a live display.
+
+    Returns
+    -------
+    summary
+        For each name a dictionary with the keys `count`, `total_ms`, `mean_ms`, `p95_ms`, and `max_ms`.
+    """
+    spans = list(_spans)
+    if last_s is not None:
+        since = time.perf_counter_ns() - int(last_s * 1e9)
+        spans = [s for s in spans if s[1] + s[2] >= since]
+    durations: Dict[str, list] = {}
+    for name, _, duration, _, _ in spans:
+        durations.setdefault(name, []).append(duration)
+    result = {}
+    for name, values in durations.items():
+        values_ms = np.asarray(values) / 1e6
+        result[name] = {
+            "count": len(values_ms),
+            "total_ms": float(values_ms.sum()),
+            "mean_ms": float(values_ms.mean()),
+            "p95_ms": float(np.percentile(values_ms, 95)),
+            "max_ms": float(values_ms.max()),
+        }
+    return result
+
+
+def dump_trace(file: Union[str, Path]):
+    """Write all recorded spans in the Trace Event Format, which e.g. `chrome://tracing` can show."""
+    pid = os.getpid()
+    events = []
+    for name, start, duration, thread, args in list(_spans):
+        event = {"name": name, "ph": "X", "ts": start / 1e3, "dur": duration / 1e3, "pid": pid, "tid": thread}
+        if args:
+            event["args"] = {key: str(value) for key, value in args.items()}
+        events.append(event)
+    with open(file, "w", encoding="utf-8") as opened_file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, opened_file)
@@ -4,6 +4,7 @@ from PySide2.QtCore import QObject, Signal, Slot
 from typing_extensions import Literal
 
 from mad_gui.utils import helper
+from mad_gui.utils.instrumentation import span
 from typing import Any, Callable, Optional, Type, TypeVar
 
 
@@ -59,7 +60,9 @@ class PropertyImpl(QtProperty):
         if not self._is_equal(last_value, value):
             setattr(inst, helper.value_attribute_name(self.name), value)
             notifier_signal = getattr(inst, helper.signal_attribute_name(self.name))
-            notifier_signal.emit(value)
+            # includes all slots that are connected to the property
+            with span("Property._setter", property=self.name):
+                notifier_signal.emit(value)
 
     def _is_equal(self, old, new):
         if self.dtype == pd.DataFrame:
@@ -0,0 +1,111 @@
+"""Read and write the files that keep the synchronization between video and sensor data.
+
+The synchronization is a small table with the rows `start` and `end` and one column per plot (`<plot name>_sample`)
+plus a column `video_ms`. Historically, it is stored as Excel file, which is convenient for users but slow to parse.
+Therefore, we additionally write a JSON sidecar next to the Excel file, which is read preferentially.
+"""
+import json
+import math
+from pathlib import Path
+
+import pandas as pd
+
+from typing import Dict, Tuple, Union
+
+SYNC_FORMAT_VERSION = 1
+
+# maps the path of an Excel file to its (mtime, size) and the parsed synchronization
+_EXCEL_CACHE: Dict[str, Tuple[Tuple[int, int], pd.DataFrame]] = {}
+
+
+def sync_sidecar_path(sync_file: Union[str, Path]) -> Path:
+    """Return the path of the JSON sidecar that belongs to an Excel sync file."""
+    return Path(sync_file).with_suffix(".json")
+
+
+def write_sync(sync: pd.DataFrame, file_name: Union[str, Path]):
+    """Write the synchronization as Excel file and additionally as JSON sidecar next to it.
+
+    Parameters
+    ----------
+    sync
+        A dataframe with the index `start` and `end` and one column per synchronized stream.
+    file_name
+        Path of the Excel file to create.
+    """
+    file_name = Path(file_name)
+    if file_name.suffix == ".json":
+        write_sync_json(sync, file_name)
+        return
+    sync.to_excel(file_name)
+    write_sync_json(sync, sync_sidecar_path(file_name))
+
+
+def write_sync_json(sync: pd.DataFrame, file_name: Union[str, Path]):
+    rows = {
+        str(row): {str(column): _to_json_value(value) for column, value in values.items()}
+        for row, values in sync.iterrows()
+    }
+    with open(file_name, "w", encoding="utf-8") as file:
+        json.dump({"version": SYNC_FORMAT_VERSION, "sync": rows}, file, indent=2)
+
+
+def read_sync(sync_file: Union[str, Path]) -> pd.DataFrame:
+    """Read a synchronization file.
+
+    If a JSON sidecar exists and is at least as new as the Excel file, it is used. Otherwise the Excel file is parsed,
+    and the result is cached until the file is modified.
+
+    Parameters
+    ----------
+    sync_file
+        Path to a sync file ending with `.xlsx` or `.json`.
+
+    Returns
+    -------
+    sync
+        A dataframe with the index `start` and `end` and one column per synchronized stream.
+    """
+    sync_file = Path(sync_file)
+    if sync_file.suffix == ".json":
+        return read_sync_json(sync_file)
+    sidecar = sync_sidecar_path(sync_file)
+    if sidecar.exists() and (not sync_file.exists() or sidecar.stat().st_mtime >= sync_file.stat().st_mtime):
+        return read_sync_json(sidecar)
+    return _read_sync_excel_cached(sync_file)
+
+
+def read_sync_json(sync_file: Union[str, Path]) -> pd.DataFrame:
+    with open(sync_file, "r", encoding="utf-8") as file:
+        content = json.load(file)
+    try:
+        rows = content["sync"]
+    except (KeyError, TypeError) as e:
+        raise IndexError(f"{sync_file} does not contain synchronization information.") from e
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def clear_sync_cache():
+    _EXCEL_CACHE.clear()
+
+
+def _read_sync_excel_cached(sync_file: Path) -> pd.DataFrame:
+    stat = sync_file.stat()
+    fingerprint = (stat.st_mtime_ns, stat.st_size)
+    key = str(sync_file.resolve())
+    cached = _EXCEL_CACHE.get(key)
+    if cached is None or cached[0] != fingerprint:
+        sync = pd.read_excel(sync_file, index_col=0, engine="openpyxl")
+        _EXCEL_CACHE[key] = (fingerprint, sync)
+    else:
+        sync = cached[1]
+    return sync.copy()
+
+
+def _to_json_value(value):
+    if hasattr(value, "item"):
+        # numpy scalars can not be serialized by json
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
@@ -0,0 +1,241 @@
+"""Log how users interact with the GUI, e.g. for usability studies, with negligible overhead.
+
+Each interaction is one record of :data:`EVENT_DTYPE`, which is written into a preallocated buffer. Full buffers are
+written to disk by a background thread, so logging never waits for the disk. If the disk can not keep up and all
+buffers are full, new records are dropped and counted in :attr:`TelemetryLogger.dropped`, instead of blocking the GUI.
+
+The log is written in a compact binary format, or as Parquet if the file name ends with `.parquet` (requires
+`pyarrow`). Both can be read using :func:`read_log`.
+
+Records of the following kinds are logged by the GUI if the setting `TELEMETRY_FILE` is set (see `Adjusting
+Constants` in the README):
+
+- `mode`: the user changed the mode, `name` is the new mode
+- `annotation`: `name` is the operation (`add`, `move`, `edit`, `delete`) and `detail` the label class, the values
+  are the start and end (or position) of the label, see :meth:`TelemetryLogger.log_annotation_change`
+- `navigation`: `name` is `x_range`, the values are the range shown by the main plot in seconds
+- `latency`: `name` is the operation, the first value is its duration in milliseconds, see
+  :meth:`TelemetryLogger.measure`
+- `window`: `name` is e.g. `move`, `resize`, `activated` or `deactivated`, the values are x, y, width and height
+"""
+import json
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from typing import Dict, Optional, Sequence, Union
+
+KINDS = ("mode", "annotation", "navigation", "latency", "window")
+
+EVENT_DTYPE = np.dtype([("time_s", "<f8"), ("kind", "u1"), ("name", "S32"), ("detail", "S32"), ("values", "<f8", (4,))])
+"""A single record: unix time, index into :data:`KINDS`, two short utf-8 strings, and up to four numbers."""
+
+MAGIC = b"MAD_GUI_TELEMETRY\n"
+
+_NO_VALUES = (np.nan,) * 4
+
+
+class TelemetryLogger:
+    """Log interactions into a file using a background thread.
+
+    Parameters
+    ----------
+    file
+        The log file. A binary log is appended to if it exists, a Parquet file is replaced. If `None`, logging is
+        disabled and all methods return immediately.
+    capacity
+        Number of records per buffer. A buffer is written to disk when it is full or after `flush_interval_s`.
+    n_buffers
+        Number of preallocated buffers.
+    flush_interval_s
+        Maximum time records are kept in memory before being written.
+    """
+
+    def __init__(
+        self,
+        file: Optional[Union[str, Path]] = None,
+        capacity: int = 4096,
+        n_buffers: int = 4,
+        flush_interval_s: float = 5.0,
+    ):
+        self.file = Path(file) if file else None
+        self.capacity = capacity
+        self.flush_interval_s = flush_interval_s
+        self.dropped = 0
+        if self.file is None:
+            return
+        self._free: queue.Queue = queue.Queue()
+        for _ in range(n_buffers):
+            self._free.put(np.empty(capacity, dtype=EVENT_DTYPE))
+        self._full: queue.Queue = queue.Queue()
+        self._current = self._free.get_nowait()
+        self._n = 0
+        self._lock = threading.Lock()
+        self._writer = _ParquetWriter(self.file) if self.file.suffix == ".parquet" else _BinaryWriter(self.file)
+        self._thread = threading.Thread(target=self._write_loop, name="mad_gui_telemetry", daemon=True)
+        self._thread.start()
+
+    @property
+    def enabled(self) -> bool:
+        return self.file is not None
+
+    def log(self, kind: str, name: str, detail: str = "", values: Sequence[float] = _NO_VALUES):
+        """Add a record, see the module's docstring for the meaning of the fields for each kind."""
+        if self.file is None:
+            return
+        record = (
+            time.time(),
+            KINDS.index(kind),
+            name.encode("utf-8")[:32],
+            detail.encode("utf-8")[:32],
+            (*values, *_NO_VALUES)[:4],
+        )
+        with self._lock:
+            if self._current is None:
+                try:
+                    self._current = self._free.get_nowait()
+                except queue.Empty:
+                    self.dropped += 1
+                    return
+            self._current[self._n] = record
+            self._n += 1
+            if self._n == self.capacity:
+                self._hand_over()
+
+    def log_annotation_change(self, operation: Dict):
+        """Log an operation as emitted by :attr:`~mad_gui.state_keeper.StateKeeper.annotation_changed`."""
+        record = operation["after"] or operation["before"] or {}
+        if operation["kind"] == "event":
+            values = (record.get("pos", np.nan),)
+        else:
+            values = (record.get("start", np.nan), record.get("end", np.nan))
+        self.log("annotation", operation["op"], operation["label_class"], values)
+
+    @contextmanager
+    def measure(self, name: str):
+        """Log how long the code within the `with` block takes as `latency`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.log("latency", name, values=((time.perf_counter() - start) * 1000,))
+
+    def flush(self):
+        """Write all records, blocking until they are on disk."""
+        if self.file is None:
+            return
+        with self._lock:
+            self._hand_over()
+        self._full.join()
+
+    def close(self):
+        if self.file is None or not self._thread.is_alive():
+            return
+        self.flush()
+        self._full.put(None)
+        self._thread.join()
+        self._writer.close()
+
+    def _hand_over(self):
+        """Pass the current buffer to the writing thread, must be called with the lock held."""
+        if self._current is None or self._n == 0:
+            return
+        self._full.put((self._current, self._n))
+        self._n = 0
+        try:
+            self._current = self._free.get_nowait()
+        except queue.Empty:
+            self._current = None
+
+    def _write_loop(self):
+        while True:
+            try:
+                item = self._full.get(timeout=self.flush_interval_s)
+            except queue.Empty:
+                with self._lock:
+                    self._hand_over()
+                continue
+            if item is None:
+                self._full.task_done()
+                return
+            buffer, n_records = item
+            self._writer.write(buffer[:n_records])
+            self._free.put(buffer)
+            self._full.task_done()
+
+
+class _BinaryWriter:
+    """A header of one line of JSON, followed by the raw records."""
+
+    def __init__(self, file: Path):
+        is_new = not file.exists() or file.stat().st_size == 0
+        self._file = open(file, "ab")  # pylint: disable=consider-using-with
+        if is_new:
+            header = {"dtype": EVENT_DTYPE.descr, "kinds": KINDS}
+            self._file.write(MAGIC + json.dumps(header).encode() + b"\n")
+
+    def write(self, records: np.ndarray):
+        self._file.write(records.tobytes())
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter:
+    """One row group per buffer."""
+
+    def __init__(self, file: Path):
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel
+        import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+        self._pa = pa
+        self._schema = pa.schema(
+            [("time_s", pa.float64()), ("kind", pa.string()), ("name", pa.string()), ("detail", pa.string())]
+            + [(f"value_{i}", pa.float64()) for i in range(EVENT_DTYPE["values"].shape[0])]
+        )
+        self._writer = pq.ParquetWriter(str(file), self._schema)
+
+    def write(self, records: np.ndarray):
+        table = self._pa.Table.from_pandas(_to_frame(records), schema=self._schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def close(self):
+        self._writer.close()
+
+
+def _to_frame(records: np.ndarray) -> pd.DataFrame:
+    kinds = np.asarray(KINDS, dtype=object)
+    frame = pd.DataFrame(
+        {
+            "time_s": records["time_s"],
+            "kind": kinds[records["kind"]],
+            "name": [value.decode("utf-8", errors="replace") for value in records["name"]],
+            "detail": [value.decode("utf-8", errors="replace") for value in records["detail"]],
+        }
+    )
+    for i in range(records["values"].shape[1]):
+        frame[f"value_{i}"] = records["values"][:, i]
+    return frame
+
+
+def read_log(file: Union[str, Path]) -> pd.DataFrame:
+    """Read a log written by :class:`TelemetryLogger` with the columns `time_s`, `kind`, `name`, `detail`, and
+    `value_0` to `value_3`."""
+    file = Path(file)
+    if file.suffix == ".parquet":
+        return pd.read_parquet(file)
+    with open(file, "rb") as opened_file:
+        if opened_file.readline() != MAGIC:
+            raise ValueError(f"{file} is not a telemetry log of the MaD GUI.")
+        header = json.loads(opened_file.readline())
+        dtype = np.dtype([tuple(field[:2]) + tuple(tuple(shape) for shape in field[2:]) for field in header["dtype"]])
+        data = opened_file.read()
+    # a record might be incomplete if the GUI crashed while writing it
+    records = np.frombuffer(data[: len(data) - len(data) % dtype.itemsize], dtype=dtype)
+    return _to_frame(records)
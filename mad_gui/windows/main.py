@@ -12,18 +12,18 @@ from pathlib import Path
 import platform
 import ctypes
 import pickle
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Optional
 
 import pandas as pd
 import pyqtgraph as pg
 from PySide2.QtCore import Qt
-from PySide2.QtUiTools import loadUiType
 from PySide2.QtWidgets import (
     QFileDialog,
     QMessageBox,
     QVBoxLayout,
     QMainWindow,
     QApplication,
+    QPushButton,
 )
 from PySide2.QtGui import QPalette
 
@@ -33,19 +33,29 @@ from mad_gui.components.dialogs.plugin_selection.plugin_selection_dialog import
 from mad_gui.components.dialogs.user_information import UserInformation
 from mad_gui.components.helper import set_cursor
 from mad_gui.components.key_event_handler import KeyEventHandler
+from mad_gui.components.label_search import LabelSearchPanel
+from mad_gui.components.performance_hud import PerformanceHud
 from mad_gui.components.sidebar import Sidebar
 from mad_gui.config import Config, BaseSettings, BaseTheme
 from mad_gui.models.global_data import GlobalData
-from mad_gui.models.local import PlotData
+from mad_gui.models.history import UndoHistory
+from mad_gui.models.journal import AnnotationJournal
+from mad_gui.models.label_index import Hit, LabelIndex
+from mad_gui.models.local import AnnotationData, PlotData
 from mad_gui.models.ui_state import UiState, PlotState, MODES
 from mad_gui.plot_tools.plots import SensorPlot, VideoPlot
 from mad_gui.plot_tools.labels import BaseRegionLabel, BaseEventLabel
 from mad_gui.plugins.base import BaseExporter, BaseImporter, BaseAlgorithm
+from mad_gui.plugins.caching import AlgorithmCache
+from mad_gui.plugins.discovery import PluginDescriptor
 from mad_gui.plugins.helper import filter_plugins
 from mad_gui.state_keeper import StateKeeper
-from mad_gui.utils.helper import resource_path
+from mad_gui.utils import instrumentation
+from mad_gui.utils.display_data import to_memmap
+from mad_gui.utils.sync_file import write_sync
+from mad_gui.utils.telemetry import TelemetryLogger
 from mad_gui.windows import VideoWindow
-from mad_gui.qt_designer import UI_PATH
+from mad_gui.qt_designer import load_ui_class
 
 try:
     import pyi_splash  # noqa
@@ -69,23 +79,7 @@ if platform.system() == "Windows" and int(float(platform.release())) >= 8:
 if platform.system() == "Darwin":
     os.environ["QT_MAC_WANTS_LAYER"] = "1"
 
-ui_path = resource_path(str(UI_PATH / "main.ui"))
-if ".ui" in ui_path:
-    try:
-        Window, _ = loadUiType(ui_path)
-    except TypeError:
-        try:
-            uic_path = Path(os.sep.join(sys.executable.split(os.sep)[:-1])) / "Scripts"
-            sys.path.append(str(uic_path))
-            Window, _ = loadUiType(ui_path)
-        except TypeError as error:
-            raise FileNotFoundError(
-                "Probably python did not find `pyside2-uic`. See "
-                '"https://mad-gui.readthedocs.io/en/latest/troubleshooting.html#pyside2-uic-not-found" for more '
-                "information"
-            ) from error
-elif ".py" in ui_path:
-    from mad_gui.qt_designer.build.main import Ui_MainWindow as Window  # noqa
+Window = load_ui_class("main", "Ui_MainWindow")
 
 
 class MainWindow(QMainWindow):
@@ -128,6 +122,14 @@ class MainWindow(QMainWindow):
         self.palette().setColor(QPalette.Active, QPalette.Window, theme.COLOR_LIGHT)
         self._set_window_properties()
 
+        # only shown while the user works through a worklist, see `import_data`, which the sidebar relabels, so it is
+        # created before the sidebar
+        self.ui.btn_next_recording = QPushButton("Next recording", parent=self.ui.menu_middle_frame)
+        layout = self.ui.menu_middle_frame_layout
+        layout.insertWidget(layout.indexOf(self.ui.btn_load_data) + 1, self.ui.btn_next_recording)
+        self.ui.btn_next_recording.setVisible(False)
+        self.worklist = None
+
         # Register sidebar component logic
         self.menu = Sidebar(self.ui, parent=parent)
         self.ui_state.bind_bidirectional(self.menu.set_collapsed, self.menu.collapsed_changed, "menu_collapsed")
@@ -147,6 +149,7 @@ class MainWindow(QMainWindow):
 
         self.menu_buttons = {
             "load": self.ui.btn_load_data,
+            "next_recording": self.ui.btn_next_recording,
             "algorithm": self.ui.btn_use_algorithm,
             "export": self.ui.btn_export,
             "save": self.ui.btn_save_data_gui_format,
@@ -177,6 +180,45 @@ class MainWindow(QMainWindow):
         StateKeeper.announce_data_types.connect(self._set_data_types)
         StateKeeper.save_sync.connect(self._save_sync)
 
+        # autosave of annotation changes, which also allows to recover them after a crash
+        self.journal = AnnotationJournal(
+            directory=getattr(Config.settings, "JOURNAL_DIR", None),
+            compact_every=getattr(Config.settings, "JOURNAL_COMPACT_EVERY", 100),
+        )
+        StateKeeper.annotation_changed.connect(self.journal.append)
+        self.history = UndoHistory(max_steps=getattr(Config.settings, "UNDO_MAX_STEPS", 500))
+        StateKeeper.annotation_changed.connect(self.history.record)
+        self.key_event_handler.undo_requested.connect(self.undo)
+        self.key_event_handler.redo_requested.connect(self.redo)
+
+        # search over the descriptions of all annotations, which is shown upon `Ctrl+F`
+        self.label_index = LabelIndex()
+        StateKeeper.annotation_changed.connect(self.label_index.apply_change)
+        self.search_panel = LabelSearchPanel(self.label_index, parent=self)
+        self.ui.plotwidget.insertWidget(0, self.search_panel)
+        StateKeeper.annotation_changed.connect(self.search_panel.annotations_changed)
+        self.search_panel.hit_selected.connect(self.show_search_hit)
+        self.key_event_handler.search_requested.connect(self.search_panel.show_and_focus)
+        self._unbind_x_range = None
+        self.algorithm_cache = AlgorithmCache(
+            max_entries=getattr(Config.settings, "ALGORITHM_CACHE_ENTRIES", 32),
+            max_size_mb=getattr(Config.settings, "ALGORITHM_CACHE_MAX_MB", 256),
+        )
+
+        # opt-in timings of the hot paths, see mad_gui.utils.instrumentation
+        self.performance_hud = PerformanceHud(parent=self)
+        self.key_event_handler.performance_hud_requested.connect(self.performance_hud.toggle)
+        self.performance_trace_file = getattr(Config.settings, "PERFORMANCE_TRACE_FILE", None)
+        instrumentation.enable(bool(self.performance_trace_file))
+        self.performance_hud.set_visible(getattr(Config.settings, "SHOW_PERFORMANCE_HUD", False))
+
+        # opt-in log of the user's interactions, see mad_gui.utils.telemetry
+        self.telemetry = TelemetryLogger(getattr(Config.settings, "TELEMETRY_FILE", None))
+        if self.telemetry.enabled:
+            # the navigation is logged by the main plot, see _bind_x_range
+            self.plot_state.bind(lambda mode: self.telemetry.log("mode", mode), "mode", initial_set=False)
+            StateKeeper.annotation_changed.connect(self.telemetry.log_annotation_change)
+
         # Note: Need to make all connections and ui setup before updating the value
         self.global_data.base_dir = data_dir
         self.global_data.plugins = list(plugins)
@@ -211,6 +253,9 @@ class MainWindow(QMainWindow):
         return "unknown"
 
     def _check_argument(self, element, base_classes: Tuple):
+        if isinstance(element, PluginDescriptor):
+            # the kind of the plugin was checked when creating the descriptor, the plugin is not imported until used
+            element = element.base_class
         if not issubclass(element, base_classes):
             base = self._get_element_base(element)
             if base == "unknown":
@@ -246,6 +291,7 @@ class MainWindow(QMainWindow):
         # buttons menu
         self.ui.btn_use_algorithm.clicked.connect(self.use_algorithm)
         self.ui.btn_load_data.clicked.connect(self.import_data)
+        self.ui.btn_next_recording.clicked.connect(self.next_recording)
         self.ui.btn_save_data_gui_format.clicked.connect(self.save_data_gui_format)
         self.ui.btn_export.clicked.connect(self.export)
         self.ui.btn_load_data_gui_format.clicked.connect(self._handle_load_data_gui_format)
@@ -325,9 +371,9 @@ class MainWindow(QMainWindow):
         sync = pd.concat(all_sync, axis=1)
         self.VideoWindow.set_sync(self.video_plot.sync_info["start"], self.video_plot.sync_info["end"])
         file_name, _ = QFileDialog.getSaveFileName(self, "Save Synchronization File", filter="*.xlsx")
-        if file_name is None:
+        if not file_name:
             return
-        sync.to_excel(file_name)
+        write_sync(sync, file_name)
         for plot in self.sensor_plots.values():
             plot.adapt_to_opening_video_window()
 
@@ -423,6 +469,7 @@ class MainWindow(QMainWindow):
 
         self.global_data.plot_data = plot_data
         self.global_data.base_dir = Path(file).parent
+        self._start_journal(file)
         #        self._plot_data()
 
         self.setCursor(Qt.ArrowCursor)
@@ -476,11 +523,61 @@ class MainWindow(QMainWindow):
         view = LoadDataDialog(self.global_data.base_dir, loaders=loaders, parent=self)
 
         data, loader = view.get_data()
-        self.global_data.start_time = data["start_time"]
-
         if data is None:
             return
 
+        self._set_worklist(data.get("worklist", None))
+        self._show_loaded_data(data, loader)
+
+    def next_recording(self):
+        """Show the next recording of the worklist, which was usually already loaded in the background.
+
+        The worklist is created if the user selects the according checkbox in the
+        :class:`~mad_gui.components.dialogs.plugin_selection.LoadDataDialog`.
+        """
+        if self.worklist is None or not self.worklist.has_next:
+            return
+        if StateKeeper.gui_has_unsaved_changes:
+            answer = UserInformation.confirm(
+                "Recent changes have not been saved. Are you sure you want to continue with the next recording?"
+            )
+            if answer == QMessageBox.No:
+                return
+
+        set_cursor(self, Qt.BusyCursor)
+        try:
+            _, data = self.worklist.next()
+        except Exception as e:  # noqa
+            # ignore bare except because anything can go wrong in a user-implemented plugin
+            set_cursor(self, Qt.ArrowCursor)
+            # the worklist stays at the displayed recording, such that its index matches what the user sees
+            UserInformation.inform(
+                f"There was an error loading {self.worklist.files[self.worklist.index + 1]}: {e}\n"
+                f"Please fix the file or use `Load data` to continue with another one."
+            )
+            return
+        self._show_loaded_data(data, self.global_data.active_loader)
+        self._update_worklist_button()
+        set_cursor(self, Qt.ArrowCursor)
+
+    def _set_worklist(self, worklist):
+        if self.worklist is not None:
+            self.worklist.close()
+        self.worklist = worklist
+        if self.worklist is not None:
+            self.worklist.prefetch()
+        self._update_worklist_button()
+
+    def _update_worklist_button(self):
+        has_next = self.worklist is not None and self.worklist.has_next
+        self.ui.btn_next_recording.setVisible(has_next)
+        if has_next and not self.menu.collapsed:
+            self.ui.btn_next_recording.setText(f"Next recording ({self.worklist.remaining} left)")
+        if has_next:
+            self.worklist.prefetch()
+
+    def _show_loaded_data(self, data: Dict, loader: BaseImporter):
+        self.global_data.start_time = data["start_time"]
         self.global_data.active_loader = loader
         self.global_data.data_file = data.get("data_file_name", "")
         self.global_data.sync_file = data.get("sync_file", "")
@@ -497,11 +594,66 @@ class MainWindow(QMainWindow):
                 f"test/customization.html#implement-an-importer"
             ) from e
         self.global_data.plot_data = plot_data
+        self._start_journal(self.global_data.data_file)
         self.load_video(data.get("video_file", None))
         self._set_sync(data.get("sync_file", None))
         self._enable_buttons(True)
         # self.menu.set_collapsed(True)
 
+    def _start_journal(self, data_file: str):
+        """Offer to restore unsaved annotations of a previous session and start journaling changes for `data_file`."""
+        recovered = False
+        if self.journal.has_recovery(data_file):
+            answer = UserInformation.confirm(
+                "The annotations of this file were changed in a previous session, but these changes were not saved. "
+                "Do you want to restore them?"
+            )
+            if answer == QMessageBox.Yes:
+                self._restore_annotations(self.journal.recover(data_file))
+                recovered = True
+        self.journal.start(data_file, self._current_annotations(), saved=not recovered)
+        self.history.clear()
+        StateKeeper.set_has_unsaved_changes(recovered)
+
+    def undo(self):
+        """Revert the most recent change of an annotation, which can be triggered by `Ctrl+Z`."""
+        self._apply_history_operation(self.history.undo())
+
+    def redo(self):
+        """Apply the most recently undone change of an annotation again, which can be triggered by `Ctrl+Y`."""
+        self._apply_history_operation(self.history.redo())
+
+    def _apply_history_operation(self, operation: Optional[Dict]):
+        if operation is None:
+            return
+        plot = self.sensor_plots.get(operation["plot"], None)
+        try:
+            plot.apply_annotation_operation(operation)
+        except (AttributeError, KeyError) as e:
+            # the plot or the label does not exist anymore, e.g. because an algorithm replaced all labels
+            warnings.warn(f"Could not undo/redo the change of an annotation: {e}")
+            self.history.clear()
+            return
+        # the operation is not emitted via StateKeeper, otherwise it would be recorded as a new change in the history
+        self.journal.append(operation)
+        self.label_index.apply_change(operation)
+        self.search_panel.annotations_changed(operation)
+
+    def _restore_annotations(self, annotations: Dict[str, Dict[str, pd.DataFrame]]):
+        for plot_name, plot_annotations in annotations.items():
+            plot_data = self.global_data.plot_data.get(plot_name, None)
+            if plot_data is None:
+                continue
+            for label_name, df in plot_annotations.items():
+                plot_data.annotations.setdefault(label_name, AnnotationData()).data = df
+        self._plot_data(self.global_data.plot_data)
+
+    def _current_annotations(self) -> Dict[str, Dict[str, pd.DataFrame]]:
+        return {
+            plot_name: {label_name: annotation.data for label_name, annotation in plot_data.annotations.items()}
+            for plot_name, plot_data in self.global_data.plot_data.items()
+        }
+
     def _set_sync(self, sync_file: str):
         """Set the synchronization for each plot"""
         if not sync_file:
@@ -546,7 +698,17 @@ class MainWindow(QMainWindow):
 
         # Delete all existing plots
         plot_wrapper: QVBoxLayout = self.ui.plotwidget
+        if self._unbind_x_range is not None:
+            self._unbind_x_range()
+            self._unbind_x_range = None
+        stream_updaters = {}
         for i_plot in list(self.sensor_plots.values()):
+            if i_plot.paged_loader is not None:
+                i_plot.paged_loader.close()
+            if i_plot.stream_updater is not None:
+                # the stream is only closed below if none of the new plots shows it
+                i_plot.stream_updater.stop()
+                stream_updaters[i_plot.plot_data.stream] = i_plot.stream_updater
             plot_wrapper.removeWidget(i_plot)
             i_plot.deleteLater()
             del i_plot
@@ -554,6 +716,8 @@ class MainWindow(QMainWindow):
 
         # Create new plots
         for sensor_name, data in data_dict.items():
+            if getattr(Config.settings, "MEMMAP_SENSOR_DATA", False):
+                data.data = to_memmap(data.data)
             plot = SensorPlot(
                 plot_data=data,
                 initial_plot_channels=getattr(Config.settings, "CHANNELS_TO_PLOT", None),
@@ -561,6 +725,7 @@ class MainWindow(QMainWindow):
                 label_classes=self.global_data.labels,
                 event_classes=self.global_data.events,
                 parent=self,
+                previous_stream_updater=stream_updaters.pop(data.stream, None) if data.stream is not None else None,
             )
             plot_wrapper.addWidget(plot)
             self.sensor_plots[sensor_name] = plot
@@ -568,15 +733,70 @@ class MainWindow(QMainWindow):
             # Bind global mode change
             self.plot_state.bind_property_bidirectional(plot.state, "mode", "mode", initial="set")
 
+        for stream_updater in stream_updaters.values():
+            # other data was loaded
+            stream_updater.close()
+
         plots = list(self.sensor_plots.values())
         plots[0].is_main_plot = True
+        self._bind_x_range(plots[0])
 
         if getattr(Config.settings, "SENSORS_SYNCHRONIZED", False):
             # Bind the ranges of all plots together
             self._link_plots()
         # TODO: if self.plot_state.mode changes from sync to something else, we want to bind the plots again
+
+        self.label_index.set_plot_data(data_dict)
+        self.search_panel.refresh()
         set_cursor(self, Qt.ArrowCursor)
 
+    def _bind_x_range(self, plot: SensorPlot):
+        """Keep :attr:`plot_state.x_range` and the range shown by the main plot in sync, e.g. for jumping with `Q`."""
+        view_box = plot.getViewBox()
+        time_axis = plot.plot_data.time_axis
+        if len(time_axis) > 0:
+            self.plot_state.x_range_max = (0, float(time_axis[-1]))
+
+        def show_range(x_range: Tuple[float, float]):
+            view_box.setXRange(*x_range, padding=0)
+
+        def store_range(_, x_range):
+            self.plot_state.x_range = tuple(x_range)
+
+        def log_range(_, x_range):
+            self.telemetry.log("navigation", "x_range", values=tuple(x_range))
+
+        self.plot_state.x_range_changed.connect(show_range)
+        view_box.sigXRangeChanged.connect(store_range)
+        self.plot_state.x_range = tuple(view_box.viewRange()[0])
+        if self.telemetry.enabled:
+            # connected after the initial range was stored, such that only changes of the user are logged
+            view_box.sigXRangeChanged.connect(log_range)
+
+        def unbind():
+            self.plot_state.x_range_changed.disconnect(show_range)
+            view_box.sigXRangeChanged.disconnect(store_range)
+            if self.telemetry.enabled:
+                view_box.sigXRangeChanged.disconnect(log_range)
+
+        self._unbind_x_range = unbind
+
+    def show_search_hit(self, hit: Hit):
+        """Move the plot of a search result such that the annotation is in the middle, keeping the zoom if possible."""
+        plot = self.sensor_plots.get(hit.plot, None)
+        if plot is None:
+            return
+        start = hit.start / plot.plot_data.sampling_rate_hz
+        end = hit.end / plot.plot_data.sampling_rate_hz
+        x_min, x_max = plot.getViewBox().viewRange()[0]
+        # zoom out if the label is longer than the shown range
+        width = max(x_max - x_min, (end - start) * 1.2)
+        x_range = ((start + end - width) / 2, (start + end + width) / 2)
+        if plot.is_main_plot:
+            self.plot_state.x_range = x_range
+        else:
+            plot.setXRange(*x_range, padding=0)
+
     def _link_plots(self):
         for p in self.sensor_plots.values():
             if p.is_main_plot:
@@ -647,10 +867,11 @@ class MainWindow(QMainWindow):
             return
 
         set_cursor(self, Qt.BusyCursor)
-        dialog = PluginSelectionDialog(plugins=algorithms, parent=self)
+        dialog = PluginSelectionDialog(plugins=algorithms, parent=self, algorithm_cache=self.algorithm_cache)
         try:
-            dialog.process_data(self.global_data.plot_data)
-            StateKeeper.executed_algorithms.append(dialog.executed_plugin)
+            with self.telemetry.measure("use_algorithm"):
+                dialog.process_data(self.global_data.plot_data)
+            StateKeeper.executed_algorithms.extend(dialog.executed_plugins)
         except Exception as error:  # noqa
             print(sys.exc_info()[0])
             raise NotImplementedError(
@@ -664,15 +885,25 @@ class MainWindow(QMainWindow):
         # not work currently
         # we could probably resolve it in mad_gui.plot_tools.plots.SensorPlot in the __init__ but it does not work yet
         self._plot_data(self.global_data.plot_data)
+        self.journal.replace(self._current_annotations())
+        self.history.clear()
+        stats = self.algorithm_cache.stats
+        self.ui.btn_use_algorithm.setToolTip(
+            f"Cached results: {stats.entries} ({stats.size_bytes / 1024 ** 2:.1f} MB), "
+            f"reused {stats.hits} of {stats.hits + stats.misses} runs"
+        )
 
-    def _save_data(self, data_to_save: PlotData):
+    def _save_data(self, data_to_save: PlotData) -> bool:
+        """Ask for a file and save the data to it, return whether it was saved, i.e. the user did not cancel."""
         save_file_name = QFileDialog().getSaveFileName(
             None, "Save GUI data", str(Path(self.global_data.data_file).parent) + "/data.mad_gui", "*.mad_gui"
         )[0]
-        if save_file_name != "":
-            pickable_data = {k: v.to_dict() for k, v in data_to_save.items()}
-            with open(save_file_name, "wb") as file:
-                pickle.dump(pickable_data, file, protocol=pickle.HIGHEST_PROTOCOL)
+        if save_file_name == "":
+            return False
+        pickable_data = {k: v.to_dict() for k, v in data_to_save.items()}
+        with open(save_file_name, "wb") as file:
+            pickle.dump(pickable_data, file, protocol=pickle.HIGHEST_PROTOCOL)
+        return True
 
     def save_data_gui_format(self):
         """Saves the displayed sensor data, sampling rate and displayed activity and stride labels into a pickle file.
@@ -685,11 +916,22 @@ class MainWindow(QMainWindow):
             UserInformation.inform("Please load data before continuing.")
             return
 
+        if any(plot.source is not None for plot in self.global_data.plot_data.values()):
+            UserInformation.inform(
+                "The recording is too large to be kept in memory, therefore only an overview of it is plotted. It can "
+                "not be saved in the GUI format, because the overview would replace the recording when loading the "
+                "file again. Please use `Export data` to save the annotations."
+            )
+            return
+
         # Set state to investigate to force updating global state from plot
         self.plot_state.mode = "investigate"
 
-        self._save_data(self.global_data.plot_data)
+        if not self._save_data(self.global_data.plot_data):
+            # the changes are still unsaved, so they must stay recoverable
+            return
         StateKeeper.set_has_unsaved_changes(False)
+        self.journal.compact(saved=True)
 
     def export(self):
         """Called when clicking the `Export data` button.
@@ -715,8 +957,20 @@ class MainWindow(QMainWindow):
             if answer == QMessageBox.No:
                 ev.ignore()
                 return
+        # the user either saved the changes or decided to drop them, so there is nothing to recover
+        self.journal.discard()
+        for plot in self.sensor_plots.values():
+            if plot.paged_loader is not None:
+                plot.paged_loader.close()
+            if plot.stream_updater is not None:
+                plot.stream_updater.close()
+        if self.worklist is not None:
+            self.worklist.close()
         if self.VideoWindow:
             self.VideoWindow.close()
+        if self.performance_trace_file:
+            instrumentation.dump_trace(self.performance_trace_file)
+        self.telemetry.close()
         self.close()
 
     def _set_window_properties(self):
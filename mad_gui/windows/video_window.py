@@ -5,8 +5,11 @@ from PySide2.QtCore import QObject, Qt, QUrl
 from PySide2.QtMultimedia import QMediaContent, QMediaPlayer, QMediaPlaylist
 
 from mad_gui.components.dialogs import UserInformation
+from mad_gui.components.playback_driver import PlaybackDriver
+from mad_gui.config import Config
 from mad_gui.qt_designer.ui_video import UiVideoWindow
 from mad_gui.state_keeper import StateKeeper
+from mad_gui.utils.instrumentation import timed
 
 
 class VideoWindow(UiVideoWindow, QObject):
@@ -30,12 +33,17 @@ class VideoWindow(UiVideoWindow, QObject):
         self.slider.valueChanged.connect(self.slider_moved)
         self.player.positionChanged.connect(self.frame_changed)
         self.player.durationChanged.connect(self.set_slider_range)
+        self.player.stateChanged.connect(self._playback_state_changed)
         self.btn_play_pause.clicked.connect(self.toggle_play)
         self.setStyleSheet(parent.styleSheet())
         self.setWindowFlag(Qt.WindowStaysOnTopHint)
         self.user_informed_about_error = False
         self._times_set_rate_called = 0
 
+        # positions are coalesced while playing, such that plots are updated at most once per frame
+        self.playback_driver = PlaybackDriver(max_fps=getattr(Config.settings, "PLAYBACK_MAX_FPS", 60), parent=self)
+        self.playback_driver.position_changed.connect(self._distribute_position)
+
     def _init_position(self):
         """Move the window to the center of the parent window."""
 
@@ -43,6 +51,12 @@ class VideoWindow(UiVideoWindow, QObject):
         y = self.parent.pos().y() + self.parent.size().height() / 2 - self.size().height() / 2
         self.move(x, y)
 
+    def _playback_state_changed(self, state: QMediaPlayer.State):
+        if state == QMediaPlayer.PlayingState:
+            self.playback_driver.start()
+        else:
+            self.playback_driver.stop()
+
     def toggle_play(self):
         if self.player.state() == QMediaPlayer.PlayingState:
             self.player.pause()
@@ -141,6 +155,7 @@ class VideoWindow(UiVideoWindow, QObject):
         if self.player.state() == QMediaPlayer.PausedState:
             self.player.setPosition(self.slider.value())
 
+    @timed("VideoWindow.frame_changed")
     def frame_changed(self):
         if self.player.mediaStatus() == QMediaPlayer.MediaStatus.LoadedMedia or self.duration is None:
             warnings.warn("Video is not playing or duration unknown.")
@@ -161,6 +176,10 @@ class VideoWindow(UiVideoWindow, QObject):
         stream_length = end - start
         pos = self.slider.value()
         percent_since_start = (pos - start) / stream_length * 100
+        self.playback_driver.submit(percent_since_start)
+
+    @staticmethod
+    def _distribute_position(percent_since_start: float):
         try:
             StateKeeper.data_position_changed.emit(percent_since_start)
         except RuntimeError:
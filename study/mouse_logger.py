@@ -1,21 +1,20 @@
 import pickle
-from datetime import datetime
+from pathlib import Path
 
 import keyboard
 import mouse
-import pandas as pd
 from PySide2.QtCore import QEvent
 from PySide2.QtGui import QMoveEvent, QResizeEvent
 from PySide2.QtWidgets import QMainWindow
 
+from mad_gui.utils.telemetry import TelemetryLogger
 from tkinter import END, Button, Entry, Text, Tk, filedialog
 
 
 class MouseLogger:
     def __init__(self, window: QMainWindow):
         self.window = window
-        self.active_times = pd.DataFrame()
-        self.start_active = None
+        self.telemetry = TelemetryLogger()
 
         self.mouse_events = []
 
@@ -37,6 +36,8 @@ class MouseLogger:
     def handle_mode(self):
         self.mode = self.text_box.get("1.0", END)
         self.save_file_directory = filedialog.askdirectory()
+        self.mode = self.mode.replace("\n", "")
+        self.telemetry = TelemetryLogger(Path(self.save_file_directory) / f"{self.mode}_window_events.telemetry")
         self.master.destroy()
 
     def move_event(self, event: QMoveEvent):
@@ -51,48 +52,20 @@ class MouseLogger:
         # only for the study we record when the window is active
         if self.window.isHidden():
             return
-        print(self.window.children())
-        if self.window.isActiveWindow():
-            self.start_active = datetime.now().timestamp()
-        else:
-            self._add_change("active")
+        self._add_change("activated" if self.window.isActiveWindow() else "deactivated")
 
     def stop_logging(self):
-        self._add_change("active")
+        self._add_change("deactivated")
 
         mouse.unhook(self.mouse_events.append)
 
-        from pathlib import Path
-
-        here = Path(__file__).absolute().parent
-        print(here)
-
-        self.mode = self.mode.replace("\n", "")
-
         with open(str(Path(self.save_file_directory) / f"{self.mode}_mouse_events.pkl"), "wb") as f:
             pickle.dump(self.mouse_events, f)
 
-        with open(str(Path(self.save_file_directory) / f"{self.mode}_window_positions.pkl"), "wb") as f:
-            pickle.dump(self.active_times, f)
+        # the window events can be read using mad_gui.utils.telemetry.read_log
+        self.telemetry.close()
 
     def _add_change(self, description: str):
-        if description in ["move", "resize"]:
-            start = None
-        else:
-            start = self.start_active
-        df = pd.DataFrame(
-            data=[
-                [
-                    start,
-                    datetime.now().timestamp(),
-                    self.window.pos().x(),
-                    self.window.pos().y(),
-                    self.window.size().width(),
-                    self.window.size().height(),
-                    description,
-                ]
-            ],
-            columns=["start", "stop", "pos_x", "pos_y", "width", "height", "event_description"],
-        )
-        self.active_times = self.active_times.append(df)
-        print(self.active_times)
+        position = self.window.pos()
+        size = self.window.size()
+        self.telemetry.log("window", description, values=(position.x(), position.y(), size.width(), size.height()))
@@ -0,0 +1,37 @@
+"""The loop-based implementation that `StationaryMomentsDetector` used before it was vectorized.
+
+It is kept as reference for the tests and for `benchmarks/bench_stationary_moments.py`, such that both compare against
+the same code.
+"""
+import numpy as np
+import pandas as pd
+
+
+def reference_standing_windows(data: pd.DataFrame, window_length: int) -> np.ndarray:
+    diff = data.diff().apply(np.linalg.norm, axis=1)
+    standing_windows = abs(diff.rolling(window=window_length).mean()) < 0.2
+    standing = np.zeros(shape=(1, len(data)))
+    for idx, value in standing_windows.items():
+        if value:
+            filter_lag = window_length
+            start = max(0, idx - filter_lag)
+            stop = min(idx + window_length - filter_lag, len(data))
+            standing[0, start:stop] = 1
+    return standing
+
+
+def reference_binary_to_df(array: np.ndarray) -> pd.DataFrame:
+    df = pd.DataFrame(array).T
+    starts_stops = df.diff()
+    rows = []
+    start = stop = None
+    for idx in df.index:
+        if starts_stops[0].iloc[idx] == 1:
+            start = idx
+        if start and (starts_stops[0].iloc[idx] == -1 or idx == len(df)):
+            stop = idx
+        if start and stop:
+            rows.append([start, stop])
+            start = None
+            stop = None
+    return pd.DataFrame(data=rows, columns=["start", "end"])
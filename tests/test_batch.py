@@ -0,0 +1,71 @@
+import shutil
+from pathlib import Path
+
+from mad_gui.batch import MANIFEST_NAME, run_batch
+from mad_gui.components.dialogs import UserInformation
+from mad_gui.plugins.example import ActivityLabel, ExampleExporter, ExampleImporter, StationaryMomentsDetector
+
+EXAMPLE_DATA_PATH = Path(__file__).parent.parent / "example_data"
+
+
+def test_batch_processing_and_resume(tmp_path):
+    input_dir = tmp_path / "recordings"
+    input_dir.mkdir()
+    shutil.copy(EXAMPLE_DATA_PATH / "sensor_data.csv", input_dir / "good.csv")
+    (input_dir / "broken.csv").write_text("these,are,no\n1,2,3\n")
+    output_dir = tmp_path / "results"
+
+    def run():
+        return run_batch(
+            input_dir,
+            output_dir,
+            importer=ExampleImporter,
+            algorithms=[StationaryMomentsDetector],
+            exporter=ExampleExporter,
+            labels=[ActivityLabel],
+            pattern="*.csv",
+            workers=0,
+        )
+
+    records = run()
+    status = {Path(record["file"]).name: record["status"] for record in records}
+    assert status == {"good.csv": "ok", "broken.csv": "failed"}
+    good = [record for record in records if record["status"] == "ok"][0]
+    assert {"load", StationaryMomentsDetector.name(), "export", "total"} <= set(good["timings_s"])
+    assert (output_dir / "good.csv" / "Pocket_IMU_Activity.csv").exists()
+    assert (output_dir / MANIFEST_NAME).exists()
+
+    # only the failed file is processed again
+    records = run()
+    assert [Path(record["file"]).name for record in records] == ["broken.csv"]
+
+
+class InformingImporter(ExampleImporter):
+    def load_sensor_data(self, file):
+        UserInformation.inform(f"Loading {Path(file).name}")
+        return super().load_sensor_data(file)
+
+
+def test_batch_messages_and_output_inside_input(tmp_path):
+    shutil.copy(EXAMPLE_DATA_PATH / "sensor_data.csv", tmp_path / "good.csv")
+    output_dir = tmp_path / "results"
+
+    def run():
+        return run_batch(
+            tmp_path,
+            output_dir,
+            importer=InformingImporter,
+            algorithms=[StationaryMomentsDetector],
+            exporter=ExampleExporter,
+            labels=[ActivityLabel],
+            pattern="*.csv",
+            workers=0,
+            resume=False,
+        )
+
+    records = run()
+    assert [record["messages"] for record in records] == [["Loading good.csv"]]
+    assert UserInformation.headless_messages is None
+    assert (output_dir / "good.csv" / "Pocket_IMU_Activity.csv").exists()
+    # the exported files are not processed as recordings in the next run
+    assert [Path(record["file"]).name for record in run()] == ["good.csv"]
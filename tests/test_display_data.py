@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mad_gui.utils.display_data import compact_channel, is_memory_mapped, to_memmap
+
+
+@pytest.mark.parametrize("dtype, itemsize", [("float64", 8), ("float32", 4), ("int16", 2)])
+def test_compact_channel_keeps_values_within_resolution(dtype, itemsize):
+    values = np.sin(np.linspace(0, 20, 10000)) * 300 + 50
+    channel = compact_channel(pd.Series(values), dtype)
+
+    assert channel.values.itemsize == itemsize
+    resolution = (values.max() - values.min()) / 65534
+    np.testing.assert_allclose(channel.to_float(), values, atol=resolution, rtol=0)
+
+
+def test_compact_channel_int16_falls_back_for_nan_and_constant():
+    with_nan = compact_channel(np.array([1.0, np.nan, 3.0]), "int16")
+    assert with_nan.values.dtype == np.float32
+    assert not with_nan.is_scaled
+
+    constant = compact_channel(np.full(5, 2.5), "int16")
+    np.testing.assert_array_equal(constant.to_float(), np.full(5, 2.5))
+
+
+def test_compact_channel_unknown_dtype():
+    with pytest.raises(ValueError):
+        compact_channel(np.zeros(3), "float16")
+
+
+def test_to_memmap(tmp_path):
+    data = pd.DataFrame(np.random.default_rng(0).normal(size=(1000, 3)), columns=["acc_x", "acc_y", "acc_z"])
+    mapped = to_memmap(data, tmp_path)
+
+    assert is_memory_mapped(mapped)
+    assert not is_memory_mapped(data)
+    pd.testing.assert_frame_equal(mapped, data)
+    assert to_memmap(mapped) is mapped
+    mixed = data.assign(activity="walking")
+    assert to_memmap(mixed) is mixed
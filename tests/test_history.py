@@ -0,0 +1,40 @@
+import pandas as pd
+
+from mad_gui.models.history import UndoHistory
+from mad_gui.models.journal import apply_operation
+
+
+def _annotations():
+    activities = pd.DataFrame(
+        {"identifier": [0, 1], "start": [100, 500], "end": [300, 900], "description": [("walking",), ("sitting",)]}
+    )
+    return {"IMU": {"Activity": activities, "events": pd.DataFrame()}}
+
+
+def _operation(op, before=None, after=None):
+    return {"plot": "IMU", "op": op, "label_class": "Activity", "kind": "region", "before": before, "after": after}
+
+
+def test_undo_redo_history():
+    annotations = _annotations()
+    history = UndoHistory(max_steps=2)
+    first = {"identifier": 0, "start": 100, "end": 300, "description": ("walking",)}
+    operations = [
+        _operation("move", before=first, after={**first, "end": 350}),
+        _operation("delete", before={**first, "end": 350}),
+        _operation("add", after={**first, "start": 1000, "end": 1100}),
+    ]
+    for operation in operations:
+        apply_operation(annotations, operation)
+        history.record(operation)
+
+    # only the last two steps can be undone
+    apply_operation(annotations, history.undo())
+    apply_operation(annotations, history.undo())
+    assert history.undo() is None
+    assert annotations["IMU"]["Activity"][["start", "end"]].values.tolist() == [[100, 350], [500, 900]]
+
+    apply_operation(annotations, history.redo())
+    assert annotations["IMU"]["Activity"][["start", "end"]].values.tolist() == [[500, 900]]
+    history.record(operations[2])
+    assert not history.can_redo
@@ -0,0 +1,34 @@
+import json
+
+from mad_gui.utils import instrumentation
+
+
+def test_spans_are_only_recorded_when_enabled(tmp_path):
+    @instrumentation.timed("work")
+    def work():
+        with instrumentation.span("inner", item=3):
+            pass
+
+    instrumentation.clear()
+    instrumentation.enable(False)
+    work()
+    assert instrumentation.summary() == {}
+
+    instrumentation.enable()
+    try:
+        work()
+        work()
+    finally:
+        instrumentation.enable(False)
+    summary = instrumentation.summary()
+    assert summary["work"]["count"] == 2
+    assert summary["inner"]["count"] == 2
+    assert summary["work"]["max_ms"] >= summary["work"]["mean_ms"] > 0
+
+    trace_file = tmp_path / "trace.json"
+    instrumentation.dump_trace(trace_file)
+    events = json.loads(trace_file.read_text())["traceEvents"]
+    assert [event["name"] for event in events] == ["inner", "work", "inner", "work"]
+    assert events[0]["args"] == {"item": "3"}
+    assert all(event["ph"] == "X" for event in events)
+    instrumentation.clear()
@@ -0,0 +1,58 @@
+import pandas as pd
+
+from mad_gui.models.journal import AnnotationJournal, apply_operation, invert_operation
+
+
+def _annotations():
+    activities = pd.DataFrame(
+        {"identifier": [0, 1], "start": [100, 500], "end": [300, 900], "description": [("walking",), ("sitting",)]}
+    )
+    return {"IMU": {"Activity": activities, "events": pd.DataFrame()}}
+
+
+def _operation(op, before=None, after=None, label_class="Activity", kind="region"):
+    return {"plot": "IMU", "op": op, "label_class": label_class, "kind": kind, "before": before, "after": after}
+
+
+def test_recover_after_crash(tmp_path):
+    data_file = tmp_path / "recording.csv"
+    journal = AnnotationJournal(tmp_path / "journal", compact_every=2)
+    journal.start(data_file, _annotations())
+    assert not journal.has_recovery(data_file)
+
+    first = {"identifier": 0, "start": 100, "end": 300, "description": ("walking",)}
+    journal.append(_operation("move", before=first, after={**first, "start": 120}))
+    journal.append(_operation("delete", before={"identifier": 1, "start": 500, "end": 900, "description": None}))
+    # this triggered compaction, the next operations only exist in the journal
+    event = {"pos": 700, "min_height": 0, "max_height": 1, "description": ["peak"]}
+    journal.append(_operation("add", after=event, label_class="events", kind="event"))
+    journal.append(
+        _operation("edit", before={**first, "start": 120}, after={**first, "start": 120, "description": ["running"]})
+    )
+    # simulate a crash, which leaves a partially written line behind
+    with open(journal.journal_path(data_file), "a", encoding="utf-8") as file:
+        file.write('{"seq": 5, "plot": "IM')
+
+    recovering = AnnotationJournal(tmp_path / "journal")
+    assert recovering.has_recovery(data_file)
+    recovered = recovering.recover(data_file)
+    activities = recovered["IMU"]["Activity"]
+    assert activities[["start", "end"]].values.tolist() == [[120, 300]]
+    assert activities["description"].iloc[0] == ("running",)
+    assert recovered["IMU"]["events"]["pos"].tolist() == [700]
+
+    recovering.start(data_file, recovered)
+    recovering.compact(saved=True)
+    assert not recovering.has_recovery(data_file)
+    recovering.discard()
+    assert not journal.snapshot_path(data_file).exists()
+
+
+def test_invert_operation():
+    annotations = _annotations()
+    after = {"identifier": 2, "start": 1000, "end": 1200, "description": ("standing",)}
+    add = _operation("add", after=after)
+    apply_operation(annotations, add)
+    assert len(annotations["IMU"]["Activity"]) == 3
+    apply_operation(annotations, invert_operation(add))
+    pd.testing.assert_frame_equal(annotations["IMU"]["Activity"], _annotations()["IMU"]["Activity"])
@@ -0,0 +1,103 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from mad_gui.models.label_index import LabelIndex, description_tokens
+
+
+def _index():
+    index = LabelIndex()
+    activities = pd.DataFrame(
+        {
+            "start": [500, 100, 900],
+            "end": [800, 300, 1000],
+            "description": [("Walking", "Fast"), ("Walking", "Slow"), ("Sitting",)],
+        }
+    )
+    index.set_annotations("Left Foot", "Activity", activities)
+    index.set_annotations("Right Foot", "Activity", activities.iloc[:1])
+    index.set_annotations("Left Foot", "events", pd.DataFrame({"pos": [700], "description": ["fall"]}))
+    return index
+
+
+def _operation(op, before=None, after=None):
+    return {
+        "plot": "Left Foot",
+        "op": op,
+        "label_class": "Activity",
+        "kind": "region",
+        "before": before,
+        "after": after,
+    }
+
+
+def test_description_tokens():
+    assert description_tokens(("Walk", ("Fast", "Up-hill"))) == ["walk", "fast", "up", "hill"]
+    assert description_tokens(None) == []
+    assert description_tokens(np.nan) == []
+
+
+def test_search_prefixes_and_filters():
+    index = _index()
+    assert len(index) == 5
+    # all words must match the beginning of a word, results are sorted by their start
+    assert [hit.start for hit in index.search("walk")] == [100, 500, 500]
+    assert [hit.start for hit in index.search("WAL fa")] == [500, 500]
+    assert index.search("alking") == []
+    assert index.search("walk fall") == []
+    # label class and plot are searched as well
+    assert [hit.start for hit in index.search("events")] == [700]
+    assert [hit.start for hit in index.search("right")] == [500]
+    assert [hit.plot for hit in index.search("fast", plots=["Right Foot"])] == ["Right Foot"]
+    assert index.search("fall", label_classes=["Activity"]) == []
+    assert len(index.search("", label_classes=["Activity"], plots=["Left Foot"])) == 3
+    assert index.label_classes == ["Activity", "events"]
+    assert index.plots == ["Left Foot", "Right Foot"]
+
+
+def test_apply_change():
+    index = _index()
+    slow = {"start": 100, "end": 300, "description": ("Walking", "Slow")}
+    index.apply_change(_operation("edit", before=slow, after={**slow, "description": ("Running",)}))
+    assert index.search("slow") == []
+    assert [hit.start for hit in index.search("run")] == [100]
+
+    index.apply_change(_operation("move", before={**slow, "description": ("Running",)}, after={**slow, "start": 50}))
+    assert [hit.start for hit in index.search("slow")] == [50]
+
+    index.apply_change(_operation("delete", before={**slow, "start": 50}))
+    index.apply_change(_operation("add", after={"start": 2000, "end": 2100, "description": None}))
+    assert [hit.start for hit in index.search("activity", plots=["Left Foot"])] == [500, 900, 2000]
+
+
+def test_set_annotations_replaces_group():
+    index = _index()
+    index.set_annotations("Left Foot", "Activity", pd.DataFrame({"start": [0], "end": [1], "description": ["Lying"]}))
+    assert [hit.plot for hit in index.search("walking")] == ["Right Foot"]
+    assert len(index.search("lying")) == 1
+    index.set_annotations("Left Foot", "Activity", pd.DataFrame())
+    assert index.search("lying") == []
+    assert index.label_classes == ["Activity", "events"]
+    assert len(index) == 2
+
+
+def test_search_many_labels_fast():
+    n_labels = 100_000
+    words = np.array(["walking", "running", "sitting", "standing", "cycling"])
+    activities = pd.DataFrame(
+        {
+            "start": np.arange(n_labels) * 10,
+            "end": np.arange(n_labels) * 10 + 5,
+            "description": list(zip(words[np.arange(n_labels) % 5], (np.arange(n_labels) % 1000).astype(str))),
+        }
+    )
+    index = LabelIndex()
+    index.set_annotations("IMU", "Activity", activities)
+
+    start = time.perf_counter()
+    hits = index.search("cyc 99")
+    elapsed = time.perf_counter() - start
+    # "99" is a prefix of 99 and 990 - 999, of which 99, 994, and 999 are cycling, each 100 times
+    assert len(hits) == 300
+    assert elapsed < 0.1
@@ -0,0 +1,72 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mad_gui.models.local import PlotData
+from mad_gui.models.paging import ArraySensorData, PageCache
+
+
+@pytest.fixture()
+def source():
+    values = np.random.default_rng(0).normal(size=(100_000, 2))
+    return ArraySensorData(values, ["acc_x", "acc_y"])
+
+
+def test_page_cache_reads_windows_across_pages(source):
+    cache = PageCache(source, page_samples=1000, max_pages=4)
+
+    window = cache.read(1500, 3200, ["acc_y"])
+    pd.testing.assert_frame_equal(window, source.read_window(1500, 3200, ["acc_y"]), check_index_type=False)
+    assert cache.stats.misses == 3
+
+    cache.read(2000, 2500)
+    assert cache.stats.hits == 1
+
+    cache.read(10_000, 13_000)
+    assert cache.stats.pages == 4
+    # the least recently used page was dropped
+    cache.read(1500, 1600)
+    assert cache.stats.misses == 7
+    cache.close()
+
+
+def test_page_cache_request_runs_in_background(source):
+    cache = PageCache(source, page_samples=1000)
+    loaded = []
+    done = threading.Event()
+
+    def callback(window):
+        loaded.append((threading.current_thread().name, window))
+        done.set()
+
+    cache.request(-50, 500, callback)
+    assert done.wait(5)
+    thread_name, window = loaded[0]
+    assert thread_name.startswith("mad_gui_pages")
+    assert window.index[0] == 0
+    assert len(window) == 500
+    cache.close()
+
+
+def test_overview_keeps_peaks_and_sample_positions(source):
+    source.values[54_321, 0] = 100
+    overview = source.overview(max_samples=1000, chunk_samples=30_000)
+
+    assert len(overview) <= 1000
+    assert list(overview.columns) == ["acc_x", "acc_y"]
+    assert overview["acc_x"].max() == 100
+    assert overview.index.is_monotonic_increasing
+    assert overview.index[-1] < source.n_samples
+
+
+def test_plot_data_from_paged_sensor_data(source):
+    plot_data = PlotData.from_dict({"sensor_data": source, "sampling_rate_hz": 100.0})
+
+    assert plot_data.source is source
+    assert len(plot_data.data) <= PlotData.OVERVIEW_SAMPLES
+    assert plot_data.time_axis[-1] < source.n_samples / 100.0
+    # saving the overview would replace the recording when loading the file again
+    with pytest.raises(ValueError):
+        plot_data.to_dict()
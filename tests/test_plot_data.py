@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mad_gui.models.local import PlotData
+
+
+def test_time_axis_is_shared_and_invalidated():
+    plot_data = PlotData(pd.DataFrame({"acc_x": np.zeros(500), "acc_y": np.ones(500)}), 100.0)
+
+    time_axis = plot_data.time_axis
+    assert time_axis is plot_data.time_axis
+    assert not time_axis.flags.writeable
+    np.testing.assert_allclose(time_axis, np.arange(500) / 100)
+
+    plot_data.sampling_rate_hz = 50.0
+    assert plot_data.time_axis[-1] == pytest.approx(499 / 50)
+    plot_data.data = plot_data.data.iloc[100:]
+    assert plot_data.time_axis[0] == pytest.approx(2.0)
+    assert len(plot_data.time_axis) == 400
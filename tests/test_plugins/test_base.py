@@ -2,6 +2,7 @@ from pathlib import Path
 
 import pytest
 
+from mad_gui.components.dialogs import UserInformation
 from mad_gui.plugins.base import BaseImporter
 from mad_gui.plugins.example import ExampleImporter
 
@@ -28,3 +29,11 @@ class TestBaseImporter:
         plot_data = importer.load_sensor_data(EXAMPLE_DATA_PATH / "sensor_data.csv")
         print("Data imported.")
         assert len(plot_data["Pocket IMU"]["sensor_data"]) == 5526
+
+    def test_malformed_sync_sidecar(self, tmp_path, monkeypatch):
+        messages = []
+        monkeypatch.setattr(UserInformation, "inform", messages.append)
+        (tmp_path / "my_sync.json").write_text('{"sync": {"start": ')
+
+        assert BaseImporter.get_video_signal_synchronization(str(tmp_path / "my_sync.xlsx")) is None
+        assert messages == ["Format of the sync file is unknown."]
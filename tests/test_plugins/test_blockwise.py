@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+from mad_gui.models.local import AnnotationData, PlotData
+from mad_gui.models.paging import ArraySensorData
+from mad_gui.models.streaming import RawStream
+from mad_gui.plugins import BaseStreamingAlgorithm
+from mad_gui.plugins.blockwise import attached, iter_blocks, run_blockwise
+from mad_gui.plugins.caching import AlgorithmCache
+
+
+class AboveThreshold(BaseStreamingAlgorithm):
+    """Find phases where acc_x is above 0.5, which may span several blocks."""
+
+    block_samples = 70
+
+    @classmethod
+    def name(cls):
+        return "Above threshold"
+
+    def initial_state(self, sensor, sampling_rate_hz):
+        return {"start": None, "blocks": 0}
+
+    def process_block(self, sensor, block, state):
+        state["blocks"] += 1
+        starts, ends = [], []
+        for sample, value in block["acc_x"].items():
+            if value > 0.5 and state["start"] is None:
+                state["start"] = sample
+            elif value <= 0.5 and state["start"] is not None:
+                starts.append(state["start"])
+                ends.append(sample)
+                state["start"] = None
+        return {"Activity": pd.DataFrame({"start": starts, "end": ends, "description": "above"})}
+
+
+def _signal(n_samples=1000):
+    return np.sin(np.arange(n_samples) / 20)
+
+
+def _expected_phases(values):
+    above = np.r_[False, values > 0.5, False].astype(int)
+    changes = np.diff(above)
+    starts, ends = np.flatnonzero(changes == 1), np.flatnonzero(changes == -1)
+    # a phase that is still going on at the end is not complete yet
+    return starts[ends < len(values)], ends[ends < len(values)]
+
+
+def test_run_blockwise_matches_processing_at_once():
+    values = _signal()
+    plot_data = {"IMU": PlotData(pd.DataFrame({"acc_x": values}), 100.0, {"Activity": AnnotationData()})}
+    progress = []
+
+    states = run_blockwise(AboveThreshold(), plot_data, on_annotations=lambda sensor, new: progress.append(sensor))
+
+    labels = plot_data["IMU"].annotations["Activity"].data
+    starts, ends = _expected_phases(values)
+    np.testing.assert_array_equal(labels["start"], starts)
+    np.testing.assert_array_equal(labels["end"], ends)
+    assert states["IMU"]["blocks"] == 15
+    assert progress and set(progress) == {"IMU"}
+
+
+def test_process_data_reads_paged_source_in_blocks():
+    values = _signal(5000)
+    source = ArraySensorData(values[:, None], ["acc_x"])
+    plot_data = {"IMU": PlotData.from_dict({"sensor_data": source, "sampling_rate_hz": 100.0})}
+    assert sum(len(block) for block in iter_blocks(plot_data["IMU"], 700)) == 5000
+
+    AboveThreshold().process_data(plot_data)
+
+    starts, _ = _expected_phases(values)
+    np.testing.assert_array_equal(plot_data["IMU"].annotations["Activity"].data["start"], starts)
+
+
+def test_process_data_attaches_to_stream(tmp_path):
+    file = tmp_path / "stream.bin"
+    file.write_bytes(b"")
+    stream = RawStream.from_file(file, ["acc_x"], 100.0, follow=False)
+    plot_data = {"IMU": PlotData.from_dict({"sensor_data": stream, "sampling_rate_hz": 100.0})}
+
+    AboveThreshold().process_data(plot_data)
+    AboveThreshold().process_data(plot_data)
+
+    ((algorithm, sensor, state),) = attached(stream)
+    assert isinstance(algorithm, AboveThreshold)
+    assert sensor == "IMU"
+    # the buffered samples were processed, further blocks continue with this state
+    assert state["start"] is None
+    stream.close()
+
+
+def test_algorithm_cache_does_not_skip_attaching_to_stream(tmp_path):
+    file = tmp_path / "stream.bin"
+    file.write_bytes(b"")
+    stream = RawStream.from_file(file, ["acc_x"], 100.0, follow=False)
+    plot_data = {"IMU": PlotData.from_dict({"sensor_data": stream, "sampling_rate_hz": 100.0})}
+    cache = AlgorithmCache()
+
+    assert not cache.process_data(AboveThreshold(), plot_data)
+    first = attached(stream)[0][0]
+    assert not cache.process_data(AboveThreshold(), plot_data)
+
+    ((algorithm, _, _),) = attached(stream)
+    assert algorithm is not first
+    assert cache.stats.entries == 0
+    stream.close()
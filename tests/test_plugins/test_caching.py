@@ -0,0 +1,139 @@
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from mad_gui.plugins.caching import AlgorithmCache, ImporterCache
+
+
+class CountingImporter:
+    """Mimics the interface of a `BaseImporter` and counts how often the file is actually parsed."""
+
+    version = 1
+    cacheable = True
+    calls = 0
+
+    def load_sensor_data(self, file):
+        CountingImporter.calls += 1
+        data = pd.read_csv(file)
+        return {"IMU": {"sensor_data": data, "sampling_rate_hz": 100.0, "events": [("start", 2)]}}
+
+
+def _write_recording(path, n_samples=100):
+    pd.DataFrame({"acc_x": np.arange(n_samples, dtype=float), "acc_y": np.ones(n_samples)}).to_csv(path, index=False)
+
+
+def test_cache_hit_and_invalidation(tmp_path):
+    recording = tmp_path / "recording.csv"
+    _write_recording(recording)
+    cache = ImporterCache(tmp_path / "cache")
+    CountingImporter.calls = 0
+
+    first = cache.load_sensor_data(CountingImporter(), recording)
+    second = cache.load_sensor_data(CountingImporter(), recording)
+    assert CountingImporter.calls == 1
+    pd.testing.assert_frame_equal(first["IMU"]["sensor_data"], second["IMU"]["sensor_data"])
+    assert second["IMU"]["sampling_rate_hz"] == 100.0
+    assert second["IMU"]["events"] == [("start", 2)]
+
+    # modifying the file must invalidate the entry
+    _write_recording(recording, n_samples=50)
+    stat = recording.stat()
+    os.utime(recording, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    third = cache.load_sensor_data(CountingImporter(), recording)
+    assert CountingImporter.calls == 2
+    assert len(third["IMU"]["sensor_data"]) == 50
+
+    # so does a new version of the importer
+    CountingImporter.version = 2
+    cache.load_sensor_data(CountingImporter(), recording)
+    assert CountingImporter.calls == 3
+    CountingImporter.version = 1
+
+    cache.clear()
+    assert cache.size_bytes() == 0
+
+
+def test_eviction_of_least_recently_used(tmp_path):
+    recordings = []
+    for i in range(3):
+        recordings.append(tmp_path / f"recording_{i}.csv")
+        _write_recording(recordings[-1], n_samples=10000)
+    cache = ImporterCache(tmp_path / "cache", max_size_mb=1000)
+    for recording in recordings:
+        cache.load_sensor_data(CountingImporter(), recording)
+    entry_size = cache.size_bytes() / 3
+
+    cache.max_size_bytes = entry_size * 2.5
+    # use the first recording again, such that the second one is the least recently used
+    entries = sorted(cache._entries(), key=lambda entry: entry.stat().st_mtime)
+    for age, entry in enumerate(entries):
+        os.utime(entry, (age, age))
+    cache.load_sensor_data(CountingImporter(), recordings[0])
+    cache.evict()
+
+    CountingImporter.calls = 0
+    cache.load_sensor_data(CountingImporter(), recordings[0])
+    cache.load_sensor_data(CountingImporter(), recordings[2])
+    assert CountingImporter.calls == 0
+    cache.load_sensor_data(CountingImporter(), recordings[1])
+    assert CountingImporter.calls == 1
+
+
+class CountingDetector:
+    """Mimics a `BaseAlgorithm`, which adds one label per plot."""
+
+    version = 1
+    cacheable = True
+    calls = 0
+
+    def process_data(self, plot_data):
+        CountingDetector.calls += 1
+        for plot in plot_data.values():
+            plot.annotations["Activity"].data = pd.DataFrame({"start": [0], "end": [int(plot.data["acc_x"].sum())]})
+
+
+def _plot_data(n_samples=100):
+    data = pd.DataFrame({"acc_x": np.ones(n_samples)})
+    annotations = {"Activity": SimpleNamespace(data=pd.DataFrame())}
+    return {"IMU": SimpleNamespace(data=data, sampling_rate_hz=100.0, annotations=annotations)}
+
+
+def test_algorithm_cache():
+    cache = AlgorithmCache(max_entries=2)
+    CountingDetector.calls = 0
+
+    assert not cache.process_data(CountingDetector(), _plot_data())
+    plot_data = _plot_data()
+    assert cache.process_data(CountingDetector(), plot_data)
+    assert CountingDetector.calls == 1
+    assert plot_data["IMU"].annotations["Activity"].data["end"].tolist() == [100]
+    # modifying the restored result must not modify the cache
+    plot_data["IMU"].annotations["Activity"].data.loc[0, "end"] = 5
+    assert cache.process_data(CountingDetector(), _plot_data())
+    assert cache.stats.hits == 2
+
+    # changed data, annotations, parameters or version are not taken from the cache
+    assert not cache.process_data(CountingDetector(), _plot_data(n_samples=50))
+    assert not cache.process_data(CountingDetector(), plot_data)
+    assert not cache.process_data(CountingDetector(), _plot_data(), parameters={"threshold": 2})
+    CountingDetector.version = 2
+    assert not cache.process_data(CountingDetector(), _plot_data())
+    CountingDetector.version = 1
+    assert CountingDetector.calls == 5
+
+    assert cache.stats.entries == 2
+    assert cache.stats.evictions == 3
+
+
+def test_algorithm_cache_runs_algorithms_that_are_not_cacheable():
+    class ShowsResults(CountingDetector):
+        cacheable = False
+
+    cache = AlgorithmCache()
+    CountingDetector.calls = 0
+    assert not cache.process_data(ShowsResults(), _plot_data())
+    assert not cache.process_data(ShowsResults(), _plot_data())
+    assert CountingDetector.calls == 2
+    assert cache.stats.entries == 0
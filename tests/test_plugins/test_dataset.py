@@ -0,0 +1,49 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mad_gui.plugins.dataset import METADATA_FILE_NAME, RecordBatch, write_dataset
+
+
+def _batches():
+    sensor_data = pd.DataFrame({"acc_x": np.arange(10, dtype=float), "acc_y": np.ones(10)})
+    activities = pd.DataFrame(
+        {"identifier": [0, 1], "start": [1, 5], "end": [4, 9], "description": [("Walk", "Slow"), "Jump"]}
+    )
+    yield RecordBatch("sensor_data", "Pocket IMU", sensor_data)
+    yield RecordBatch("Activity", "Pocket IMU", activities)
+    yield RecordBatch("Activity", "Left Foot", activities.iloc[:1])
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_partitioned_dataset(tmp_path, file_format):
+    dataset = pytest.importorskip("pyarrow.dataset")
+    files = write_dataset(_batches(), tmp_path, file_format, metadata={"executed_algorithms": ["Detector"]})
+    assert len(files) == 3
+
+    pyarrow_format = "feather" if file_format == "arrow" else file_format
+    activities = dataset.dataset(tmp_path / "table=Activity", format=pyarrow_format, partitioning="hive").to_table()
+    activities = activities.to_pandas()
+    assert sorted(activities["plot"].astype(str).unique()) == ["Left Foot", "Pocket IMU"]
+    assert "('Walk', 'Slow')" in activities["description"].tolist()
+    schema_metadata = dataset.dataset(files[0], format=pyarrow_format).schema.metadata
+    assert json.loads(schema_metadata[b"mad_gui"]) == {"executed_algorithms": ["Detector"]}
+
+    metadata = json.loads((tmp_path / METADATA_FILE_NAME).read_text())
+    assert metadata["metadata"] == {"executed_algorithms": ["Detector"]}
+    assert [entry["rows"] for entry in metadata["files"]] == [10, 2, 1]
+
+
+def test_flat_csv(tmp_path):
+    files = write_dataset(_batches(), tmp_path, "csv", partitioned=False)
+    assert [file.name for file in files] == [
+        "Pocket_IMU_sensor_data.csv",
+        "Pocket_IMU_Activity.csv",
+        "Left_Foot_Activity.csv",
+    ]
+    pd.testing.assert_frame_equal(pd.read_csv(files[0]), next(_batches()).data)
+
+    with pytest.raises(ValueError):
+        write_dataset(_batches(), tmp_path, "xlsx")
@@ -0,0 +1,50 @@
+import sys
+
+import pytest
+
+from mad_gui.plugins.base import BaseAlgorithm, BaseExporter, BaseImporter
+from mad_gui.plugins.discovery import PluginDescriptor
+from mad_gui.plugins.helper import filter_plugins
+from mad_gui.start_gui import DEFAULT_PLUGINS
+
+
+def test_default_plugins_match_their_classes():
+    for descriptor in DEFAULT_PLUGINS:
+        plugin_class = PluginDescriptor(descriptor.target, descriptor.name(), descriptor.kind).load()
+        assert descriptor.name() == plugin_class.name()
+        assert issubclass(plugin_class, descriptor.base_class)
+        if descriptor.kind == "importer":
+            assert descriptor.file_type == plugin_class.file_type
+
+
+def test_plugin_is_imported_when_used(tmp_path, monkeypatch):
+    (tmp_path / "lazy_plugin.py").write_text(
+        "from mad_gui.plugins.base import BaseAlgorithm\n\n"
+        "class LazyAlgorithm(BaseAlgorithm):\n"
+        "    @classmethod\n"
+        "    def name(cls):\n"
+        "        return 'Lazy'\n\n"
+        "    def process_data(self, data):\n"
+        "        pass\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    descriptor = PluginDescriptor("lazy_plugin:LazyAlgorithm", "Lazy", "algorithm")
+
+    assert filter_plugins([descriptor], BaseAlgorithm) == [descriptor]
+    assert filter_plugins([descriptor], BaseImporter) == []
+    assert descriptor.name() == "Lazy"
+    assert "lazy_plugin" not in sys.modules
+
+    plugin = descriptor(parent=None)
+    assert descriptor.is_loaded
+    assert type(plugin).__name__ == "LazyAlgorithm"
+    assert descriptor.__name__ == "LazyAlgorithm"
+
+
+def test_wrong_kind():
+    descriptor = PluginDescriptor("mad_gui.plugins.example:ExampleImporter", "Example Importer", "exporter")
+    assert filter_plugins([descriptor], BaseExporter) == [descriptor]
+    with pytest.raises(TypeError):
+        descriptor.load()
+    with pytest.raises(ValueError):
+        PluginDescriptor("mad_gui.plugins.example.ExampleImporter", "Example Importer", "importer")
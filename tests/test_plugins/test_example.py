@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mad_gui.models import GlobalData
+from mad_gui.models.local import AnnotationData, PlotData
+from mad_gui.plugins.example import ExampleExporter, StationaryMomentsDetector
+from tests.stationary_moments_reference import reference_binary_to_df, reference_standing_windows
+
+
+def _synthetic_acc(n_samples: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    # alternate between moving and resting phases of random length
+    amplitude = np.repeat(rng.choice([0.01, 2.0], size=n_samples // 50 + 1), 50)[:n_samples]
+    amplitude[: rng.integers(0, 300)] = 0.01
+    noise = rng.normal(size=(n_samples, 3)) * amplitude[:, np.newaxis]
+    return pd.DataFrame(noise, columns=["acc_x", "acc_y", "acc_z"])
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("window_length", [1, 10, 102])
+def test_stationary_moments_match_reference(seed, window_length):
+    data = _synthetic_acc(5000, seed)
+    standing = StationaryMomentsDetector._get_standing_windows(data, window_length)
+    expected_standing = reference_standing_windows(data, window_length)
+    np.testing.assert_array_equal(standing, expected_standing)
+
+    annotations = StationaryMomentsDetector._binary_to_df(standing)
+    expected = reference_binary_to_df(expected_standing)
+    np.testing.assert_array_equal(annotations[["start", "end"]].to_numpy(), expected.to_numpy())
+
+
+def test_stationary_moments_with_shifted_index():
+    data = _synthetic_acc(2000, 0)
+    shifted = data.set_axis(data.index + 1000)
+    standing = StationaryMomentsDetector._get_standing_windows(shifted, 102)
+    np.testing.assert_array_equal(standing, reference_standing_windows(data, 102))
+    pd.testing.assert_frame_equal(
+        StationaryMomentsDetector().get_annotations(shifted), StationaryMomentsDetector().get_annotations(data)
+    )
+
+
+@pytest.mark.parametrize(
+    "flags, expected",
+    [
+        ([0, 1, 1, 0, 0, 1, 0], [[1, 3], [5, 6]]),
+        ([1, 1, 0, 1, 0], [[3, 4]]),
+        ([0, 1, 1, 0, 1, 1], [[1, 3]]),
+        ([1, 1, 1], []),
+        ([], []),
+    ],
+)
+def test_binary_to_df_edges(flags, expected):
+    array = np.array([flags], dtype=float)
+    annotations = StationaryMomentsDetector._binary_to_df(array)
+    assert annotations[["start", "end"]].values.tolist() == expected
+    assert reference_binary_to_df(array).values.tolist() == expected
+
+
+def test_exporter_keeps_index(tmp_path):
+    plot_data = PlotData.from_dict({"sensor_data": _synthetic_acc(100, 0), "sampling_rate_hz": 10})
+    activities = pd.DataFrame({"start": [10, 50], "end": [40, 90], "description": ["Walk", "Jump"]}, index=[3, 7])
+    plot_data.annotations["Activity"] = AnnotationData()
+    plot_data.annotations["Activity"].data = activities
+    global_data = GlobalData()
+    global_data.plot_data = {"Pocket IMU": plot_data}
+
+    ExampleExporter().export_to_directory(global_data, str(tmp_path))
+
+    exported = pd.read_csv(tmp_path / "Pocket_IMU_Activity.csv", index_col=0)
+    pd.testing.assert_frame_equal(exported, activities.rename_axis("index"))
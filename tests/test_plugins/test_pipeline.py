@@ -0,0 +1,86 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mad_gui.models.local import AnnotationData, PlotData
+from mad_gui.plugins.caching import AlgorithmCache
+from mad_gui.plugins.pipeline import resolve_dependencies, run_pipeline
+
+
+class Detector:
+    depends_on = ()
+    cacheable = True
+    threads = set()
+
+    def __init__(self, parent=None):
+        self.parent = parent
+
+    def process_data(self, plot_data):
+        Detector.threads.add(threading.current_thread().name)
+        for plot in plot_data.values():
+            plot.annotations["Activity"].data = pd.DataFrame({"start": [0], "end": [len(plot.data)]})
+
+
+class PeakDetector(Detector):
+    def process_data(self, plot_data):
+        Detector.threads.add(threading.current_thread().name)
+        for plot in plot_data.values():
+            plot.annotations["Peak"].data = pd.DataFrame({"pos": [int(plot.data["acc_x"].argmax())]})
+
+
+class Describer(Detector):
+    depends_on = (Detector, PeakDetector)
+
+    def process_data(self, plot_data):
+        for plot in plot_data.values():
+            activities = plot.annotations["Activity"].data
+            activities["description"] = f"{len(plot.annotations['Peak'].data)} peaks"
+
+
+def _plot_data():
+    annotations = {"Activity": AnnotationData(), "Peak": AnnotationData()}
+    return {"IMU": PlotData(pd.DataFrame({"acc_x": np.sin(np.arange(100))}), 100.0, annotations)}
+
+
+def test_resolve_dependencies():
+    assert resolve_dependencies([Describer]) == [[Detector, PeakDetector], [Describer]]
+    assert resolve_dependencies([Describer], executed=[Detector]) == [[PeakDetector], [Describer]]
+    # explicitly requested algorithms run even if they were executed before
+    assert resolve_dependencies([Detector, Describer], executed=[Detector, PeakDetector]) == [[Detector], [Describer]]
+
+    class Cyclic(Detector):
+        pass
+
+    Cyclic.depends_on = (Describer, Cyclic)
+    with pytest.raises(ValueError):
+        resolve_dependencies([Cyclic])
+
+
+def test_run_pipeline():
+    Detector.threads = set()
+    plot_data = _plot_data()
+    cache = AlgorithmCache()
+    steps = run_pipeline([Describer], plot_data, cache=cache, max_workers=2)
+
+    assert [step.algorithm for step in steps] == [Detector, PeakDetector, Describer]
+    assert all(name.startswith("mad_gui_pipeline") for name in Detector.threads)
+    activities = plot_data["IMU"].annotations["Activity"].data
+    assert activities["end"].tolist() == [100]
+    assert activities["description"].tolist() == ["1 peaks"]
+    assert len(plot_data["IMU"].annotations["Peak"].data) == 1
+
+    # intermediate results are cached
+    steps = run_pipeline([Describer], _plot_data(), cache=cache)
+    assert [step.cached for step in steps] == [True, True, True]
+
+
+def test_run_pipeline_in_calling_thread_by_default():
+    Detector.threads = set()
+    plot_data = _plot_data()
+    run_pipeline([Describer], plot_data)
+
+    # algorithms may create dialogs, which is only possible in the GUI thread
+    assert Detector.threads == {threading.current_thread().name}
+    assert plot_data["IMU"].annotations["Activity"].data["description"].tolist() == ["1 peaks"]
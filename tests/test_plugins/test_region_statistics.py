@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mad_gui.plugins.region_statistics import STATISTICS, region_statistics
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(rng.normal(loc=1000, size=(2000, 2)), columns=["acc_x", "acc_y"])
+
+
+def test_matches_per_region_computation(data):
+    rng = np.random.default_rng(1)
+    starts = rng.integers(0, 1900, size=200)
+    ends = starts + rng.integers(1, 300, size=200)
+    result = region_statistics(data, starts, ends, sampling_rate_hz=100)
+
+    for i_region, (start, end) in enumerate(zip(starts, ends)):
+        region = data.iloc[start:end]
+        for channel in data.columns:
+            expected = {
+                "mean": region[channel].mean(),
+                "rms": np.sqrt((region[channel] ** 2).mean()),
+                "energy": (region[channel] ** 2).sum(),
+                "min": region[channel].min(),
+                "max": region[channel].max(),
+                "var": region[channel].var(ddof=0),
+            }
+            for statistic, value in expected.items():
+                assert result[f"{channel}_{statistic}"].iloc[i_region] == pytest.approx(value, rel=1e-9, abs=1e-9)
+        assert result["duration_s"].iloc[i_region] == pytest.approx(len(region) / 100)
+
+
+def test_invalid_regions(data):
+    result = region_statistics(data.to_numpy(), [10, 20, np.nan, 1990], [10, 10, 50, 2500], statistics=STATISTICS)
+    assert result.iloc[:3].isna().all().all()
+    assert result["duration"].iloc[3] == 10
+    assert result["0_max"].iloc[3] == data["acc_x"].iloc[1990:].max()
@@ -0,0 +1,80 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mad_gui.models.local import AnnotationData, PlotData
+from mad_gui.plugins.sandbox import IsolatedPlugin, PluginExecutionError, run_isolated
+
+
+class LargeImporter:
+    def __init__(self, parent=None):
+        self.parent = parent
+
+    @classmethod
+    def name(cls):
+        return "Large importer"
+
+    def load_sensor_data(self, file):
+        data = pd.DataFrame(np.arange(3 * 10**6, dtype=float).reshape(-1, 3), columns=["acc_x", "acc_y", "acc_z"])
+        return {"IMU": {"sensor_data": data, "sampling_rate_hz": 100.0, "file": file}}
+
+
+class ThresholdDetector(LargeImporter):
+    def process_data(self, plot_data):
+        for plot in plot_data.values():
+            above = np.flatnonzero(plot.data["acc_x"].to_numpy() > 0.5)
+            plot.annotations["Activity"].data = pd.DataFrame({"start": above[:1], "end": above[-1:]})
+
+
+class BrokenAlgorithm(LargeImporter):
+    def process_data(self, plot_data):
+        raise ValueError("Something is wrong with this algorithm")
+
+
+class HangingImporter(LargeImporter):
+    def load_sensor_data(self, file):
+        time.sleep(60)
+
+
+def test_transfer_of_results():
+    report = run_isolated(LargeImporter, "load_sensor_data", "recording.csv")
+    assert report.status == "ok", report.error
+    data = report.value["IMU"]
+    assert data["file"] == "recording.csv"
+    assert data["sensor_data"].shape == (10**6, 3)
+    assert data["sensor_data"]["acc_z"].iloc[-1] == 3 * 10**6 - 1
+
+    plot_data = {"IMU": PlotData(pd.DataFrame({"acc_x": [0, 1, 1, 0.0]}), 100.0, {"Activity": AnnotationData()})}
+    algorithm = IsolatedPlugin(ThresholdDetector())
+    algorithm.process_data(plot_data)
+    assert plot_data["IMU"].annotations["Activity"].data[["start", "end"]].values.tolist() == [[1, 2]]
+    assert algorithm.last_report.duration_s > 0
+
+
+def test_failures_are_reported():
+    plot_data = {"IMU": PlotData(pd.DataFrame({"acc_x": [0.0]}), 100.0, {"Activity": AnnotationData()})}
+    with pytest.raises(PluginExecutionError) as error:
+        IsolatedPlugin(BrokenAlgorithm()).process_data(plot_data)
+    assert error.value.report.status == "error"
+    assert "Something is wrong with this algorithm" in str(error.value)
+
+    report = run_isolated(HangingImporter, "load_sensor_data", "recording.csv", timeout_s=2)
+    assert report.status == "timeout"
+    assert report.duration_s < 10
+
+
+def test_busy_while_running_in_worker():
+    busy = []
+    polled_while = set()
+    plot_data = {"IMU": PlotData(pd.DataFrame({"acc_x": [0.0]}), 100.0, {"Activity": AnnotationData()})}
+    algorithm = IsolatedPlugin(
+        BrokenAlgorithm(), busy_callback=busy.append, poll_callback=lambda: polled_while.add(busy[-1])
+    )
+    with pytest.raises(PluginExecutionError):
+        algorithm.process_data(plot_data)
+
+    # user input processed while polling must not start another run, so the GUI is disabled meanwhile
+    assert busy == [True, False]
+    assert polled_while <= {True}
@@ -0,0 +1,18 @@
+import os
+
+from mad_gui import qt_designer
+
+
+def test_precompiled_ui_is_used_only_if_up_to_date(tmp_path, monkeypatch):
+    monkeypatch.setattr(qt_designer, "UI_PATH", tmp_path)
+    monkeypatch.setattr(qt_designer, "BUILD_PATH", tmp_path / "build")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "main.ui").write_text("<ui/>")
+    assert not qt_designer._is_precompiled("main")
+
+    (tmp_path / "build" / "main.py").write_text("class Ui_MainWindow: pass")
+    assert qt_designer._is_precompiled("main")
+
+    # changing the .ui file after compiling it makes the generated class outdated
+    os.utime(tmp_path / "main.ui", (0, os.path.getmtime(tmp_path / "build" / "main.py") + 10))
+    assert not qt_designer._is_precompiled("main")
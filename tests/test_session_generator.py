@@ -0,0 +1,24 @@
+from benchmarks.session_generator import generate_session
+from mad_gui.models.local import PlotData
+
+
+def test_generate_session():
+    session = generate_session(n_sensors=2, n_channels=8, duration_s=60, sampling_rate_hz=50, labels_per_minute=20)
+    assert list(session) == ["Sensor 0", "Sensor 1"]
+
+    sensor = session["Sensor 0"]
+    assert sensor["sensor_data"].shape == (3000, 8)
+    assert list(sensor["sensor_data"].columns[:3]) == ["acc_x", "acc_y", "acc_z"]
+    labels = sensor["annotations"]["Activity"]
+    assert len(labels) == 20
+    # labels do not overlap
+    assert (labels["start"].to_numpy()[1:] > labels["end"].to_numpy()[:-1]).all()
+    assert (labels["start"] < labels["end"]).all()
+
+    plot_data = PlotData.from_dict(sensor)
+    assert set(plot_data.annotations) == {"Activity", "Peak", "events"}
+
+    # the same seed creates the same session
+    assert generate_session(duration_s=10)["Sensor 0"]["sensor_data"].equals(
+        generate_session(duration_s=10)["Sensor 0"]["sensor_data"]
+    )
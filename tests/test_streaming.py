@@ -0,0 +1,60 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.stream_producer import StreamProducer
+from mad_gui.models.local import PlotData
+from mad_gui.models.streaming import RawStream, RingBuffer, StreamReceiver
+
+
+def test_ring_buffer_keeps_most_recent_samples():
+    buffer = RingBuffer(capacity=10, channels=["a", "b"], sampling_rate_hz=2.0)
+    for start in range(0, 24, 3):
+        buffer.append(np.arange(start, start + 3)[:, None] * [1, -1])
+
+    assert buffer.total_samples == 24
+    assert len(buffer) == 10
+    np.testing.assert_array_equal(buffer.values("a"), np.arange(14, 24))
+    np.testing.assert_array_equal(buffer.values("b"), -np.arange(14, 24))
+    np.testing.assert_array_equal(buffer.times(), np.arange(14, 24) / 2.0)
+    frame = buffer.to_frame()
+    assert list(frame.index) == list(range(14, 24))
+    assert np.shares_memory(frame.to_numpy(), buffer.values("a"))
+
+    buffer.append(pd.DataFrame({"b": -np.arange(24, 40), "a": np.arange(24, 40)}))
+    assert buffer.first_sample == 30
+    np.testing.assert_array_equal(buffer.values("a"), np.arange(30, 40))
+
+
+def test_raw_stream_from_appended_file(tmp_path):
+    file = tmp_path / "recording.bin"
+    file.write_bytes(np.arange(6, dtype="<f8").tobytes()[:-4])
+    stream = RawStream.from_file(file, ["a", "b"], 100.0, follow=False)
+    blocks = list(stream.blocks())
+    stream.close()
+    # the incomplete sample at the end is not returned
+    np.testing.assert_array_equal(np.concatenate(blocks), [[0, 1], [2, 3]])
+
+
+def test_receive_synthetic_stream():
+    producer = StreamProducer(n_channels=3, sampling_rate_hz=1000, block_samples=50, speed=10).start()
+    stream = RawStream.from_socket("localhost", producer.port, producer.channels, producer.sampling_rate_hz)
+    plot_data = PlotData.from_dict({"sensor_data": stream, "sampling_rate_hz": 1000.0})
+    assert plot_data.stream is stream
+    assert list(plot_data.data.columns) == ["acc_x", "acc_y", "acc_z"]
+
+    receiver = StreamReceiver(stream)
+    buffer = RingBuffer(capacity=2000, channels=stream.channels, sampling_rate_hz=stream.sampling_rate_hz)
+    deadline = time.perf_counter() + 10
+    while buffer.total_samples < 3000 and time.perf_counter() < deadline:
+        receiver.collect_into(buffer)
+        time.sleep(0.01)
+    receiver.close()
+    producer.stop()
+
+    assert buffer.total_samples >= 3000
+    assert len(buffer) == 2000
+    # the producer sends sine waves, which are continuous across blocks
+    assert np.abs(np.diff(buffer.values("acc_x"))).max() < 0.5
+    assert receiver.error is None or isinstance(receiver.error, (OSError, ValueError))
@@ -0,0 +1,67 @@
+import os
+
+import pandas as pd
+import pytest
+
+from mad_gui.utils import sync_file
+from mad_gui.utils.sync_file import read_sync, sync_sidecar_path, write_sync
+
+
+@pytest.fixture
+def sync():
+    return pd.DataFrame(
+        data=[[102.0, 2000.0], [5000.0, 51000.0]], index=["start", "end"], columns=["Pocket IMU_sample", "video_ms"]
+    )
+
+
+def test_round_trip_prefers_sidecar(tmp_path, sync, monkeypatch):
+    file_name = tmp_path / "my_sync.xlsx"
+    write_sync(sync, file_name)
+    assert sync_sidecar_path(file_name).exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The Excel file should not be parsed if the sidecar is up to date.")
+
+    monkeypatch.setattr(pd, "read_excel", fail)
+    loaded = read_sync(file_name)
+    pd.testing.assert_frame_equal(loaded, sync)
+    assert loaded.loc["start", "video_ms"] == 2000
+
+
+def test_excel_fallback_is_cached(tmp_path, sync, monkeypatch):
+    pytest.importorskip("openpyxl")
+    file_name = tmp_path / "my_sync.xlsx"
+    sync.to_excel(file_name)
+    sync_file.clear_sync_cache()
+
+    calls = []
+    read_excel = pd.read_excel
+
+    def counting_read_excel(*args, **kwargs):
+        calls.append(args)
+        return read_excel(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_excel", counting_read_excel)
+    first = read_sync(file_name)
+    second = read_sync(file_name)
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+    # modifying the file invalidates the cache
+    sync.loc["end", "video_ms"] = 52000.0
+    sync.to_excel(file_name)
+    os.utime(file_name, ns=(0, os.stat(file_name).st_mtime_ns + 10**9))
+    assert read_sync(file_name).loc["end", "video_ms"] == 52000
+    assert len(calls) == 2
+
+
+def test_outdated_sidecar_is_ignored(tmp_path, sync):
+    pytest.importorskip("openpyxl")
+    file_name = tmp_path / "my_sync.xlsx"
+    write_sync(sync, file_name)
+    # the user edited the Excel file after the GUI saved it
+    sync.loc["start", "video_ms"] = 1000.0
+    sync.to_excel(file_name)
+    sidecar = sync_sidecar_path(file_name)
+    os.utime(sidecar, ns=(0, os.stat(file_name).st_mtime_ns - 10**9))
+    assert read_sync(file_name).loc["start", "video_ms"] == 1000
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from mad_gui.utils.telemetry import TelemetryLogger, read_log
+
+
+@pytest.mark.parametrize("suffix", [".bin", ".parquet"])
+def test_log_round_trip(tmp_path, suffix):
+    if suffix == ".parquet":
+        pytest.importorskip("pyarrow")
+    file = tmp_path / f"telemetry{suffix}"
+    # several small buffers, such that most records are written by the background thread
+    logger = TelemetryLogger(file, capacity=16, n_buffers=8, flush_interval_s=0.05)
+    for i in range(100):
+        logger.log("mode", "add" if i % 2 else "investigate")
+    logger.log_annotation_change(
+        {
+            "plot": "IMU",
+            "op": "move",
+            "label_class": "Activity",
+            "kind": "region",
+            "before": None,
+            "after": {"start": 3, "end": 7},
+        }
+    )
+    with logger.measure("plot_data"):
+        pass
+    logger.close()
+
+    log = read_log(file)
+    assert logger.dropped == 0
+    assert len(log) == 102
+    assert set(log["kind"]) == {"mode", "annotation", "latency"}
+    annotation = log[log["kind"] == "annotation"].iloc[0]
+    assert (annotation["name"], annotation["detail"]) == ("move", "Activity")
+    assert (annotation["value_0"], annotation["value_1"]) == (3, 7)
+    assert np.isnan(annotation["value_2"])
+    assert log["time_s"].is_monotonic_increasing
+
+
+def test_binary_log_is_appended(tmp_path):
+    file = tmp_path / "telemetry.bin"
+    for _ in range(2):
+        logger = TelemetryLogger(file)
+        logger.log("window", "resize", values=(0, 0, 800, 600))
+        logger.close()
+    # an incomplete record at the end, e.g. after a crash, is ignored
+    with open(file, "ab") as opened_file:
+        opened_file.write(b"\x00" * 10)
+    log = read_log(file)
+    assert list(log["name"]) == ["resize", "resize"]
+    assert list(log.iloc[0][["value_0", "value_1", "value_2", "value_3"]]) == [0, 0, 800, 600]
+
+
+def test_disabled_logger():
+    logger = TelemetryLogger(None)
+    logger.log("mode", "add")
+    logger.close()
+    assert not logger.enabled
@@ -1,6 +1,6 @@
 import pytest
 
-from mad_gui.components.dialogs.label_annotation_dialog import depth
+from mad_gui.components.dialogs.label_annotation_dialog import choice_tree, depth, type_ahead_match
 
 
 @pytest.mark.parametrize(
@@ -18,3 +18,26 @@ from mad_gui.components.dialogs.label_annotation_dialog import depth
 )
 def test_depth(val, expected):
     assert depth(val) == expected
+
+
+def test_choice_tree():
+    descriptions = {"Jump": None, "Walk": {"Slow": None, "Fast": ["Uphill", "Flat"]}, "Stand": {}}
+    assert choice_tree(descriptions) == {
+        (): ["Jump", "Walk", "Stand"],
+        ("Walk",): ["Slow", "Fast"],
+        ("Walk", "Fast"): ["Uphill", "Flat"],
+        ("Stand",): [],
+    }
+    assert choice_tree(["a", "b"]) == {(): ["a", "b"]}
+    assert choice_tree(None) == {}
+
+
+def test_type_ahead_match():
+    choices = ["Sitting", "Standing", "Stairs", "Walking"]
+    assert type_ahead_match(choices, "st") == "Standing"
+    assert type_ahead_match(choices, "STAI") == "Stairs"
+    assert type_ahead_match(choices, "x") is None
+    # typing the same letter again cycles through the matches
+    assert type_ahead_match(choices, "s", current="Walking") == "Sitting"
+    assert type_ahead_match(choices, "ss", current="Sitting") == "Standing"
+    assert type_ahead_match(choices, "s", current="Stairs") == "Sitting"
@@ -0,0 +1,26 @@
+import pandas as pd
+from PySide2.QtCore import Qt
+
+from mad_gui.components.label_search import LabelSearchPanel
+from mad_gui.models.label_index import LabelIndex
+
+
+def test_enter_steps_forwards_and_shift_enter_backwards(qtbot):
+    index = LabelIndex()
+    index.set_annotations(
+        "IMU", "Activity", pd.DataFrame({"start": [0, 10, 20], "end": [5, 15, 25], "description": "walking"})
+    )
+    panel = LabelSearchPanel(index)
+    qtbot.addWidget(panel)
+    panel.show_and_focus()
+    selected = []
+    panel.hit_selected.connect(lambda hit: selected.append(hit.start))
+
+    qtbot.keyClicks(panel.query, "walk")
+    qtbot.keyClick(panel.query, Qt.Key_Return)
+    qtbot.keyClick(panel.query, Qt.Key_Return)
+    qtbot.keyClick(panel.query, Qt.Key_Return, Qt.ShiftModifier)
+    qtbot.keyClick(panel.query, Qt.Key_Return, Qt.ShiftModifier)
+    qtbot.keyClick(panel.query, Qt.Key_Return, Qt.ShiftModifier)
+
+    assert selected == [0, 10, 0, 20, 10]
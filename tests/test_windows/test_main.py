@@ -1,15 +1,61 @@
+import time
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
 import pytest
 from PySide2.QtCore import Qt, QTimer
+from PySide2.QtWidgets import QFileDialog
 
+from benchmarks.stream_producer import StreamProducer
+from mad_gui import BaseSettings
+from mad_gui.components.dialogs.plugin_selection.plugin_selection_dialog import PluginSelectionDialog
 from mad_gui.models.global_data import PlotData
+from mad_gui.models.streaming import RawStream
+from mad_gui.plugins.base import BaseAlgorithm, BaseStreamingAlgorithm
 from mad_gui.plugins.example import ExampleImporter
+from mad_gui.state_keeper import StateKeeper
+from mad_gui.utils.telemetry import read_log
 from tests.test_windows.create_main_window import get_main_window
 
 SENSOR_NAME = "Pocket IMU"
 
 
+class DoNothing(BaseAlgorithm):
+    @classmethod
+    def name(cls):
+        return "Do nothing"
+
+    def process_data(self, plot_data):
+        pass
+
+
+class SlowAlgorithm(BaseAlgorithm):
+    @classmethod
+    def name(cls):
+        return "Slow algorithm"
+
+    def process_data(self, plot_data):
+        time.sleep(2)
+
+
+class PeakDetector(BaseStreamingAlgorithm):
+    @classmethod
+    def name(cls):
+        return "Peak detector"
+
+    def initial_state(self, sensor, sampling_rate_hz):
+        return {"above": False}
+
+    def process_block(self, sensor, block, state):
+        if len(block) == 0:
+            return {}
+        above = (block["acc_x"] > 0.9).to_numpy()
+        previous = np.concatenate([[state["above"]], above[:-1]])
+        state["above"] = bool(above[-1])
+        return {"Peak": pd.DataFrame({"pos": block.index[above & ~previous], "description": "peak"})}
+
+
 class TestGui:
     def test_open_gui(self, qtbot):
         """Test if it works to open and close the GUI"""
@@ -133,3 +179,120 @@ class TestGui:
     @staticmethod
     def save_sync():
         print("This would actually call a dialog in mad_gui.windows.main._save_sync.")
+
+    def test_stream_continues_after_using_algorithm(self, qtbot, monkeypatch):
+        gui = get_main_window()
+        qtbot.addWidget(gui)
+        gui.global_data.plugins = [DoNothing]
+        producer = StreamProducer(n_channels=3, sampling_rate_hz=200).start()
+        stream = RawStream.from_socket("localhost", producer.port, producer.channels, producer.sampling_rate_hz)
+        gui.global_data.plot_data = {SENSOR_NAME: PlotData.from_dict({"sensor_data": stream, "sampling_rate_hz": 200})}
+        buffer = gui.sensor_plots[SENSOR_NAME].stream_updater.buffer
+        qtbot.waitUntil(lambda: buffer.total_samples > 100, timeout=5000)
+
+        # select the first algorithm without showing the dialog
+        monkeypatch.setattr(PluginSelectionDialog, "exec_", lambda dialog: dialog._start_processing())
+        gui.use_algorithm()
+
+        # the new plot continues the stream with the samples received so far
+        stream_updater = gui.sensor_plots[SENSOR_NAME].stream_updater
+        assert stream_updater.buffer is buffer
+        received = buffer.total_samples
+        qtbot.waitUntil(lambda: buffer.total_samples > received + 100, timeout=5000)
+        assert stream_updater.receiver.is_running
+        assert len(gui.global_data.plot_data[SENSOR_NAME].data) == len(buffer)
+        gui.close()
+        producer.stop()
+        assert not stream_updater.receiver.is_running
+
+    def test_streaming_algorithm_detects_events_live(self, qtbot, monkeypatch):
+        gui = get_main_window()
+        qtbot.addWidget(gui)
+        gui.global_data.plugins = [PeakDetector]
+        # the sine wave of the first channel has a period of 5 s, so it takes a while until the first peak
+        producer = StreamProducer(n_channels=3, sampling_rate_hz=200, speed=10).start()
+        stream = RawStream.from_socket("localhost", producer.port, producer.channels, producer.sampling_rate_hz)
+        gui.global_data.plot_data = {SENSOR_NAME: PlotData.from_dict({"sensor_data": stream, "sampling_rate_hz": 200})}
+        buffer = gui.sensor_plots[SENSOR_NAME].stream_updater.buffer
+        qtbot.waitUntil(lambda: buffer.total_samples > 100, timeout=5000)
+        changes = []
+        StateKeeper.annotation_changed.connect(changes.append)
+
+        monkeypatch.setattr(PluginSelectionDialog, "exec_", lambda dialog: dialog._start_processing())
+        gui.use_algorithm()
+        received = buffer.total_samples
+
+        # peaks in samples received after applying the algorithm are added and reported, e.g. such that they are
+        # journaled and can be undone
+        qtbot.waitUntil(lambda: any(change["after"]["pos"] > received for change in changes), timeout=10000)
+        assert all(change["op"] == "add" and change["label_class"] == "Peak" for change in changes)
+        StateKeeper.annotation_changed.disconnect(changes.append)
+        # closing would ask whether to drop the new events otherwise
+        StateKeeper.set_has_unsaved_changes(False)
+        gui.close()
+        producer.stop()
+
+    def test_cancelled_save_keeps_changes_recoverable(self, qtbot, monkeypatch):
+        gui = get_main_window()
+        qtbot.addWidget(gui)
+        imu_file = Path(__file__).parent.parent.parent / "example_data" / "sensor_data.csv"
+        gui.global_data.data_file = str(imu_file)
+        plot_data_dict = ExampleImporter().load_sensor_data(imu_file)
+        gui.global_data.plot_data = {SENSOR_NAME: PlotData.from_dict(plot_data_dict[SENSOR_NAME])}
+        StateKeeper.set_has_unsaved_changes(True)
+        compactions = []
+        monkeypatch.setattr(gui.journal, "compact", lambda saved: compactions.append(saved))
+        monkeypatch.setattr(QFileDialog, "getSaveFileName", lambda *args: ("", ""))
+
+        gui.save_data_gui_format()
+
+        assert StateKeeper.gui_has_unsaved_changes
+        assert not compactions
+        StateKeeper.set_has_unsaved_changes(False)
+        gui.close()
+
+    def test_navigation_of_main_plot_is_logged(self, qtbot, monkeypatch, tmp_path):
+        telemetry_file = tmp_path / "telemetry.bin"
+        monkeypatch.setattr(BaseSettings, "TELEMETRY_FILE", str(telemetry_file), raising=False)
+        gui = get_main_window()
+        qtbot.addWidget(gui)
+        imu_file = Path(__file__).parent.parent.parent / "example_data" / "sensor_data.csv"
+        plot_data_dict = ExampleImporter().load_sensor_data(imu_file)
+        gui.global_data.plot_data = {SENSOR_NAME: PlotData.from_dict(plot_data_dict[SENSOR_NAME])}
+
+        gui.sensor_plots[SENSOR_NAME].getViewBox().setXRange(1, 2, padding=0)
+        gui.close()
+
+        navigation = read_log(telemetry_file).query("kind == 'navigation'")
+        assert len(navigation.query("value_0 == 1 and value_1 == 2")) == 1
+        assert navigation[["value_0", "value_1"]].iloc[-1].tolist() == [1, 2]
+
+    def test_second_click_during_isolated_run_is_ignored(self, qtbot, monkeypatch):
+        monkeypatch.setattr(BaseSettings, "ISOLATE_PLUGINS", True, raising=False)
+        gui = get_main_window()
+        qtbot.addWidget(gui)
+        gui.global_data.plugins = [SlowAlgorithm]
+        imu_file = Path(__file__).parent.parent.parent / "example_data" / "sensor_data.csv"
+        plot_data_dict = ExampleImporter().load_sensor_data(imu_file)
+        gui.global_data.plot_data = {SENSOR_NAME: PlotData.from_dict(plot_data_dict[SENSOR_NAME])}
+        runs = []
+
+        def start_processing(dialog):
+            runs.append(dialog)
+            dialog._start_processing()
+
+        monkeypatch.setattr(PluginSelectionDialog, "exec_", start_processing)
+        enabled_while_running = []
+
+        def click_again():
+            enabled_while_running.append(gui.isEnabled())
+            qtbot.mouseClick(gui.ui.btn_use_algorithm, Qt.LeftButton)
+
+        QTimer.singleShot(1000, click_again)
+        qtbot.mouseClick(gui.ui.btn_use_algorithm, Qt.LeftButton)
+
+        assert enabled_while_running == [False]
+        assert len(runs) == 1
+        assert gui.isEnabled()
+        StateKeeper.set_has_unsaved_changes(False)
+        gui.close()
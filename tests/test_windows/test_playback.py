@@ -0,0 +1,33 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from mad_gui import BaseSettings
+from mad_gui.components.playback_driver import PlaybackDriver
+from mad_gui.models.global_data import PlotData
+from mad_gui.plugins.example import ExampleImporter
+from tests.test_windows.create_main_window import get_main_window
+
+
+def test_linked_plots_follow_the_synchronized_plot(qtbot, monkeypatch):
+    monkeypatch.setattr(BaseSettings, "SENSORS_SYNCHRONIZED", True, raising=False)
+    gui = get_main_window()
+    qtbot.addWidget(gui)
+    imu_file = Path(__file__).parent.parent.parent / "example_data" / "sensor_data.csv"
+    plot_data_dict = ExampleImporter().load_sensor_data(imu_file)["Pocket IMU"]
+    gui.global_data.plot_data = {name: PlotData.from_dict(plot_data_dict) for name in ["Left", "Right"]}
+    main_plot, other_plot = gui.sensor_plots["Left"], gui.sensor_plots["Right"]
+    # only the plot that is not the main plot is synchronized with the video
+    other_plot.sync_info = pd.Series(data=[100, 1100], index=["start", "end"])
+    driver = PlaybackDriver()
+    for plot in (main_plot, other_plot):
+        driver.position_changed.connect(plot.follow_video_position)
+
+    driver.submit(50)
+
+    expected_s = 600 / other_plot.plot_data.sampling_rate_hz
+    for plot in (main_plot, other_plot):
+        x_min, x_max = plot.getViewBox().viewRange()[0]
+        assert (x_min + x_max) / 2 == pytest.approx(expected_s, abs=0.1)
+    gui.close()
@@ -0,0 +1,73 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from mad_gui.models.worklist import Worklist
+
+
+class RecordingImporter:
+    """Mimics the interface of a `BaseImporter` and keeps track of the files it loaded and the threads it used."""
+
+    def __init__(self):
+        self.loaded = []
+        self.threads = set()
+
+    def load_sensor_data(self, file):
+        self.loaded.append(file)
+        self.threads.add(threading.current_thread().name)
+        return {"IMU": {"sensor_data": pd.read_csv(file), "sampling_rate_hz": 100.0}}
+
+    def get_start_time(self, file):  # noqa
+        return None
+
+
+def test_prefetch_one_ahead(tmp_path):
+    for i in range(3):
+        pd.DataFrame({"acc_x": [i, i]}).to_csv(tmp_path / f"subject_{i}.csv", index=False)
+    (tmp_path / "notes.txt").write_text("not a recording")
+    importer = RecordingImporter()
+
+    worklist = Worklist.from_directory(tmp_path / "subject_0.csv", importer)
+    assert worklist.remaining == 2
+    worklist.prefetch()
+
+    file, data = worklist.next()
+    assert file == str(tmp_path / "subject_1.csv")
+    assert data["data_file_name"] == file
+    assert data["plot_data_dicts"]["IMU"]["sensor_data"]["acc_x"].iloc[0] == 1
+
+    file, data = worklist.next()
+    assert file == str(tmp_path / "subject_2.csv")
+    assert not worklist.has_next
+    with pytest.raises(IndexError):
+        worklist.next()
+    worklist.close()
+
+    # each file was loaded exactly once, and only in the background thread
+    assert importer.loaded == [str(tmp_path / f"subject_{i}.csv") for i in (1, 2)]
+    assert all(name.startswith("mad_gui_prefetch") for name in importer.threads)
+
+
+class GuiThreadImporter(RecordingImporter):
+    """Like an importer that shows a dialog, which fails outside of the GUI thread."""
+
+    def load_sensor_data(self, file):
+        if threading.current_thread() is not threading.main_thread():
+            raise RuntimeError("Widgets must be created in the GUI thread.")
+        return super().load_sensor_data(file)
+
+
+def test_failed_prefetch_is_loaded_in_calling_thread(tmp_path):
+    for i in range(2):
+        pd.DataFrame({"acc_x": [i, i]}).to_csv(tmp_path / f"subject_{i}.csv", index=False)
+    importer = GuiThreadImporter()
+    worklist = Worklist([tmp_path / f"subject_{i}.csv" for i in range(2)], importer)
+    worklist.prefetch()
+
+    file, data = worklist.next()
+    worklist.close()
+
+    assert file == str(tmp_path / "subject_1.csv")
+    assert data["plot_data_dicts"]["IMU"]["sensor_data"]["acc_x"].iloc[0] == 1
+    assert importer.threads == {threading.main_thread().name}